@@ -0,0 +1,651 @@
+"""
+Benchmarks used during development of the generator.
+
+Usage:
+    python dev/benchmark.py <benchmark-name> [arguments]
+
+Run without any arguments to list all available benchmarks.
+Benchmarks that generate stubs must be run using MotionBuilder's python interpreter (mobupy).
+"""
+from __future__ import annotations
+
+import subprocess
+import argparse
+import tempfile
+import shutil
+import typing
+import time
+import copy
+import ast
+import sys
+import os
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+BENCHMARKS: dict[str, typing.Callable[[list[str]], None]] = {}
+
+
+def Benchmark(Function: typing.Callable[[list[str]], None]):
+    """ Decorator to register a benchmark, the name of the function is used as the name of the benchmark """
+    BENCHMARKS[Function.__name__] = Function
+    return Function
+
+
+# -------------------------------------------------------------
+#                       Helper Functions
+# -------------------------------------------------------------
+
+def Timeit(Function: typing.Callable, Repeat = 5) -> float:
+    """ Run the function `Repeat` times and return the fastest time in seconds """
+    Times = []
+    for _ in range(Repeat):
+        StartTime = time.perf_counter()
+        Function()
+        Times.append(time.perf_counter() - StartTime)
+    return min(Times)
+
+
+def GetStubFiles(Path: str) -> list[str]:
+    """ Get all stub files in a directory (recursively), or the path itself if it's a file """
+    if os.path.isfile(Path):
+        return [Path]
+
+    Files = []
+    for Root, _, FileNames in os.walk(Path):
+        Files.extend(os.path.join(Root, x) for x in FileNames if x.endswith(".pyi"))
+    return sorted(Files)
+
+
+def RunTypeChecker(Command: list[str], Env: dict | None = None) -> float | None:
+    """ Run a type checker command and return the time it took, or None if the type checker is not installed """
+    if not shutil.which(Command[0]):
+        return None
+
+    StartTime = time.perf_counter()
+    subprocess.run(Command, capture_output=True, check=False, env=Env)
+    return time.perf_counter() - StartTime
+
+
+# -------------------------------------------------------------
+#                       Benchmarks
+# -------------------------------------------------------------
+
+@Benchmark
+def layouts(Arguments: list[str]):
+    """
+    Compare the parse time of the single-file layout and the split-package layout.
+    Generate the two layouts with `Generate(Directory)` and `Generate(Directory, bSplitPackage = True)`
+    """
+    Parser = argparse.ArgumentParser(prog="layouts")
+    Parser.add_argument("single", help="Directory containing the single pyfbsdk.pyi file")
+    Parser.add_argument("package", help="Directory containing the pyfbsdk/ stub package")
+    Args = Parser.parse_args(Arguments)
+
+    ProbeCode = "import pyfbsdk\nModel = pyfbsdk.FBModel('Model')\nreveal_type(Model.Translation)\n"
+
+    for Label, Directory in (("single", Args.single), ("package", Args.package)):
+        Sources = []
+        for Filepath in GetStubFiles(os.path.join(Directory, "pyfbsdk")) + GetStubFiles(os.path.join(Directory, "pyfbsdk.pyi")):
+            with open(Filepath, "r", encoding="utf-8") as File:
+                Sources.append((os.path.relpath(Filepath, Directory), File.read()))
+
+        print(f"{Label}:")
+        TotalTime = 0.0
+        for Name, Source in Sources:
+            ParseTime = Timeit(lambda: ast.parse(Source))
+            TotalTime += ParseTime
+            print(f"    ast.parse {Name:<30} {ParseTime * 1000:8.1f}ms")
+        print(f"    ast.parse {'total':<30} {TotalTime * 1000:8.1f}ms")
+
+        with tempfile.TemporaryDirectory() as TempDir:
+            ProbeFile = os.path.join(TempDir, "probe.py")
+            with open(ProbeFile, "w", encoding="utf-8") as File:
+                File.write(ProbeCode)
+
+            Env = dict(os.environ, MYPYPATH=os.path.abspath(Directory))
+            MyPyCommand = ["mypy", "--cache-dir", os.path.join(TempDir, ".mypy_cache"), ProbeFile]
+            for Run in ("cold", "warm"):
+                CheckTime = RunTypeChecker(MyPyCommand, Env)
+                if CheckTime is not None:
+                    print(f"    mypy ({Run}) {CheckTime:8.2f}s")
+
+            with open(os.path.join(TempDir, "pyrightconfig.json"), "w", encoding="utf-8") as File:
+                File.write(f'{{"extraPaths": ["{os.path.abspath(Directory).replace(os.sep, "/")}"]}}')
+            CheckTime = RunTypeChecker(["pyright", "-p", TempDir, ProbeFile])
+            if CheckTime is not None:
+                print(f"    pyright {CheckTime:8.2f}s")
+
+
+@Benchmark
+def lean(Arguments: list[str]):
+    """
+    Measure the size & parse time of a stub file with and without docstrings.
+    The docstrings are stripped from an existing stub file, and written to a documentation index
+    """
+    from pyfbsdk_stub_generator import doc_index
+
+    Parser = argparse.ArgumentParser(prog="lean")
+    Parser.add_argument("stubfile", nargs="?", help="The stub file to measure",
+                        default=os.path.join(ROOT_DIR, "generated-stub-files", "motionbuilder-2025", "pyfbsdk.pyi"))
+    Args = Parser.parse_args(Arguments)
+
+    with open(Args.stubfile, "r", encoding="utf-8") as File:
+        Source = File.read()
+
+    # Find all docstrings (except the module docstring), and replace them with '...'
+    Lines: list[str | None] = list(Source.split("\n"))
+    DocStrings: dict[str, str] = {}
+    DocStringNodes: list[ast.Expr] = []
+    NodesToVisit: list[tuple[str, ast.AST]] = [("", x) for x in ast.parse(Source).body]
+    while NodesToVisit:
+        Prefix, Node = NodesToVisit.pop()
+        if isinstance(Node, (ast.ClassDef, ast.FunctionDef)):
+            DocString = ast.get_docstring(Node, clean=False)
+            if DocString:
+                DocStrings.setdefault(f"{Prefix}{Node.name}", DocString)
+            if isinstance(Node, ast.ClassDef):
+                NodesToVisit.extend((f"{Prefix}{Node.name}.", x) for x in Node.body)
+            else:
+                NodesToVisit.extend((Prefix, x) for x in Node.body)
+        elif isinstance(Node, ast.Expr) and isinstance(Node.value, ast.Constant) and isinstance(Node.value.value, str) and Prefix:
+            DocStringNodes.append(Node)
+
+    for Node in DocStringNodes:
+        Lines[Node.lineno - 1] = Lines[Node.lineno - 1][:Node.col_offset] + "..."
+        for LineIndex in range(Node.lineno, Node.end_lineno):
+            Lines[LineIndex] = None
+
+    LeanSource = "\n".join(x for x in Lines if x is not None)
+    DocIndex = doc_index.GetDocIndexBytes(DocStrings)
+
+    FullSize = len(Source.encode("utf-8"))
+    LeanSize = len(LeanSource.encode("utf-8"))
+    print(f"Full stub:      {FullSize / 1024:8.0f}KB  ast.parse {Timeit(lambda: ast.parse(Source)) * 1000:6.1f}ms")
+    print(f"Lean stub:      {LeanSize / 1024:8.0f}KB  ast.parse {Timeit(lambda: ast.parse(LeanSource)) * 1000:6.1f}ms")
+    print(f"Size reduction: {(1 - LeanSize / FullSize) * 100:8.1f}%")
+    print(f"Doc index:      {len(DocIndex) / 1024:8.0f}KB  ({len(DocStrings)} docstrings)")
+
+
+@Benchmark
+def introspection(Arguments: list[str]):
+    """
+    Measure the time it takes to introspect the pyfbsdk module, with and without the docstring signature cache.
+    Must be run using MotionBuilder's python interpreter
+    """
+    from pyfbsdk_stub_generator import native_generator
+    import pyfbsdk
+
+    ParseDocStringSignatures = native_generator.ParseDocStringSignatures
+
+    # Bypass the cache to get the time it takes when every docstring has to be parsed
+    native_generator.ParseDocStringSignatures = ParseDocStringSignatures.__wrapped__
+    try:
+        print(f"Uncached:       {Timeit(lambda: native_generator.GenerateModuleSubs(pyfbsdk), Repeat = 3):8.2f}s")
+    finally:
+        native_generator.ParseDocStringSignatures = ParseDocStringSignatures
+
+    ParseDocStringSignatures.cache_clear()
+    print(f"Cached:         {Timeit(lambda: native_generator.GenerateModuleSubs(pyfbsdk), Repeat = 1):8.2f}s")
+
+    CacheInfo = ParseDocStringSignatures.cache_info()
+    print(f"Unique docstrings: {CacheInfo.misses}, cache hits: {CacheInfo.hits}")
+
+
+@Benchmark
+def docfragments(Arguments: list[str]):
+    """
+    Count how many of the documentation docstrings are converted to markdown, with and without docstrings in the stubs.
+    Must be run using MotionBuilder's python interpreter
+    """
+    from pyfbsdk_stub_generator.plugins.online_documentation.documentation_scraper import page_parser
+    from pyfbsdk_stub_generator import stub_generator
+    import pyfbsdk
+
+    for bIncludeDocStrings in (True, False):
+        for Key in page_parser.DOC_FRAGMENT_STATISTICS:
+            page_parser.DOC_FRAGMENT_STATISTICS[Key] = 0
+
+        StartTime = time.perf_counter()
+        stub_generator.StubGenerator(pyfbsdk, bIncludeDocStrings = bIncludeDocStrings).GenerateString()
+        GenerationTime = time.perf_counter() - StartTime
+
+        Loaded = page_parser.DOC_FRAGMENT_STATISTICS["Loaded"]
+        Converted = page_parser.DOC_FRAGMENT_STATISTICS["Converted"]
+        print(f"bIncludeDocStrings={bIncludeDocStrings}: {GenerationTime:.2f}s, converted {Converted} of {Loaded} docstrings "
+              f"({Loaded - Converted} conversions avoided)")
+
+
+@Benchmark
+def overloads(Arguments: list[str]):
+    """
+    Measure the time it takes to match synthetic overload groups with their documentation members.
+    Must be run using MotionBuilder's python interpreter
+    """
+    import random
+    from pyfbsdk_stub_generator.plugins.online_documentation.plugin_online_documentation import PluginOnlineDocumentation
+    from pyfbsdk_stub_generator.plugins.online_documentation.documentation_scraper.page_parser import MemberItem, Parameter
+    from pyfbsdk_stub_generator.module_types import StubFunction, StubParameter
+
+    Types = ["int", "float", "str", "bool", "FBModel", "FBVector3d", "FBVector4d", "FBComponent", "FBTime", "list"]
+
+    Plugin = PluginOnlineDocumentation.__new__(PluginOnlineDocumentation)
+    Plugin.AllClassNames = {x for x in Types if x.startswith("FB")}
+    Plugin.AllClassesMap = {}
+
+    def GenerateOverloadGroup(Size: int, Seed: int):
+        Random = random.Random(Seed)
+        Functions: list[StubFunction] = []
+        Members: list[MemberItem] = []
+        for Index in range(Size):
+            ParameterTypes = [Random.choice(Types) for _ in range(Random.randint(0, 4))]
+            Function = StubFunction(None, "Overload", [StubParameter(None, "self", "FBComponent")], "None")
+            Function.bIsMethod = True
+            for ParameterIndex, ParameterType in enumerate(ParameterTypes):
+                # Make some of the types unknown, so they have to be matched by score
+                Type = "object" if Random.random() < 0.3 else ParameterType
+                Function.AddParameter(StubParameter(None, f"arg{ParameterIndex + 2}", Type))
+            Functions.append(Function)
+
+            DocParameters = [Parameter(f"pParam{i}", x) for i, x in enumerate(ParameterTypes)]
+            Members.append(MemberItem("Overload", "void", f"Overload {Index}", DocParameters, ""))
+
+        Random.shuffle(Members)
+        return Functions, Members
+
+    for Size in (10, 50, 100, 200):
+        Times = []
+        for Seed in range(5):
+            Functions, Members = GenerateOverloadGroup(Size, Seed)
+            StartTime = time.perf_counter()
+            Plugin._PatchFunctionGroupsWithDocumentation(Functions, Members)
+            Times.append(time.perf_counter() - StartTime)
+
+        Matched = len([x for x in Functions if x.DocString])
+        print(f"{Size:>4} overloads: {min(Times) * 1000:8.2f}ms  ({Matched} of {Size} functions matched in the last run)")
+
+
+@Benchmark
+def rendering(Arguments: list[str]):
+    """
+    Measure the time it takes to render the full pyfbsdk model using 1 to N worker processes, and verify that the output is identical.
+    Must be run using MotionBuilder's python interpreter
+    """
+    from pyfbsdk_stub_generator import stub_generator, stub_renderer
+    import pyfbsdk
+
+    Parser = argparse.ArgumentParser(prog="rendering")
+    Parser.add_argument("--workers", type=int, default=8, help="The highest number of workers to measure")
+    Args = Parser.parse_args(Arguments)
+
+    Generator = stub_generator.StubGenerator(pyfbsdk)
+    Enums, Classes, FunctionGroupList = Generator.GenerateStubs()
+
+    StartTime = time.perf_counter()
+    stub_renderer.FreezeStubs(Enums, Classes, FunctionGroupList)
+    print(f"Freezing:        {time.perf_counter() - StartTime:8.2f}s")
+
+    Reference = None
+    for Workers in range(1, Args.workers + 1):
+        # The lazy docstrings are converted when they're rendered, so each run renders its own copy of the stubs
+        RunEnums, RunClasses, RunFunctionGroupList = copy.deepcopy((Enums, Classes, FunctionGroupList))
+        Generator.RenderWorkers = Workers
+        StartTime = time.perf_counter()
+        StubString = stub_generator.GetStubsAsString(RunEnums, RunClasses, RunFunctionGroupList, Generator.RenderStubs(RunEnums, RunClasses, RunFunctionGroupList))
+        RenderTime = time.perf_counter() - StartTime
+
+        Reference = Reference if Reference is not None else StubString
+        print(f"{Workers} worker(s):     {RenderTime:8.2f}s  {'identical' if StubString == Reference else 'DIFFERENT'}")
+
+
+@Benchmark
+def variants(Arguments: list[str]):
+    """
+    Compare the time & memory it takes to create the FBComponent.PropertyCreate overloads, using full copies and variants.
+    Must be run using MotionBuilder's python interpreter
+    """
+    import tracemalloc
+    import copy
+    from pyfbsdk_stub_generator.plugins.fb_property import plugin_fbproperty
+    from pyfbsdk_stub_generator.module_types import StubFunction, StubParameter
+
+    Parameters = [("self", None), ("Name", "str"), ("Type", "FBPropertyType"), ("DataType", "str"),
+                  ("Animatable", "bool"), ("IsUser", "bool"), ("ReferenceSource", "FBProperty")]
+    Function = StubFunction(None, "PropertyCreate", [StubParameter(None, Name, Type) for Name, Type in Parameters], "FBProperty")
+    Function.bIsMethod = True
+    Function.DocString = "Create user or dynamic property."
+
+    # The parameter types & return type of each overload, the same as `PluginFbProperty.PatchFBComponent`
+    Overloads: list[tuple[dict[int, str], str]] = []
+    for PropertyType, (TypeClass, AnimatableTypeClass) in plugin_fbproperty.PROPERTY_TYPE_MAP.items():
+        PropertyTypeName = f"Literal[FBPropertyType.{PropertyType}]"
+        if TypeClass is not None and TypeClass == AnimatableTypeClass:
+            Overloads.append(({2: PropertyTypeName}, TypeClass.__name__))
+            continue
+        for bAnimatable, Class in ((False, TypeClass), (True, AnimatableTypeClass)):
+            if Class:
+                Overloads.append(({2: PropertyTypeName, 4: f"Literal[{bAnimatable}]"}, Class.__name__))
+
+    def CreateCopies() -> list[StubFunction]:
+        Copies = []
+        for ParameterTypes, ReturnType in Overloads:
+            Copy = copy.copy(Function)
+            for Index, Type in ParameterTypes.items():
+                Copy.GetParameters()[Index].Type = Type
+            Copy.ReturnType = ReturnType
+            Copies.append(Copy)
+        return Copies
+
+    def CreateVariants() -> list[StubFunction]:
+        Variants = []
+        for ParameterTypes, ReturnType in Overloads:
+            Variant = Function.CreateVariant()
+            for Index, Type in ParameterTypes.items():
+                Variant.SetParameterType(Index, Type)
+            Variant.ReturnType = ReturnType
+            Variants.append(Variant)
+        return Variants
+
+    Rendered = {}
+    for Label, Create in (("Copies", CreateCopies), ("Variants", CreateVariants)):
+        tracemalloc.start()
+        Functions = Create()
+        Memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        CreateTime = Timeit(Create, Repeat = 100)
+        RenderTime = Timeit(lambda: [x.GetAsString(True) for x in Functions], Repeat = 100)
+        Rendered[Label] = "\n".join(x.GetAsString(True) for x in Functions)
+        print(f"{Label + ':':<10} {len(Functions)} overloads, {Memory / 1024:6.1f}KB, "
+              f"created in {CreateTime * 1000:6.3f}ms, rendered in {RenderTime * 1000:6.3f}ms")
+
+    print(f"Identical output: {Rendered['Copies'] == Rendered['Variants']}")
+
+
+@Benchmark
+def fbproperty(Arguments: list[str]):
+    """
+    Measure the time it takes to patch the class properties on a synthetic model with a lot of FBProperty typed properties,
+    with and without the precomputed FBProperty type table. Must be run using MotionBuilder's python interpreter
+    """
+    import types
+    from pyfbsdk_stub_generator.plugins.fb_property.plugin_fbproperty import PluginFbProperty
+    from pyfbsdk_stub_generator.module_types import StubClass, StubProperty
+
+    Parser = argparse.ArgumentParser(prog="fbproperty")
+    Parser.add_argument("--classes", type=int, default=2000, help="Number of classes in the synthetic model")
+    Parser.add_argument("--properties", type=int, default=20, help="Number of properties per class")
+    Args = Parser.parse_args(Arguments)
+
+    DataTypes = ["Bool", "Int", "Double", "Vector3d", "Vector4d", "Color", "ColorAndAlpha", "Time", "Enum", "Action"]
+    PropertyClasses = [StubClass(None, f"FBProperty{Prefix}{x}") for x in DataTypes for Prefix in ("", "Animatable")]
+    PropertyClasses += [StubClass(None, x) for x in ("FBProperty", "FBPropertyAnimatable", "FBVector3d", "FBVector4d", "FBColor",
+                                                     "FBColorAndAlpha", "FBTime")]
+
+    Classes = []
+    for ClassIndex in range(Args.classes):
+        Class = StubClass(None, f"FBSyntheticClass{ClassIndex}")
+        for PropertyIndex in range(Args.properties):
+            Property = StubProperty(None, f"Property{PropertyIndex}")
+            Property.Type = PropertyClasses[(ClassIndex + PropertyIndex) % len(PropertyClasses)].Name
+            Class.StubProperties.append(Property)
+        Classes.append(Class)
+
+    Module = types.ModuleType("pyfbsdk")
+    for Class in PropertyClasses + Classes:
+        setattr(Module, Class.Name, type(Class.Name, (), {}))
+
+    StartTime = time.perf_counter()
+    Plugin = PluginFbProperty(0, Module, [], PropertyClasses + Classes, [])
+    print(f"Plugin setup:     {(time.perf_counter() - StartTime) * 1000:8.2f}ms  ({len(Plugin.PropertyTypes)} FBProperty classes in the type table)")
+
+    def PatchWithoutTable():
+        # The previous implementation, finding the data type for every property
+        for Class in Classes:
+            for Property in Class.GetStubProperties():
+                if Property.Type.startswith("FBPropertyAnimatable"):
+                    TypeClass = Plugin.ClassMap.get(Property.Type)
+                    if TypeClass:
+                        SetterType = Plugin.GetDataType(TypeClass)
+                        if SetterType:
+                            Property.SetterType = f"{Property.Type}|{SetterType}"
+
+    def PatchWithTable():
+        # The properties using each FBProperty type are looked up in the type index
+        Plugin.PatchClassProperties()
+
+    NumProperties = Args.classes * Args.properties
+    Results = []
+    for Label, Function in (("Without table:", PatchWithoutTable), ("With type index:", PatchWithTable)):
+        for Class in Classes:
+            for Property in Class.StubProperties:
+                Property.SetterType = None
+        PatchTime = Timeit(Function)
+        SetterTypes = [x.SetterType for Class in Classes for x in Class.StubProperties]
+        Results.append(SetterTypes)
+        print(f"{Label:<17} {PatchTime * 1000:8.2f}ms  ({NumProperties} properties, {len([x for x in SetterTypes if x])} setter types)")
+
+    print(f"Identical setter types: {Results[0] == Results[1]}")
+
+
+@Benchmark
+def hierarchy(Arguments: list[str]):
+    """
+    Measure building the class hierarchy index and querying it on deep synthetic hierarchies, compared to walking the parents for each query.
+    Must be run using MotionBuilder's python interpreter
+    """
+    import random
+    from pyfbsdk_stub_generator.class_hierarchy import ClassHierarchy
+    from pyfbsdk_stub_generator.module_types import StubClass
+    from pyfbsdk_stub_generator import stub_generator
+
+    Parser = argparse.ArgumentParser(prog="hierarchy")
+    Parser.add_argument("--classes", type=int, default=2000, help="Number of classes in the synthetic hierarchy")
+    Parser.add_argument("--depth", type=int, default=50, help="Depth of each inheritance chain")
+    Parser.add_argument("--queries", type=int, default=100000, help="Number of IsSubclassOf queries")
+    Args = Parser.parse_args(Arguments)
+
+    # Chains of classes, where every other class also inherits from a class in the previous chain
+    Classes = [StubClass(None, f"FBSynthetic{Index}") for Index in range(Args.classes)]
+    for Index, Class in enumerate(Classes):
+        if Index % Args.depth:
+            Class.Parents.append(Classes[Index - 1].Name)
+        if Index >= Args.depth and Index % 2:
+            Class.Parents.append(Classes[Index - Args.depth].Name)
+    ClassMap = {x.Name: x for x in Classes}
+
+    Random = random.Random(0)
+    Queries = [(Random.choice(Classes).Name, Random.choice(Classes).Name) for _ in range(Args.queries)]
+
+    def IsSubclassOfWalking(Name: str, BaseName: str) -> bool:
+        Visited = set()
+        Names = [Name]
+        while Names:
+            Name = Names.pop()
+            if Name == BaseName:
+                return True
+            if Name not in Visited:
+                Visited.add(Name)
+                Names.extend(ClassMap[Name].Parents)
+        return False
+
+    Hierarchy = ClassHierarchy(Classes)
+    print(f"Build index:        {Timeit(lambda: ClassHierarchy(Classes)) * 1000:8.2f}ms  "
+          f"(max depth {max(Hierarchy.Depths.values())}, {sum(len(x) for x in Hierarchy.Ancestors.values())} ancestor entries)")
+
+    WalkingResults = [IsSubclassOfWalking(*x) for x in Queries]
+    IndexResults = [Hierarchy.IsSubclassOf(*x) for x in Queries]
+    print(f"Walking parents:    {Timeit(lambda: [IsSubclassOfWalking(*x) for x in Queries], Repeat = 1) * 1000:8.2f}ms  ({Args.queries} queries)")
+    print(f"IsSubclassOf:       {Timeit(lambda: [Hierarchy.IsSubclassOf(*x) for x in Queries]) * 1000:8.2f}ms  "
+          f"({'identical' if WalkingResults == IndexResults else 'DIFFERENT'} results)")
+
+    Shuffled = list(Classes)
+    Random.shuffle(Shuffled)
+    print(f"SortClasses:        {Timeit(lambda: stub_generator.SortClasses(list(Shuffled), Hierarchy), Repeat = 1) * 1000:8.2f}ms")
+
+
+@Benchmark
+def typeindex(Arguments: list[str]):
+    """
+    Measure retyping a type name on a synthetic model using the type reference index, compared to scanning every typed stub.
+    Must be run using MotionBuilder's python interpreter
+    """
+    import random
+    import re
+    from pyfbsdk_stub_generator.module_types import StubClass, StubFunction, StubParameter, StubProperty
+    from pyfbsdk_stub_generator import type_index
+
+    Parser = argparse.ArgumentParser(prog="typeindex")
+    Parser.add_argument("--classes", type=int, default=2000, help="Number of classes in the synthetic model")
+    Parser.add_argument("--members", type=int, default=20, help="Number of properties & methods per class")
+    Parser.add_argument("--types", type=int, default=500, help="Number of distinct type names")
+    Args = Parser.parse_args(Arguments)
+
+    Random = random.Random(0)
+    TypeNames = [f"FBSyntheticType{Index}" for Index in range(Args.types)]
+    Classes = []
+    for ClassIndex in range(Args.classes):
+        Class = StubClass(None, f"FBSynthetic{ClassIndex}")
+        for Index in range(Args.members):
+            Property = StubProperty(None, f"Property{Index}")
+            Property.Type = Random.choice(TypeNames)
+            Class.AddProperty(Property)
+            Parameters = [StubParameter(None, "self"), StubParameter(None, "Value", f"list[{Random.choice(TypeNames)}]")]
+            Class.AddFunctions([StubFunction(None, f"Method{Index}", Parameters, Random.choice(TypeNames))])
+        Classes.append(Class)
+
+    TypedStubs = [Stub for Class in Classes for Stub in type_index.IterTypedStubs(Class)]
+
+    def RetypeScanning(OldName: str, NewName: str) -> int:
+        Pattern = re.compile(rf"(?<![\w.]){re.escape(OldName)}(?!\w)")
+        Count = 0
+        for Stub in TypedStubs:
+            Type = type_index.GetStubType(Stub)
+            if Type and Pattern.search(Type):
+                type_index.SetStubType(Stub, Pattern.sub(NewName, Type))
+                Count += 1
+        return Count
+
+    print(f"Typed stubs:        {len(TypedStubs)}")
+    print(f"Scan & retype:      {Timeit(lambda: (RetypeScanning(TypeNames[0], 'FBRenamed'), RetypeScanning('FBRenamed', TypeNames[0]))) * 1000:8.2f}ms")
+
+    Index = type_index.TypeReferenceIndex([], Classes, [])
+    print(f"Build index:        {Timeit(lambda: type_index.TypeReferenceIndex([], Classes, [])) * 1000:8.2f}ms")
+    print(f"Index retype:       {Timeit(lambda: (Index.Retype(TypeNames[0], 'FBRenamed'), Index.Retype('FBRenamed', TypeNames[0]))) * 1000:8.2f}ms  "
+          f"({len(Index.GetReferences(TypeNames[0]))} stubs)")
+    KnownNames = set(TypeNames)
+    print(f"Unresolved names:   {Timeit(lambda: Index.GetUnresolvedNames(KnownNames)) * 1000:8.2f}ms")
+
+
+@Benchmark
+def manualdocs(Arguments: list[str]):
+    """
+    Measure looking up the manual docs of a synthetic module using the registered index, compared to scanning the module & classes with inspect.
+    Must be run using MotionBuilder's python interpreter
+    """
+    import importlib.util
+    import inspect
+    from pyfbsdk_stub_generator.plugins.manual_documentation import doc_bases
+
+    Parser = argparse.ArgumentParser(prog="manualdocs")
+    Parser.add_argument("--classes", type=int, default=500, help="Number of manual classes in the synthetic module")
+    Parser.add_argument("--members", type=int, default=10, help="Number of functions & properties per class")
+    Args = Parser.parse_args(Arguments)
+
+    Lines = ["from pyfbsdk_stub_generator.plugins.manual_documentation.doc_bases import FunctionBase, ClassBase, PropertyBase"]
+    for ClassIndex in range(Args.classes):
+        Lines.append(f"class FBSynthetic{ClassIndex}(ClassBase):")
+        for Index in range(Args.members):
+            Lines.append(f"    class Function{Index}(FunctionBase):\n        ReturnType = int")
+            Lines.append(f"    class Property{Index}(PropertyBase):\n        Types = int")
+    Code = compile("\n".join(Lines), "<synthetic manual docs>", "exec")
+
+    ModuleName = "synthetic_manual_docs"
+    def ImportModule():
+        Module = importlib.util.module_from_spec(importlib.util.spec_from_loader(ModuleName, loader = None))
+        sys.modules[ModuleName] = Module
+        exec(Code, vars(Module))
+        return Module
+
+    def LookupScanning(Module) -> int:
+        Count = 0
+        for _, Class in inspect.getmembers(Module, lambda x: inspect.isclass(x) and issubclass(x, doc_bases.ClassBase) and x is not doc_bases.ClassBase):
+            for _, Member in inspect.getmembers(Class):
+                if isinstance(Member, type) and issubclass(Member, (doc_bases.FunctionBase, doc_bases.PropertyBase)):
+                    Count += 1
+        return Count
+
+    def LookupIndex() -> int:
+        Index = doc_bases.GetModuleIndex(ModuleName)
+        Count = 0
+        for Class in Index.Classes.values():
+            Count += len(Class.GetFunctionGroups()) + len(Class.GetProperties())
+        return Count
+
+    try:
+        print(f"Import & register:  {Timeit(ImportModule) * 1000:8.2f}ms")
+        Module = ImportModule()
+        print(f"Scan with inspect:  {Timeit(lambda: LookupScanning(Module)) * 1000:8.2f}ms  ({LookupScanning(Module)} members)")
+        print(f"Index lookup:       {Timeit(LookupIndex) * 1000:8.2f}ms  ({LookupIndex()} members)")
+    finally:
+        sys.modules.pop(ModuleName, None)
+
+
+@Benchmark
+def imports(Arguments: list[str]):
+    """
+    Measure the cold import time of the package and the generator stages using `-X importtime`.
+    Must be run using MotionBuilder's python interpreter
+    """
+    Parser = argparse.ArgumentParser(prog="imports")
+    Parser.add_argument("--top", type=int, default=10, help="Number of the slowest modules to list for each stage")
+    Args = Parser.parse_args(Arguments)
+
+    Stages = {
+        "Package": "import pyfbsdk_stub_generator",
+        "Generator": "import pyfbsdk_stub_generator.stub_generator",
+        "Plugins": "import pyfbsdk_stub_generator.plugins as p; p.GetDefaultPlugins()",
+    }
+
+    for Stage, Statement in Stages.items():
+        # Each stage is imported in a new process, so nothing is already imported
+        Process = subprocess.run([sys.executable, "-X", "importtime", "-c", Statement], capture_output=True, text=True,
+                                 cwd=ROOT_DIR, check=False)
+        if Process.returncode != 0:
+            Error = "\n".join(x for x in Process.stderr.splitlines() if not x.startswith("import time:"))
+            print(f"{Stage}: Failed to import\n{Error}")
+            continue
+
+        # Lines are formatted as: 'import time: <self us> | <cumulative us> | <indented module name>'
+        # Children are listed before their parent, so everything up to the 'site' module is the interpreter startup
+        Imports: list[tuple[int, str]] = []
+        for Line in Process.stderr.splitlines():
+            if not Line.startswith("import time:") or "cumulative" in Line:
+                continue
+            _, Cumulative, ModuleName = Line.partition(":")[2].split("|")
+            if ModuleName.strip() == "site" and not ModuleName.startswith("  ", 1):
+                Imports.clear()
+                continue
+            Imports.append((int(Cumulative), ModuleName.rstrip()))
+
+        # Top level imports are not indented
+        TotalTime = sum(x[0] for x in Imports if not x[1].startswith("  ", 1))
+        print(f"{Stage:<10} {TotalTime / 1000:8.1f}ms  ({len(Imports)} modules)  `{Statement}`")
+        for Cumulative, ModuleName in sorted(Imports, reverse=True)[:Args.top]:
+            print(f"    {Cumulative / 1000:8.1f}ms {ModuleName.strip()}")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print(__doc__)
+        print("Available benchmarks:")
+        for Name, Function in BENCHMARKS.items():
+            Description = (Function.__doc__ or "").strip().split("\n")[0]
+            print(f"    {Name:<20} {Description}")
+        return
+
+    sys.path.append(ROOT_DIR)
+    BENCHMARKS[sys.argv[1]](sys.argv[2:])
+
+
+if __name__ == "__main__":
+    main()
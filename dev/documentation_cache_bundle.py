@@ -0,0 +1,59 @@
+"""
+Script to export & import the online documentation cache, for machines without internet access.
+
+Usage:
+    python dev/documentation_cache_bundle.py export <bundle> [--versions 2024 2025]
+    python dev/documentation_cache_bundle.py import <bundle>
+    python dev/documentation_cache_bundle.py info <bundle>
+
+Instead of importing a bundle, it can also be read directly by setting the
+PYFBSDK_DOCUMENTATION_CACHE_BUNDLE environment variable to its path.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import os
+
+# Import the cache module directly, importing the package requires pyfbsdk
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "pyfbsdk_stub_generator", "plugins", "online_documentation", "documentation_scraper"))
+
+import documentation_cache  # noqa: E402
+
+
+def main():
+    Parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    SubParsers = Parser.add_subparsers(dest="command", required=True)
+
+    ExportParser = SubParsers.add_parser("export", help="Export the local cache to a bundle")
+    ExportParser.add_argument("bundle", help="Path to the bundle file to write")
+    ExportParser.add_argument("--versions", type=int, nargs="+", help="Only export these MotionBuilder versions")
+
+    ImportParser = SubParsers.add_parser("import", help="Import a bundle into the local cache")
+    ImportParser.add_argument("bundle", help="Path to the bundle file")
+
+    InfoParser = SubParsers.add_parser("info", help="Print the content of a bundle")
+    InfoParser.add_argument("bundle", help="Path to the bundle file")
+
+    Args = Parser.parse_args()
+
+    print(f"Documentation cache: {documentation_cache.GetCacheDir()}")
+    if Args.command == "export":
+        Exported = documentation_cache.ExportBundle(Args.bundle, Args.versions)
+        print(f"Exported {Exported['Entries']} urls ({Exported['Objects']} unique pages) to {Args.bundle} "
+              f"({round(os.path.getsize(Args.bundle) / 1024 / 1024, 2)}MB)")
+
+    elif Args.command == "import":
+        Imported = documentation_cache.ImportBundle(Args.bundle)
+        print(f"Imported {Imported['Entries']} urls ({Imported['Objects']} unique pages) from {Args.bundle}")
+
+    elif Args.command == "info":
+        with documentation_cache.CacheBundle(Args.bundle) as Bundle:
+            Versions = ", ".join(str(x) for x in Bundle.Versions) if Bundle.Versions else "All"
+            print(f"Versions: {Versions}\nUrls: {len(Bundle.Entries)}\nUnique pages: {len(Bundle.Objects)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Script to print which online documentation pages would be fetched for the pyfbsdk module, without downloading them.
+
+Usage:
+    mobupy dev/documentation_plan.py [--missing]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def main():
+    Parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    Parser.add_argument("--missing", action="store_true", help="List the names that are missing from the table of contents")
+    Args = Parser.parse_args()
+
+    import pyfbsdk  # type: ignore
+
+    from pyfbsdk_stub_generator import native_generator
+    from pyfbsdk_stub_generator.stub_generator import GetMotionBuilderVersion
+    from pyfbsdk_stub_generator.plugins.online_documentation.documentation_scraper import table_of_contents
+
+    Functions, Classes, Enums = native_generator.GetModuleContent(pyfbsdk)
+
+    Namespace = table_of_contents.GetNameSpaceFromModule(pyfbsdk.__name__)
+    Documentation = table_of_contents.Documentation(Namespace, GetMotionBuilderVersion())
+    Plan = Documentation.CreateFetchPlan([x.__name__ for x in Enums + Classes], [x.__name__ for x in Functions])
+
+    print(Plan.GetSummary())
+    if Args.missing:
+        for Name in sorted(Plan.MissingNames):
+            print(f"    {Name}")
+
+
+if __name__ == "__main__":
+    try:
+        # In versions 2025 and above, the mobupy needs to be initialized before pyfbsdk can be used
+        import pyfbstandalone  # type: ignore
+        pyfbstandalone.initialize()
+    except ModuleNotFoundError:
+        pass
+
+    main()
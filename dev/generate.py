@@ -2,7 +2,7 @@
 Script used to generate the stub files under: ./generated-stub-files/
 
 This script is also used during development to test the generator, therefore it 
-reloads all of the modules and caches the online documentation on disk.
+reloads the modules that have changed since the last run (see pyfbsdk_stub_generator/hot_reload.py).
 """
 from __future__ import annotations
 
@@ -10,13 +10,10 @@ import subprocess
 import sys
 import os
 
-# from types import ModuleType
-from importlib import reload
-
 ROOT_DIR = os.path.join(os.path.dirname(__file__), "..")
 REQUIRED_PACKAGES_DIR = os.path.join(ROOT_DIR, "env")
 
-# This will cache the online documentation
+# Enables dev mode, e.g. printing the documentation fetch plan
 os.environ["PYFBSDK_DEVMODE"] = "True"
 
 
@@ -46,7 +43,7 @@ def GetPyProjectDependencies(PythonExecutable: str) -> list[str]:
 def SetupEnvironment():
     # Install required packages
     if not os.path.exists(REQUIRED_PACKAGES_DIR):
-        MoBuPyExe = os.path.join(os.path.dirname(sys.executable), "mobupy.exe")
+        MoBuPyExe = os.path.join(os.path.dirname(sys.executable), "mobupy.exe" if os.name == "nt" else "mobupy")
         Dependencies = GetPyProjectDependencies(MoBuPyExe)
 
         subprocess.run([MoBuPyExe, "-m", "pip", "install", *Dependencies, "--target", REQUIRED_PACKAGES_DIR], check=True)
@@ -58,10 +55,9 @@ def SetupEnvironment():
 
 
 def ReloadPyfbsdkStubGenerator():
-    """ Reload all of the modules that are part of the pyfbsdk_stub_generator package """
-    for ImportedModule in list(sys.modules.values()):
-        if "pyfbsdk_stub_generator" in ImportedModule.__name__:
-            reload(ImportedModule)
+    """ Reload the modules of the pyfbsdk_stub_generator package that have changed, together with their dependents """
+    from pyfbsdk_stub_generator import hot_reload
+    hot_reload.ReloadChangedModules()
 
 
 def main():
@@ -1,16 +1,46 @@
-""" 
-Script to generate pyfbsdk stub files for all MotionBuilder versions installed on the system.
+"""
+Script to generate pyfbsdk stub files for multiple MotionBuilder versions in parallel.
+
+Usage:
+    python dev/generate_all_versions.py [mobupy paths...] [--jobs N] [--summary timings.json]
+
+If no mobupy paths are given, all MotionBuilder versions installed on the system are used (Windows only).
+All versions share the same documentation cache, and their output is streamed prefixed with the version.
 """
 from __future__ import annotations
 
+import concurrent.futures
 import subprocess
-import winreg
+import threading
+import argparse
+import json
+import time
+import sys
+import re
 import os
 
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+# Import the cache module directly, importing the package requires pyfbsdk
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "pyfbsdk_stub_generator", "plugins", "online_documentation", "documentation_scraper"))
+
+import documentation_cache  # noqa: E402
+
 MOTIONBUILDER_KEY = r"SOFTWARE\Autodesk\MotionBuilder"
+MINIMUM_VERSION = 2022
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..")
+GENERATE_SCRIPT = os.path.join(os.path.dirname(__file__), "generate.py")
+REQUIRED_PACKAGES_DIR = os.path.join(ROOT_DIR, "env")
+
+PrintLock = threading.Lock()
+
 
 def GetInstalledMotionBuilderVersions():
-    """ 
+    """
     Get all of the MotionBuilder versions installed on the system.
     """
 
@@ -25,7 +55,7 @@ def GetInstalledMotionBuilderVersions():
 
 
 def GetMotionBuilderInstallDirectory(Version: int) -> str:
-    """ 
+    """
     Get the path to the MotionBuilder version.
     """
 
@@ -34,25 +64,126 @@ def GetMotionBuilderInstallDirectory(Version: int) -> str:
             return winreg.QueryValueEx(VersionKey, "InstallPath")[0]
 
 
-def main():
+def GetInstalledMotionBuilderPythons() -> dict[str, str]:
+    """
+    Get the mobupy executable for all MotionBuilder versions installed on the system.
+
+    Returns: A dict with the version as key and the path to mobupy as value
+    """
+    if winreg is None:
+        raise RuntimeError("Finding the installed MotionBuilder versions is only supported on Windows, pass the paths to mobupy instead.")
+
+    Pythons = {}
     for Version in GetInstalledMotionBuilderVersions():
-        if Version < 2022:
+        if Version < MINIMUM_VERSION:
             print(f"Skipping MotionBuilder {Version} as it's not supported.")
             continue
 
-        print(f"Generating stub file for MotionBuilder {Version}...")
-
         InstallDir = GetMotionBuilderInstallDirectory(Version)
-        MotionBuilderPython = os.path.join(InstallDir, "bin", "x64", "mobupy.exe")
+        Pythons[str(Version)] = os.path.join(InstallDir, "bin", "x64", "mobupy.exe")
+
+    return Pythons
+
+
+def GetVersionLabel(PythonExecutable: str) -> str:
+    """ Get the MotionBuilder version from the path to mobupy, e.g. '.../MotionBuilder 2025/bin/x64/mobupy.exe' -> '2025' """
+    Match = re.search(r"(20\d\d)", PythonExecutable)
+    return Match.group(1) if Match else os.path.basename(os.path.dirname(PythonExecutable))
+
+
+def Log(Label: str, Message: str):
+    with PrintLock:
+        print(f"[{Label}] {Message}", flush=True)
+
+
+def GenerateVersion(Label: str, PythonExecutable: str, Env: dict) -> tuple[int, float]:
+    """
+    Run the generate script using the given mobupy, and stream its output.
+
+    Returns: a tuple with (ReturnCode, Time in seconds)
+    """
+    Log(Label, f"Generating stub file using {PythonExecutable}")
+    StartTime = time.perf_counter()
+
+    Process = subprocess.Popen([PythonExecutable, GENERATE_SCRIPT], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, encoding="utf-8", errors="replace", env=Env)
+    for Line in Process.stdout:
+        Log(Label, Line.rstrip())
+    ReturnCode = Process.wait()
+
+    GenerationTime = time.perf_counter() - StartTime
+    Log(Label, f"Finished in {round(GenerationTime, 2)}s (exit code {ReturnCode})")
+
+    return ReturnCode, GenerationTime
+
+
+def main():
+    Parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    Parser.add_argument("pythons", nargs="*", help="Paths to the mobupy executables to generate stubs with")
+    Parser.add_argument("-j", "--jobs", type=int, help="Number of versions to generate at the same time, defaults to all of them")
+    Parser.add_argument("--summary", help="Write a JSON file with the generation times to this path")
+    Args = Parser.parse_args()
+
+    if Args.pythons:
+        Labels = [GetVersionLabel(x) for x in Args.pythons]
+        DuplicateLabels = sorted({x for x in Labels if Labels.count(x) > 1})
+        if DuplicateLabels:
+            Parser.error(f"Multiple mobupy paths have the same version: {', '.join(DuplicateLabels)}")
+        Pythons = dict(zip(Labels, Args.pythons))
+    else:
+        Pythons = GetInstalledMotionBuilderPythons()
+    if not Pythons:
+        print("No MotionBuilder versions found.")
+        return 1
+
+    # All versions share the same documentation cache, pages are often identical between the versions
+    Env = dict(os.environ)
+    Env.setdefault(documentation_cache.CACHE_DIR_ENV, documentation_cache.GetCacheDir())
+
+    Jobs = list(Pythons.items())
+    Results: dict[str, tuple[int, float]] = {}
+    StartTime = time.perf_counter()
+    StartWallTime = time.time()
+
+    # The first run installs the required packages, which can't be done by multiple processes at the same time
+    if not os.path.exists(REQUIRED_PACKAGES_DIR):
+        Label, PythonExecutable = Jobs.pop(0)
+        Results[Label] = GenerateVersion(Label, PythonExecutable, Env)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, Args.jobs or len(Jobs))) as Executor:
+        Futures = {Executor.submit(GenerateVersion, Label, PythonExecutable, Env): Label for Label, PythonExecutable in Jobs}
+        for Future in concurrent.futures.as_completed(Futures):
+            Results[Futures[Future]] = Future.result()
+
+    TotalTime = time.perf_counter() - StartTime
+
+    print("\nSummary:")
+    for Label in sorted(Results):
+        ReturnCode, GenerationTime = Results[Label]
+        Status = "OK" if ReturnCode == 0 else f"FAILED ({ReturnCode})"
+        print(f"    {Label:<10} {GenerationTime:8.2f}s  {Status}")
+    print(f"    {'Total':<10} {TotalTime:8.2f}s  (sum of all versions: {sum(x[1] for x in Results.values()):.2f}s)")
+
+    # Pages that are identical between versions are only stored & parsed once.
+    # Only the pages used by this run are counted, the cache may contain pages from older runs
+    PageEntries = documentation_cache.GetPageEntries(Env[documentation_cache.CACHE_DIR_ENV], UsedSince = StartWallTime)
+    CacheStatistics = {"Pages": len(PageEntries), "UniquePages": len({x["Hash"] for x in PageEntries.values()})}
+    if CacheStatistics["Pages"]:
+        CacheStatistics["DedupRatio"] = 1 - CacheStatistics["UniquePages"] / CacheStatistics["Pages"]
+        print(f"\nDocumentation cache: {CacheStatistics['Pages']} pages used, {CacheStatistics['UniquePages']} unique pages "
+              f"({CacheStatistics['DedupRatio'] * 100:.1f}% de-duplicated)")
+
+    if Args.summary:
+        Summary = {
+            "Total": TotalTime,
+            "Versions": {Label: {"Time": Results[Label][1], "ReturnCode": Results[Label][0]} for Label in sorted(Results)},
+            "DocumentationCache": CacheStatistics
+        }
+        with open(Args.summary, "w", encoding="utf-8") as File:
+            json.dump(Summary, File, indent=4)
 
-        # Run the generator
-        GenerateScript = os.path.join(os.path.dirname(__file__), "generate.py")
-        Result = subprocess.run([MotionBuilderPython, GenerateScript], check=False, capture_output=True, text=True)
-        if Result.stdout:
-            print(Result.stdout)
-        if Result.stderr:
-            print(Result.stderr)
+    return 0 if all(x[0] == 0 for x in Results.values()) else 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+import importlib
 import os
 
 # Make sure code is running in a motionbuilder python interpreter with access to the pyfbsdk module
@@ -6,9 +9,22 @@ try:
 except ModuleNotFoundError as e:
     raise ImportError(f"pyfbsdk_stub_generator can only be called upon from within MotionBuilder.") from e
 
-from . import stub_generator
+from . import output_writer
+from . import doc_index
+
+# Max number of seconds to wait for the documentation pages revalidated in the background when the generation is done
+REVALIDATION_TIMEOUT = 30
+
+
+def __getattr__(Name: str):
+    # The generator (and its plugins) are only imported once they're used, to keep importing this package fast
+    # `from . import stub_generator` would call this function again, since it checks if the attribute exists first
+    if Name == "stub_generator":
+        return importlib.import_module(f"{__name__}.{Name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {Name!r}")
 
-def CopyAdditionalStubs(OutDirectory: str):
+
+def CopyAdditionalStubs(OutDirectory: str) -> list[str]:
     """
     Copy the additional stubs to the output directory.
     This includes e.g. callbackframework.pyi, pyfbsdk_additions.pyi, etc.
@@ -17,41 +33,75 @@ def CopyAdditionalStubs(OutDirectory: str):
     
     ## Parameters:
         - OutDirectory: The directory where the additional stubs should be copied    
+
+    ## Returns:
+    A list of the filepaths to the copied stubs
     """
+    from . import stub_generator
+
     ManualStubsDirectory = os.path.join(os.path.dirname(__file__), "manual_stubs")
+    CopiedFiles = []
     for File in os.listdir(ManualStubsDirectory):
         if File.endswith(".pyi"):
             SrcFile = os.path.join(ManualStubsDirectory, File)
             DstFile = os.path.join(OutDirectory, File)
             
-            with open(SrcFile, "r") as f:
+            with open(SrcFile, "r", encoding="utf-8") as f:
                 content = f.read()
                 content = stub_generator.ReplaceVariables(content)
-                
-                with open(DstFile, "w") as f:
-                    f.write(content)
 
+            output_writer.WriteFile(DstFile, content)
+            CopiedFiles.append(DstFile)
 
-def Generate(Directory: str, FileExtension = "pyi", bCopyAdditionalStubs = True):
+    return CopiedFiles
+
+
+def Generate(Directory: str, FileExtension = "pyi", bCopyAdditionalStubs = True, bSplitPackage = False, bIncludeDocStrings = True, bWriteDocIndex = False, Include: list[str] | None = None, RenderWorkers = 1):
     """ 
     Generate a stub file for the pyfbsdk module. \\
     This may take a while since the online MoBu sdk documentation will have to be parsed.
 
+    Files that are already up to date will not be re-written, and a manifest (stub_manifest.json) containing
+    the hashes of all generated files is written to the directory. Files from a previous generation that are no
+    longer generated (e.g. when switching `bSplitPackage`) will be removed.
+
     ## Parameters:
         - Directory: The absolute path to the directory where the pyfbsdk stub file should be created
         - FileExtension: The file extension
         - bCopyAdditionalStubs: If True, additional manually typed stubs will be copied to the output directory. These include e.g. callbackframework.pyi, pyfbsdk_additions.pyi, etc.
+        - bSplitPackage: If True, generate a `pyfbsdk/` stub package where the classes are split up into submodules, instead of a single file. 
+          This makes type checkers & IDEs faster to load the stubs.
+        - bIncludeDocStrings: If False, only the signatures are generated. This makes the stubs a lot smaller & faster to parse, e.g. for type checking in CI.
+        - bWriteDocIndex: If True, all docstrings are written to a separate documentation index file (pyfbsdk.docindex) that can be read using `doc_index.DocIndexReader`.
+        - Include: Names of classes/functions to generate, e.g. `["FBStory", "FBStoryClip"]`. Only these and the classes they depend on (parent classes, 
+          parameter, return & property types) are introspected, documented and written. Useful to quickly review changes to a small part of the SDK.
+        - RenderWorkers: Number of worker processes used to render the stubs as python code. Requires mobupy, which is used to start the workers.
 
     ## Returns:
-    The filepath to the generated file 
+    The filepath to the generated file, or the package directory if `bSplitPackage` is True
     """
-    
+    from . import stub_generator
 
-    Filepath = os.path.join(Directory, f"pyfbsdk.{FileExtension}")
+    DocIndexFilepath = os.path.join(Directory, f"pyfbsdk.{doc_index.FILE_EXTENSION}") if bWriteDocIndex else None
 
-    Outfilepath = stub_generator.GeneratePyfbsdkStubFile(Filepath)
+    if bSplitPackage:
+        GeneratedFiles = stub_generator.GeneratePyfbsdkStubPackage(Directory, FileExtension, bIncludeDocStrings, DocIndexFilepath, Include, RenderWorkers)
+        Outfilepath = os.path.dirname(GeneratedFiles[0])
+    else:
+        Filepath = os.path.join(Directory, f"pyfbsdk.{FileExtension}")
+        Outfilepath = stub_generator.GeneratePyfbsdkStubFile(Filepath, bIncludeDocStrings, DocIndexFilepath, Include, RenderWorkers)
+        GeneratedFiles = [Outfilepath]
+
+    if DocIndexFilepath:
+        GeneratedFiles.append(DocIndexFilepath)
 
     if bCopyAdditionalStubs:
-        CopyAdditionalStubs(Directory)
+        GeneratedFiles += CopyAdditionalStubs(Directory)
+
+    output_writer.UpdateManifest(Directory, GeneratedFiles, bRemoveStale = True)
+
+    # The revalidations run in non-daemon threads, which would otherwise keep the interpreter (e.g. mobupy) from exiting
+    from .plugins.online_documentation.documentation_scraper import documentation_cache
+    documentation_cache.WaitForRevalidations(REVALIDATION_TIMEOUT)
 
     return Outfilepath
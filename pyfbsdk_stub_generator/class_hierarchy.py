@@ -0,0 +1,96 @@
+"""
+Index of the class hierarchy of the introspected module.
+
+The index is built once from the classes' parent names, and is shared by all plugins (see `PluginBaseClass.Hierarchy`)
+so inheritance checks include indirect parents without walking the hierarchy for every query.
+Parent names that aren't part of the given classes (e.g. classes outside of `Include`) are still included as ancestors.
+"""
+from __future__ import annotations
+
+import heapq
+import typing
+
+from .module_types import StubClass
+
+
+class ClassHierarchy:
+    def __init__(self, Classes: typing.Iterable[StubClass]):
+        """
+        ## Parameters:
+            - Classes: The classes (and enums) to index
+        """
+        self.Parents: dict[str, tuple[str, ...]] = {x.Name: tuple(x.Parents) for x in Classes}
+        self.Ancestors: dict[str, frozenset[str]] = {}
+        self.Depths: dict[str, int] = {}
+        self.Ranks: dict[str, int] = {}
+        self._Descendants: dict[str, frozenset[str]] | None = None
+
+        Empty = frozenset()
+        for Rank, Name in enumerate(self.GetTopologicalOrder()):
+            Parents = self.Parents[Name]
+            self.Ancestors[Name] = frozenset(Parents).union(*(self.Ancestors.get(x, Empty) for x in Parents))
+            self.Depths[Name] = max((self.Depths.get(x, 0) + 1 for x in Parents), default=0)
+            self.Ranks[Name] = Rank
+
+    def __contains__(self, Name: str) -> bool:
+        return Name in self.Parents
+
+    def GetTopologicalOrder(self) -> list[str]:
+        """ Get the class names ordered so that parent classes come before their children, otherwise the original order is kept """
+        Indices = {Name: Index for Index, Name in enumerate(self.Parents)}
+        RemainingParents = {Name: {x for x in Parents if x in Indices and x != Name} for Name, Parents in self.Parents.items()}
+        Children: dict[str, list[str]] = {Name: [] for Name in self.Parents}
+        for Name, Parents in RemainingParents.items():
+            for Parent in Parents:
+                Children[Parent].append(Name)
+
+        Ready = [Indices[Name] for Name, Parents in RemainingParents.items() if not Parents]
+        heapq.heapify(Ready)
+
+        Names = list(self.Parents)
+        Order = []
+        while Ready:
+            Name = Names[heapq.heappop(Ready)]
+            Order.append(Name)
+            for Child in Children[Name]:
+                RemainingParents[Child].discard(Name)
+                if not RemainingParents[Child]:
+                    heapq.heappush(Ready, Indices[Child])
+
+        # Only possible with an inheritance cycle, which python doesn't allow. Keep them in their original order
+        if len(Order) != len(Names):
+            Ordered = set(Order)
+            Order.extend(x for x in Names if x not in Ordered)
+
+        return Order
+
+    def IsSubclassOf(self, Name: str, BaseName: str) -> bool:
+        """ Same as `issubclass()`, a class is considered a subclass of itself """
+        return Name == BaseName or BaseName in self.Ancestors.get(Name, ())
+
+    def GetAncestors(self, Name: str) -> frozenset[str]:
+        """ Get the names of all classes the class inherits from, both directly and indirectly """
+        return self.Ancestors.get(Name, frozenset())
+
+    @property
+    def Descendants(self) -> dict[str, frozenset[str]]:
+        """ The descendants of each class, they're only collected the first time they're needed """
+        if self._Descendants is None:
+            Descendants: dict[str, set[str]] = {}
+            for Name, Ancestors in self.Ancestors.items():
+                for Ancestor in Ancestors:
+                    Descendants.setdefault(Ancestor, set()).add(Name)
+            self._Descendants = {Name: frozenset(x) for Name, x in Descendants.items()}
+        return self._Descendants
+
+    def GetDescendants(self, Name: str) -> frozenset[str]:
+        """ Get the names of all classes inheriting from the class, both directly and indirectly """
+        return self.Descendants.get(Name, frozenset())
+
+    def GetDepth(self, Name: str) -> int:
+        """ Get the length of the longest inheritance chain from the class to a class without any parents """
+        return self.Depths.get(Name, 0)
+
+    def GetRank(self, Name: str) -> int:
+        """ Get the index of the class in the topological order (see `GetTopologicalOrder()`) """
+        return self.Ranks[Name]
@@ -0,0 +1,15 @@
+"""
+Dev mode is enabled by setting the PYFBSDK_DEVMODE environment variable to "True", e.g. by dev/generate.py.
+
+In dev mode, changed modules are reloaded when the generator is re-run within the same MotionBuilder session,
+see `hot_reload`.
+"""
+from __future__ import annotations
+
+import os
+
+DEVMODE_ENV = "PYFBSDK_DEVMODE"
+
+
+def IsDevMode() -> bool:
+    return os.environ.get(DEVMODE_ENV, "").lower() == "true"
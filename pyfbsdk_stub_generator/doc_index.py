@@ -0,0 +1,151 @@
+"""
+Documentation index, used to store the docstrings separately from the stubs.
+
+Stubs generated without docstrings are a lot smaller & faster for type checkers to parse, the docstrings can
+instead be written to a documentation index, where hover tooling can lazily look them up by their qualified name,
+e.g. `FBModel`, `FBModel.Translation` or `FBGetSelectedModels`.
+Overloaded functions with different docstrings are stored with their overload index, e.g. `FBMult[0]` & `FBMult[1]`.
+
+File format:
+    - A header line: `PYFBSDK-DOCINDEX <version>`
+    - A JSON line mapping each qualified name to an [offset, size] pair
+    - The zlib compressed docstrings, the offsets are relative to the end of the JSON line
+"""
+from __future__ import annotations
+
+import typing
+import json
+import zlib
+
+from .module_types import StubBase, StubClass, StubFunction
+
+FILE_HEADER = "PYFBSDK-DOCINDEX"
+FILE_VERSION = 1
+FILE_EXTENSION = "docindex"
+
+
+# -------------------------------------------------------------
+#                       Helper Functions
+# -------------------------------------------------------------
+
+def _CollectClassDocStrings(Class: StubClass, Prefix: str, DocStrings: dict[str, str]):
+    QualifiedName = f"{Prefix}{Class.Name}"
+    if Class.DocString:
+        DocStrings[QualifiedName] = Class.DocString
+
+    for StubObject in Class.StubEnums:
+        _CollectClassDocStrings(StubObject, f"{QualifiedName}.", DocStrings)
+
+    for Property in Class.StubProperties:
+        if Property.DocString:
+            DocStrings[f"{QualifiedName}.{Property.Name}"] = Property.DocString
+
+    for FunctionGroup in Class.StubFunctions:
+        _CollectFunctionGroupDocStrings(FunctionGroup, f"{QualifiedName}.", DocStrings)
+
+
+def _CollectFunctionGroupDocStrings(FunctionGroup: list[StubFunction], Prefix: str, DocStrings: dict[str, str]):
+    FunctionDocStrings = [x.DocString for x in FunctionGroup]
+    if not any(FunctionDocStrings):
+        return
+
+    QualifiedName = f"{Prefix}{FunctionGroup[0].Name}"
+
+    # If all overloads share the same docstring, only store it once
+    if len(set(FunctionDocStrings)) == 1:
+        DocStrings[QualifiedName] = FunctionDocStrings[0]
+        return
+
+    for Index, DocString in enumerate(FunctionDocStrings):
+        if DocString:
+            DocStrings[f"{QualifiedName}[{Index}]"] = DocString
+
+
+def IterStubs(Enums: list[StubClass], Classes: list[StubClass], FunctionGroupList: list[list[StubFunction]]) -> typing.Iterator[StubBase]:
+    """ Iterate over all stubs, including the class members """
+    ClassesToVisit = list(Enums) + list(Classes)
+    while ClassesToVisit:
+        Class = ClassesToVisit.pop()
+        yield Class
+        ClassesToVisit.extend(Class.StubEnums)
+        yield from Class.StubProperties
+        for FunctionGroup in Class.StubFunctions:
+            yield from FunctionGroup
+
+    for FunctionGroup in FunctionGroupList:
+        yield from FunctionGroup
+
+
+# -------------------------------------------------------------
+#                       Functions
+# -------------------------------------------------------------
+
+def CollectDocStrings(Enums: list[StubClass], Classes: list[StubClass], FunctionGroupList: list[list[StubFunction]]) -> dict[str, str]:
+    """
+    Get all of the docstrings in the stubs
+
+    Returns: A dict with the qualified name as key, and the docstring as value
+    """
+    DocStrings: dict[str, str] = {}
+    for Class in Enums + Classes:
+        _CollectClassDocStrings(Class, "", DocStrings)
+
+    for FunctionGroup in FunctionGroupList:
+        if FunctionGroup:
+            _CollectFunctionGroupDocStrings(FunctionGroup, "", DocStrings)
+
+    return DocStrings
+
+
+def ClearDocStrings(Enums: list[StubClass], Classes: list[StubClass], FunctionGroupList: list[list[StubFunction]]):
+    """ Remove the docstrings from all of the stubs """
+    for Stub in IterStubs(Enums, Classes, FunctionGroupList):
+        Stub.DocString = ""
+
+
+def GetDocIndexBytes(DocStrings: dict[str, str]) -> bytes:
+    """ Get the content of a documentation index file """
+    Index = {}
+    Data = bytearray()
+    for Name in sorted(DocStrings):
+        CompressedDocString = zlib.compress(DocStrings[Name].encode("utf-8"), 9)
+        Index[Name] = [len(Data), len(CompressedDocString)]
+        Data += CompressedDocString
+
+    Header = f"{FILE_HEADER} {FILE_VERSION}\n{json.dumps(Index, separators=(',', ':'))}\n"
+
+    return Header.encode("utf-8") + bytes(Data)
+
+
+class DocIndexReader:
+    """
+    Read docstrings from a documentation index file.
+    Only the index is read when the file is opened, docstrings are read from disk when requested.
+    """
+
+    def __init__(self, Filepath: str):
+        self.Filepath = Filepath
+
+        with open(Filepath, "rb") as File:
+            Header = File.readline().decode("utf-8").split()
+            if len(Header) != 2 or Header[0] != FILE_HEADER or int(Header[1]) != FILE_VERSION:
+                raise ValueError(f"{Filepath} is not a valid documentation index file")
+
+            self.Index: dict[str, list[int]] = json.loads(File.readline())
+            self.DataOffset = File.tell()
+
+    def __contains__(self, QualifiedName: str) -> bool:
+        return QualifiedName in self.Index
+
+    def GetNames(self) -> list[str]:
+        return list(self.Index)
+
+    def GetDocString(self, QualifiedName: str) -> str | None:
+        """ Get the docstring for e.g. `FBModel.Translation`, returns None if it doesn't have a docstring """
+        if QualifiedName not in self.Index:
+            return None
+
+        Offset, Size = self.Index[QualifiedName]
+        with open(self.Filepath, "rb") as File:
+            File.seek(self.DataOffset + Offset)
+            return zlib.decompress(File.read(Size)).decode("utf-8")
@@ -0,0 +1,252 @@
+"""
+Hot reloading of the pyfbsdk_stub_generator modules, used in dev mode (see `dev_mode`) when the generator
+is re-run within the same MotionBuilder session.
+
+Only the modules whose source file has changed since the last check are reloaded, together with all of the
+modules that import them. The modules are reloaded in dependency order, so a module always picks up the
+reloaded version of the modules it imports from.
+
+Expensive state that doesn't depend on the code, e.g. the parsed documentation, can be kept between
+reloads using `GetState()`.
+"""
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import typing
+import time
+import sys
+import ast
+import os
+
+from types import ModuleType
+
+from . import dev_mode
+
+T = typing.TypeVar("T")
+
+PACKAGE_NAME = __package__
+
+# This module holds the state that's kept between reloads, so it must never be reloaded itself
+EXCLUDED_MODULES = {__name__, dev_mode.__name__}
+
+# The source modified time of each module, the last time the modules were checked
+_ModuleTimes: dict[str, int] = {}
+_LastCheckTime: float | None = None
+
+# Key -> (Fingerprint, Value)
+_States: dict[str, tuple[tuple, typing.Any]] = {}
+
+
+# -------------------------------------------------------------
+#                       Helper Functions
+# -------------------------------------------------------------
+
+def _GetModifiedTime(Filepath: str) -> int | None:
+    try:
+        return os.stat(Filepath).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _IterModuleLevelStatements(Statements: list[ast.stmt]) -> typing.Iterator[ast.stmt]:
+    """ Iterate over the statements that run when the module is imported, imports inside of functions are lazy & ignored """
+    for Statement in Statements:
+        yield Statement
+        if isinstance(Statement, (ast.If, ast.Try, ast.With)):
+            for Body in (Statement.body, getattr(Statement, "orelse", []), getattr(Statement, "finalbody", [])):
+                yield from _IterModuleLevelStatements(Body)
+            for Handler in getattr(Statement, "handlers", []):
+                yield from _IterModuleLevelStatements(Handler.body)
+
+
+# -------------------------------------------------------------
+#                       Functions
+# -------------------------------------------------------------
+
+def GetPackageModules() -> dict[str, ModuleType]:
+    """ Get all of the loaded pyfbsdk_stub_generator modules that can be reloaded """
+    Modules = {}
+    for Name, Module in list(sys.modules.items()):
+        if Name != PACKAGE_NAME and not Name.startswith(f"{PACKAGE_NAME}."):
+            continue
+        if Name in EXCLUDED_MODULES or not getattr(Module, "__file__", None):
+            continue
+        Modules[Name] = Module
+
+    return Modules
+
+
+def GetModuleImports(Module: ModuleType) -> set[str]:
+    """
+    Get the names of the modules imported by the module when it's imported.
+    For `from X import Y`, `X.Y` is used if it's a submodule, otherwise `X`.
+    """
+    try:
+        with open(Module.__file__, "r", encoding="utf-8") as File:
+            Tree = ast.parse(File.read(), Module.__file__)
+    except (OSError, SyntaxError):
+        return set()
+
+    Imports = set()
+    for Statement in _IterModuleLevelStatements(Tree.body):
+        if isinstance(Statement, ast.Import):
+            Imports.update(x.name for x in Statement.names)
+        elif isinstance(Statement, ast.ImportFrom):
+            try:
+                BaseName = importlib.util.resolve_name("." * Statement.level + (Statement.module or ""), Module.__package__)
+            except (ImportError, ValueError):
+                continue
+            for Alias in Statement.names:
+                SubmoduleName = f"{BaseName}.{Alias.name}"
+                Imports.add(SubmoduleName if SubmoduleName in sys.modules else BaseName)
+
+    return Imports
+
+
+def GetReloadOrder(ModuleNames: typing.Iterable[str], Dependencies: dict[str, set[str]]) -> list[str]:
+    """
+    Sort the modules so that each module comes after the modules it depends on (Kahn's algorithm).
+    Modules that are part of an import cycle are added last, sorted by name.
+
+    ## Parameters:
+        - ModuleNames: The names of the modules to sort
+        - Dependencies: Module name -> names of the modules it imports
+    """
+    ModuleNames = set(ModuleNames)
+    Remaining = {Name: Dependencies.get(Name, set()) & (ModuleNames - {Name}) for Name in ModuleNames}
+
+    Order = []
+    Ready = sorted(Name for Name, Requirements in Remaining.items() if not Requirements)
+    while Ready:
+        Name = Ready.pop(0)
+        Order.append(Name)
+        del Remaining[Name]
+        for OtherName, Requirements in Remaining.items():
+            if Name in Requirements:
+                Requirements.discard(Name)
+                if not Requirements:
+                    Ready.append(OtherName)
+        Ready.sort()
+
+    Order.extend(sorted(Remaining))
+    return Order
+
+
+def GetChangedModules(Modules: dict[str, ModuleType]) -> set[str]:
+    """
+    Get the names of the modules whose source file has changed since the last check.
+    Modules that weren't loaded during the last check are compared against the time of the last check instead,
+    on the first check all of them are considered changed since it's unknown when they were imported.
+    """
+    Changed = set()
+    for Name, Module in Modules.items():
+        ModifiedTime = _GetModifiedTime(Module.__file__)
+        if ModifiedTime is None:
+            continue
+
+        if Name in _ModuleTimes:
+            if ModifiedTime != _ModuleTimes[Name]:
+                Changed.add(Name)
+        elif _LastCheckTime is None or ModifiedTime / 1e9 >= _LastCheckTime:
+            Changed.add(Name)
+
+    return Changed
+
+
+def ReloadChangedModules() -> list[str]:
+    """
+    Reload the modules that have changed since the last call, together with the modules depending on them.
+
+    Returns: The names of the reloaded modules, in the order they were reloaded
+    """
+    global _LastCheckTime
+
+    StartTime = time.time()
+
+    Modules = GetPackageModules()
+    Changed = GetChangedModules(Modules)
+
+    Dependencies = {Name: GetModuleImports(Module) for Name, Module in Modules.items()}
+    Dependents: dict[str, set[str]] = {Name: set() for Name in Modules}
+    for Name, Imports in Dependencies.items():
+        for ImportName in Imports & Dependents.keys():
+            Dependents[ImportName].add(Name)
+
+    # Every module importing a changed module needs to be reloaded as well, to pick up the new objects
+    ToReload = set()
+    Stack = list(Changed)
+    while Stack:
+        Name = Stack.pop()
+        if Name not in ToReload:
+            ToReload.add(Name)
+            Stack.extend(Dependents[Name])
+
+    Order = GetReloadOrder(ToReload, Dependencies)
+    for Name in Order:
+        importlib.reload(Modules[Name])
+
+    # Modules may have been imported while reloading, e.g. new imports
+    _ModuleTimes.clear()
+    for Name, Module in GetPackageModules().items():
+        ModifiedTime = _GetModifiedTime(Module.__file__)
+        if ModifiedTime is not None:
+            _ModuleTimes[Name] = ModifiedTime
+    _LastCheckTime = StartTime
+
+    if Order:
+        print(f"Reloading {len(Order)} of {len(Modules)} modules took: {round(time.time() - StartTime, 2)}s.")
+
+    return Order
+
+
+def GetSourceFingerprint(ModuleNames: typing.Iterable[str]) -> tuple:
+    """ Get the modified times of the source files of the modules, packages include all of their source files """
+    Fingerprint = []
+    for ModuleName in sorted(ModuleNames):
+        Spec = importlib.util.find_spec(ModuleName)
+        if Spec is None:
+            Fingerprint.append((ModuleName, None))
+            continue
+
+        # Packages may be namespace packages without an origin
+        Filepaths = [Spec.origin] if Spec.origin and os.path.isfile(Spec.origin) else []
+        if Spec.submodule_search_locations:
+            Filepaths = []
+            for Directory in Spec.submodule_search_locations:
+                for Root, DirNames, FileNames in os.walk(Directory):
+                    DirNames.sort()
+                    Filepaths.extend(os.path.join(Root, x) for x in sorted(FileNames) if x.endswith(".py"))
+
+        Fingerprint.extend((x, _GetModifiedTime(x)) for x in Filepaths)
+
+    return tuple(Fingerprint)
+
+
+def GetState(Key: str, Factory: typing.Callable[[], T], Dependencies: typing.Iterable[str]) -> T:
+    """
+    Get a value that's kept between reloads in dev mode. Outside of dev mode, the factory is always called.
+
+    ## Parameters:
+        - Key: Unique key for the value
+        - Factory: Creates the value if it doesn't exist or is out of date
+        - Dependencies: Names of the modules (or packages) the value depends on, the value is re-created if any of their source files change
+
+    ## Returns:
+    The kept value, or a new value created by the factory
+    """
+    if not dev_mode.IsDevMode():
+        return Factory()
+
+    Fingerprint = GetSourceFingerprint(Dependencies)
+    if Key in _States and _States[Key][0] == Fingerprint:
+        return _States[Key][1]
+
+    Value = Factory()
+    _States[Key] = (Fingerprint, Value)
+    return Value
+
+
+def ClearStates():
+    """ Remove all of the values kept between reloads """
+    _States.clear()
@@ -3,6 +3,9 @@ from __future__ import annotations
 import typing
 import copy
 
+if typing.TYPE_CHECKING:
+    from .type_index import TypeReferenceIndex
+
 ALWAYS_CREATE_ELLIPSIS = True
 TAB_CHARACTER = "\t"
 
@@ -19,16 +22,61 @@ def Indent(Text: str) -> str:
 
 
 class StubBase:
+    # The type reference index the stub is part of (see `type_index`), it's kept up to date when the type is changed
+    TypeIndex: TypeReferenceIndex | None = None
+
     def __init__(self, Ref: object, Name="") -> None:
         self.Ref = Ref
         self.Name: str = Name
-        self.DocString = ""
+        self._DocString: str | typing.Callable[[], str] = ""
 
     def __copy__(self):
         NewInstance = self.__class__(self.Ref, Name=self.Name)
-        NewInstance.DocString = self.DocString
+        NewInstance._DocString = self._DocString
+        return NewInstance
+
+    def __deepcopy__(self, Memo: dict):
+        # The referenced object is the one being introspected, so it's shared rather than copied
+        NewInstance = self.__class__.__new__(self.__class__)
+        Memo[id(self)] = NewInstance
+        for Key, Value in self.__dict__.items():
+            # The copy isn't part of the type index
+            if Key != "TypeIndex":
+                setattr(NewInstance, Key, Value if Key == "Ref" else copy.deepcopy(Value, Memo))
         return NewInstance
 
+    def __getstate__(self):
+        # The referenced object can't be pickled, pickled stubs are only used to render them (see `stub_renderer`)
+        State = self.__dict__.copy()
+        State["Ref"] = None
+        State.pop("TypeIndex", None)
+        return State
+
+    def _UpdateTypeIndex(self, OldType: str | None, NewType: str | None):
+        if self.TypeIndex is not None:
+            self.TypeIndex.Update(self, OldType, NewType)
+
+    def _AddToTypeIndex(self, Stub: StubBase):
+        """ Add a new member of this stub to the type index this stub is part of """
+        if self.TypeIndex is not None:
+            self.TypeIndex.Add(Stub)
+
+    def _RemoveFromTypeIndex(self, Stub: StubBase):
+        if self.TypeIndex is not None:
+            self.TypeIndex.Remove(Stub)
+
+    @property
+    def DocString(self) -> str:
+        # The docstring can be set to a callable, which is only called once the docstring is needed.
+        # This avoids e.g. converting documentation that's never used.
+        if callable(self._DocString):
+            self._DocString = self._DocString()
+        return self._DocString
+
+    @DocString.setter
+    def DocString(self, Value: str | typing.Callable[[], str]):
+        self._DocString = Value
+
     def __repr__(self):
         return f"<{self.__class__.__name__}: {self.Name}>"
 
@@ -71,6 +119,10 @@ class StubFunction(StubBase):
         NewInstance.bIsStatic = self.bIsStatic
         return NewInstance
 
+    def CreateVariant(self) -> StubFunctionVariant:
+        """ Create an overload variant of the function, that shares the parameters with this function (see `StubFunctionVariant`) """
+        return StubFunctionVariant(self)
+
     @property
     def ReturnType(self):
         if self._ReturnType == "object":
@@ -79,10 +131,12 @@ class StubFunction(StubBase):
 
     @ReturnType.setter
     def ReturnType(self, Value: str | None):
+        self._UpdateTypeIndex(self._ReturnType, Value)
         self._ReturnType = Value
 
     def AddParameter(self, Parameter: StubParameter):
         self._Params.append(Parameter)
+        self._AddToTypeIndex(Parameter)
 
     def GetParameters(self, bExcludeSelf=False) -> list[StubParameter]:
         """
@@ -98,7 +152,9 @@ class StubFunction(StubBase):
     def SetParameter(self, Index: int, Parameter: StubParameter):
         if Index > len(self._Params) - 1:
             raise IndexError("given parameter index is larger than the size of the parameter array")
+        self._RemoveFromTypeIndex(self._Params[Index])
         self._Params[Index] = Parameter
+        self._AddToTypeIndex(Parameter)
 
     def GetRequirements(self) -> list:
         ReturnValue = []
@@ -146,6 +202,81 @@ class StubFunction(StubBase):
         return FunctionAsString
 
 
+class StubFunctionVariant(StubFunction):
+    """
+    An overload variant of a function, sharing the parameters & docstring with its parent function.
+    Only the overridden parameters are stored in the variant. The parameters from `GetParameters()` that aren't overridden
+    are owned by the parent and must not be modified, use `GetOwnParameter()` or `SetParameterType()` to modify a parameter.
+    The parameter list is put together when it's needed, e.g. when the variant is rendered.
+    """
+    def __init__(self, Parent: StubFunction):
+        # The parameters are owned by the parent, so StubFunction.__init__ is skipped
+        StubBase.__init__(self, Parent.Ref, Name=Parent.Name)
+        self.Parent = Parent
+        self.ParameterOverrides: dict[int, StubParameter] = {}
+        self._ReturnType = Parent._ReturnType
+        self.bIsMethod = Parent.bIsMethod
+        self.bIsStatic = Parent.bIsStatic
+        self._DocString = None  # None means the parent's docstring is used
+
+    def __copy__(self):
+        NewInstance = self.__class__(self.Parent)
+        NewInstance.ParameterOverrides = {Index: copy.copy(x) for Index, x in self.ParameterOverrides.items()}
+        NewInstance._ReturnType = self._ReturnType
+        NewInstance.bIsMethod = self.bIsMethod
+        NewInstance.bIsStatic = self.bIsStatic
+        NewInstance._DocString = self._DocString
+        return NewInstance
+
+    @property
+    def _Params(self) -> list[StubParameter]:
+        return [self.ParameterOverrides.get(Index, x) for Index, x in enumerate(self.Parent._Params)]
+
+    @property
+    def DocString(self) -> str:
+        if self._DocString is None:
+            return self.Parent.DocString
+        return StubBase.DocString.fget(self)
+
+    @DocString.setter
+    def DocString(self, Value: str | typing.Callable[[], str] | None):
+        self._DocString = Value
+
+    def GetParameters(self, bExcludeSelf=False) -> list[StubParameter]:
+        """
+        Get a list of the parameters, the parameters that aren't overridden are owned by the parent and must not be modified (see `GetOwnParameter()`)
+
+        ### Parameters:
+            - bExcludeSelf: If the function is a method, exclude the first parameter (self)
+        """
+        if bExcludeSelf and self.bIsMethod:
+            return self._Params[1:]
+        return self._Params
+
+    def GetOwnParameter(self, Index: int) -> StubParameter:
+        """ Get the variant's own parameter that can be modified, the parameter is copied from the parent the first time it's requested """
+        if Index not in self.ParameterOverrides:
+            Parameter = self.ParameterOverrides[Index] = copy.copy(self.Parent._Params[Index])
+            Parameter.TypeIndex = None  # The copy is only indexed if the variant is
+            self._AddToTypeIndex(Parameter)
+        return self.ParameterOverrides[Index]
+
+    def SetParameterType(self, Index: int, Type: str | None):
+        """ Override the type of a parameter, the parameter is copied from the parent the first time it's overridden """
+        self.GetOwnParameter(Index).Type = Type
+
+    def SetParameter(self, Index: int, Parameter: StubParameter):
+        if Index > len(self.Parent._Params) - 1:
+            raise IndexError("given parameter index is larger than the size of the parameter array")
+        if Index in self.ParameterOverrides:
+            self._RemoveFromTypeIndex(self.ParameterOverrides[Index])
+        self.ParameterOverrides[Index] = Parameter
+        self._AddToTypeIndex(Parameter)
+
+    def AddParameter(self, Parameter: StubParameter):
+        raise TypeError("Parameters can't be added to a function variant, the parameter list is owned by the parent function")
+
+
 class StubClass(StubBase):
     def __init__(self, Ref: type, Name=""):
         super().__init__(Ref, Name=Name)
@@ -167,14 +298,26 @@ class StubClass(StubBase):
 
     def AddEnum(self, Enum: StubClass):
         self.StubEnums.append(Enum)
+        self._AddToTypeIndex(Enum)
 
     def AddFunctions(self, Functions: list[StubFunction]):
         for Function in Functions:
             Function.bIsMethod = True  # Make function a method
+            self._AddToTypeIndex(Function)
         self.StubFunctions.append(Functions)
 
+    def RemoveFunctions(self, Functions: list[StubFunction]):
+        self.StubFunctions.remove(Functions)
+        for Function in Functions:
+            self._RemoveFromTypeIndex(Function)
+
     def AddProperty(self, Property: StubProperty):
         self.StubProperties.append(Property)
+        self._AddToTypeIndex(Property)
+
+    def RemoveProperty(self, Property: StubProperty):
+        self.StubProperties.remove(Property)
+        self._RemoveFromTypeIndex(Property)
 
     def AddParent(self, Parent: str):
         self.Parents.append(Parent)
@@ -232,6 +375,7 @@ class StubProperty(StubBase):
 
     @Type.setter
     def Type(self, Value):
+        self._UpdateTypeIndex(self._Type, Value)
         self._Type = Value
 
     def GetAsString(self):
@@ -275,7 +419,7 @@ class StubParameter(StubBase):
         NewInstance = super().__copy__()
         NewInstance.DefaultValue = self.DefaultValue
         NewInstance._Type = self._Type
-        NewInstance.DocString = self.DocString
+        NewInstance._DocString = self._DocString
         return NewInstance
 
     @property
@@ -286,6 +430,7 @@ class StubParameter(StubBase):
 
     @Type.setter
     def Type(self, Value: str | None):
+        self._UpdateTypeIndex(self._Type, Value)
         self._Type = Value
 
     def GetRequirements(self):
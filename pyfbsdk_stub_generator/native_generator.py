@@ -1,24 +1,23 @@
 from __future__ import annotations
 
+import functools
 import inspect
 import typing
 import types
+import re
 
 from types import ModuleType
-from importlib import reload
 
-from . import module_types
 from .module_types import StubClass, StubFunction, StubParameter, StubProperty
 
 import pyfbsdk as fb
 
-reload(module_types)
-
 ENUMERATION_NAME = "Enumeration"
 ALLOWED_BUILTIN_OVERRIDES = {"__gt__", "__lt__", "__ge__", "__le__"}
 ALLOWED_CLASS_OVERRIDES = [
     fb.FBEvent.Type,
 ]
+TYPE_NAME_PATTERN = re.compile(r"[A-Za-z_]\w*")
 
 
 class FObjectType:
@@ -73,6 +72,44 @@ def GetClassParents(Class):
     return Class.__bases__
 
 
+class ClassMemberTable(typing.NamedTuple):
+    Names: frozenset[str]
+    """ Names of all members accessible on the class, including inherited ones (same as `dir(Class)`) """
+    OverrideNames: frozenset[str]
+    """ Names of the members whose value is in `ALLOWED_CLASS_OVERRIDES` """
+
+
+@functools.lru_cache(maxsize=None)
+def GetClassMemberTable(Class: type) -> ClassMemberTable:
+    """
+    Get the member names of a class. The table is built once per class in MRO order, 
+    where single inheritance classes re-use the table of their parent class.
+    """
+    OwnNames = vars(Class).keys()
+    Parents = GetClassParents(Class)
+
+    if len(Parents) == 1:
+        ParentTable = GetClassMemberTable(Parents[0])
+        Names = ParentTable.Names.union(OwnNames)
+        OverrideNames = set(ParentTable.OverrideNames.difference(OwnNames))
+        NamesToResolve = OwnNames
+    else:
+        Names = frozenset(Name for MroClass in Class.__mro__ for Name in vars(MroClass))
+        OverrideNames = set()
+        NamesToResolve = Names
+
+    for Name in NamesToResolve:
+        if getattr(Class, Name, None) in ALLOWED_CLASS_OVERRIDES:
+            OverrideNames.add(Name)
+
+    return ClassMemberTable(Names, frozenset(OverrideNames))
+
+
+def HasClassMember(Class: type, Name: str) -> bool:
+    """ Same as `hasattr(Class, Name)`, but using the member tables of the class & its metaclass """
+    return Name in GetClassMemberTable(Class).Names or Name in GetClassMemberTable(type(Class)).Names
+
+
 def GetUniqueClassMembers(Class, Ignore = (), AllowedOverrides = ()):
     """ 
     Args:
@@ -82,24 +119,28 @@ def GetUniqueClassMembers(Class, Ignore = (), AllowedOverrides = ()):
 
     Returns: tuple("Name", Reference)
     """
-    Members = inspect.getmembers(Class)
     ParentClass = GetClassParents(Class)[0]
+    ParentOverrideNames = GetClassMemberTable(ParentClass).OverrideNames
 
     UniqueMembers = []
-    for Name, Ref in Members:
+    for Name in sorted(GetClassMemberTable(Class).Names):
         if Name in Ignore:
             continue
 
-        if hasattr(ParentClass, Name):
-            if ParentClass.__name__ == "instance":
-                if isinstance(Ref, (types.BuiltinFunctionType, types.BuiltinMethodType)) and Name in ALLOWED_BUILTIN_OVERRIDES:
-                    UniqueMembers.append((Name, Ref))
+        # Only members that are inherited from the parent class needs to be checked against the override rules
+        if HasClassMember(ParentClass, Name):
+            if ParentClass.__name__ == "instance" and Name in ALLOWED_BUILTIN_OVERRIDES:
+                if isinstance(getattr(Class, Name, None), (types.BuiltinFunctionType, types.BuiltinMethodType)):
+                    UniqueMembers.append((Name, getattr(Class, Name)))
                     continue
 
-            if Name not in AllowedOverrides and getattr(ParentClass, Name) not in ALLOWED_CLASS_OVERRIDES:
+            if Name not in AllowedOverrides and Name not in ParentOverrideNames:
                 continue
 
-        UniqueMembers.append((Name, Ref))
+        try:
+            UniqueMembers.append((Name, getattr(Class, Name)))
+        except AttributeError:
+            continue
 
     return UniqueMembers
 
@@ -119,35 +160,44 @@ def GetClassParentNames(Class):
     return ParentClassNames
 
 
-def GetFunctionInfoFromDocString(Function: typing.Callable) -> list[tuple[list[StubParameter], str]]:
-    """
-    Get Parameters & Return type from the docstring, can return multiple results if overload functions exists.
+class ParsedParameter(typing.NamedTuple):
+    Name: str
+    Type: str
+    DefaultValue: str | None
 
-    Returns: a list of tuple([Parameters], ReturnType)
+
+class ParsedSignature(typing.NamedTuple):
+    Parameters: tuple[ParsedParameter, ...]
+    ReturnType: str
+
+
+def _ParseParameters(ParamsString: str, DefaultValue: str | None = None) -> tuple[ParsedParameter, ...]:
+    """ 
+    Parse a param string that looks something like this:
+    "(FBVector4d)arg1, (FBVector4d)arg2, (FBVector4d)arg3"
     """
-    def _GenerateParams(ParamsString, DefaultValue = None) -> list[StubParameter]:
-        """ 
-        Parse a param string that looks something like this:
-        "(FBVector4d)arg1, (FBVector4d)arg2, (FBVector4d)arg3"
-        and generate StubParameter instances from it
-        """
-        Params = []
-        for Param in ParamsString.split(","):
-            # Param will now look something like this: '(str)arg1'
-            ParamType, _, ParamName = Param.strip().partition(")")
-            ParameterInstance = StubParameter(Function, ParamName, ParamType[1:], DefaultValue = DefaultValue)
-            Params.append(ParameterInstance)
-        return Params
+    Params = []
+    for Param in ParamsString.split(","):
+        # Param will now look something like this: '(str)arg1'
+        ParamType, _, ParamName = Param.strip().partition(")")
+        Params.append(ParsedParameter(ParamName, ParamType[1:], DefaultValue))
+    return tuple(Params)
 
-    if not Function.__doc__:  # Return an empty list if the function has no docstring
-        return []
 
-    FunctionParameters = []
+@functools.lru_cache(maxsize=None)
+def ParseDocStringSignatures(FunctionName: str, DocString: str) -> tuple[ParsedSignature, ...]:
+    """
+    Parse the function signatures from a Boost.Python docstring, can return multiple signatures if overload functions exists.
+
+    Many functions share the exact same docstring (e.g. `append` & `__getitem__` on all of the FBPropertyList classes), 
+    so the result is cached based on the function name & docstring. The returned signatures are immutable, use 
+    `GetFunctionInfoFromDocString()` to get StubParameter instances.
+    """
+    Signatures = []
     # Read the docstring and split it up if there are multiple function overrides
-    FunctionsDocs = [x for x in Function.__doc__.split("\n") if x]
-    for Doc in FunctionsDocs:
+    for Doc in DocString.split("\n"):
         # Make sure `Doc` now follows this format: "FunctionName( (str)arg1 [, (object)arg2]) -> object"
-        if not Doc.strip().startswith(Function.__name__) or not all(x in Doc for x in ["->", "(", ")"]):
+        if not Doc.strip().startswith(FunctionName) or not all(x in Doc for x in ["->", "(", ")"]):
             continue
 
         # 'Doc' will now look something like this:
@@ -162,15 +212,30 @@ def GetFunctionInfoFromDocString(Function: typing.Callable) -> list[tuple[list[S
         RequiredParams, _, OptionalParams = Params.partition("[")
         OptionalParams = OptionalParams.replace("[", "").replace("]", "").lstrip(',')
 
-        Params = []
+        Parameters: tuple[ParsedParameter, ...] = ()
         if RequiredParams.strip():
-            Params += _GenerateParams(RequiredParams)
+            Parameters += _ParseParameters(RequiredParams)
         if OptionalParams.strip():
-            Params += _GenerateParams(OptionalParams, DefaultValue = "None")
+            Parameters += _ParseParameters(OptionalParams, DefaultValue = "None")
+
+        Signatures.append(ParsedSignature(Parameters, ReturnType.strip()))
+
+    return tuple(Signatures)
+
+
+def GetFunctionInfoFromDocString(Function: typing.Callable) -> list[tuple[list[StubParameter], str]]:
+    """
+    Get Parameters & Return type from the docstring, can return multiple results if overload functions exists.
+
+    Returns: a list of tuple([Parameters], ReturnType)
+    """
+    if not Function.__doc__:  # Return an empty list if the function has no docstring
+        return []
 
-        FunctionParameters.append(
-            (Params, ReturnType.strip())
-        )
+    FunctionParameters = []
+    for Signature in ParseDocStringSignatures(Function.__name__, Function.__doc__):
+        Params = [StubParameter(Function, x.Name, x.Type, DefaultValue = x.DefaultValue) for x in Signature.Parameters]
+        FunctionParameters.append((Params, Signature.ReturnType))
 
     return FunctionParameters
 
@@ -290,16 +355,104 @@ def GenerateFunctionInstances(Function) -> list[StubFunction]:
 #                     Main Generator Class
 # -------------------------------------------------------------
 
-def GenerateModuleSubs(Module: ModuleType):
+def GetTypeNames(Type: str | None) -> set[str]:
+    """ Get all names used in a type, e.g. 'list[FBModel]|None' -> {'list', 'FBModel', 'None'} """
+    if not Type:
+        return set()
+    return set(TYPE_NAME_PATTERN.findall(Type))
+
+
+def GetFunctionGroupDependencies(FunctionGroup: list[StubFunction]) -> set[str]:
+    """ Get the names of the types used by the functions parameters & return values """
+    Names = set()
+    for Function in FunctionGroup:
+        Names.update(GetTypeNames(Function.ReturnType))
+        Names.update(Function.GetRequirements())
+        for Parameter in Function.GetParameters():
+            Names.update(GetTypeNames(Parameter.Type))
+    return Names
+
+
+def GetClassDependencies(Class: StubClass) -> set[str]:
+    """ Get the names of the parent classes and the types used by the class members """
+    Names = set(Class.GetRequirements())
+    for Property in Class.StubProperties:
+        Names.update(GetTypeNames(Property.Type))
+        Names.update(GetTypeNames(Property.SetterType))
+    for FunctionGroup in Class.StubFunctions:
+        Names.update(GetFunctionGroupDependencies(FunctionGroup))
+    return Names
+
+
+def GetMissingDependencies(Enums: list[StubClass], Classes: list[StubClass], FunctionGroupList: list[list[StubFunction]], Names: typing.Container[str]) -> set[str]:
+    """
+    Get the names of the classes the stubs depend on that aren't part of the stubs.
+    Only names in `Names` (e.g. the classes of the module) are included, to ignore builtins etc.
+    """
+    Dependencies = set()
+    for Class in Enums + Classes:
+        Dependencies.update(GetClassDependencies(Class))
+    for FunctionGroup in FunctionGroupList:
+        Dependencies.update(GetFunctionGroupDependencies(FunctionGroup))
+
+    DefinedNames = {x.Name for x in Enums + Classes} | {x[0].Name for x in FunctionGroupList if x}
+    return {x for x in Dependencies - DefinedNames if x in Names}
+
+
+def GenerateModuleSubs(Module: ModuleType, Include: typing.Iterable[str] | None = None):
+    """
+    Generate stubs for the content of a module
+
+    Args:
+        - Module: The module to generate stubs for
+        - Include: Names of classes/functions to generate stubs for. If set, only these and the classes they 
+          depend on (parent classes, parameter, return & property types) will be generated.
+
+    Returns: a tuple with (EnumStubs, ClassStubs, FunctionStubs)
+    """
     Functions, Classes, Enums = GetModuleContent(Module)
 
     AllClassNames = [x.__name__ for x in Classes + Enums]
 
-    EnumStubs = [GenerateEnumInstance(Enum) for Enum in Enums]
-    ClassStubs = [GenerateClassInstance(Class, AllClassNames) for Class in Classes]
+    if Include is None:
+        EnumStubs = [GenerateEnumInstance(Enum) for Enum in Enums]
+        ClassStubs = [GenerateClassInstance(Class, AllClassNames) for Class in Classes]
+
+        FunctionStubs: list[list[StubFunction]] = []
+        for Function in Functions:
+            FunctionStubs.append(GenerateFunctionInstances(Function))
+
+        return EnumStubs, ClassStubs, FunctionStubs
+
+    EnumMap = {GetObjectName(x): x for x in Enums}
+    ClassMap = {GetObjectName(x): x for x in Classes}
+    FunctionMap = {GetObjectName(x): x for x in Functions}
+
+    Include = list(Include)
+    for Name in Include:
+        if Name not in EnumMap and Name not in ClassMap and Name not in FunctionMap:
+            raise ValueError(f"'{Name}' could not be found in {Module.__name__}")
+
+    # Generate the requested stubs, and all of the classes they depend on
+    Stubs: dict[str, StubClass | list[StubFunction]] = {}
+    NamesToVisit = Include
+    while NamesToVisit:
+        Name = NamesToVisit.pop()
+        if Name in Stubs:
+            continue
 
-    FunctionStubs: list[list[StubFunction]] = []
-    for Function in Functions:
-        FunctionStubs.append(GenerateFunctionInstances(Function))
+        if Name in EnumMap:
+            Stubs[Name] = GenerateEnumInstance(EnumMap[Name])
+        elif Name in ClassMap:
+            Stubs[Name] = GenerateClassInstance(ClassMap[Name], AllClassNames)
+            NamesToVisit.extend(GetClassDependencies(Stubs[Name]))
+        elif Name in FunctionMap:
+            Stubs[Name] = GenerateFunctionInstances(FunctionMap[Name])
+            NamesToVisit.extend(GetFunctionGroupDependencies(Stubs[Name]))
+
+    # Keep the same order as when generating the entire module
+    EnumStubs = [Stubs[x] for x in EnumMap if x in Stubs]
+    ClassStubs = [Stubs[x] for x in ClassMap if x in Stubs]
+    FunctionStubs = [Stubs[x] for x in FunctionMap if x in Stubs]
 
     return EnumStubs, ClassStubs, FunctionStubs
@@ -0,0 +1,192 @@
+"""
+Write generated files to disk.
+
+Files are only replaced if their content has changed, this keeps the modification time of unchanged files intact
+so that e.g. Pylance & MyPy caches stays valid. Files are written to a temporary file first and then renamed, to
+avoid leaving half-written files behind if the generation is interrupted.
+
+A manifest with the hashes of all generated files is stored next to them, so other tools can check if anything
+has changed by only reading the manifest.
+"""
+from __future__ import annotations
+
+import tempfile
+import hashlib
+import stat
+import json
+import os
+
+MANIFEST_FILENAME = "stub_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _GetUmask() -> int:
+    # The umask can only be read by setting it, which isn't thread safe, so it's only read once when the module is imported
+    Umask = os.umask(0)
+    os.umask(Umask)
+    return Umask
+
+
+# The permissions of new files, 0o666 minus the umask
+DEFAULT_FILE_MODE = 0o666 & ~_GetUmask()
+
+
+# -------------------------------------------------------------
+#                       Helper Functions
+# -------------------------------------------------------------
+
+def EncodeContent(Content: str) -> bytes:
+    """
+    Encode the content the same way as a file opened in text mode would have been written
+    """
+    if os.linesep != "\n":
+        Content = Content.replace("\n", os.linesep)
+    return Content.encode("utf-8")
+
+
+def GetContentHash(Data: bytes) -> str:
+    return hashlib.sha256(Data).hexdigest()
+
+
+def GetFileHash(Filepath: str) -> str | None:
+    """ Get the hash of a file on disk, returns None if the file doesn't exist """
+    if not os.path.isfile(Filepath):
+        return None
+
+    with open(Filepath, "rb") as File:
+        return GetContentHash(File.read())
+
+
+def GetFileMode(Filepath: str) -> int:
+    """
+    Get the permissions a written file should have: the same as the existing file,
+    or the default permissions for new files (see `DEFAULT_FILE_MODE`) if it doesn't exist
+    """
+    try:
+        return stat.S_IMODE(os.stat(Filepath).st_mode)
+    except OSError:
+        return DEFAULT_FILE_MODE
+
+
+def IsInsideDirectory(Filepath: str, Directory: str) -> bool:
+    """ Check if the path is located under the directory, after resolving any symlinks and '..' """
+    Filepath = os.path.realpath(Filepath)
+    Directory = os.path.realpath(Directory)
+    try:
+        return Filepath != Directory and os.path.commonpath([Filepath, Directory]) == Directory
+    except ValueError:  # Different drives on Windows
+        return False
+
+
+# -------------------------------------------------------------
+#                       Functions
+# -------------------------------------------------------------
+
+def WriteFile(Filepath: str, Content: str | bytes) -> bool:
+    """
+    Write content to a file, if the file already exists with the same content it will be left untouched.
+
+    ## Parameters:
+        - Filepath: The absolute path to the file
+        - Content: The text content to write, or the raw data if it's bytes
+
+    ## Returns:
+    True if the file was written, False if it was already up to date
+    """
+    Data = Content if isinstance(Content, bytes) else EncodeContent(Content)
+    if GetFileHash(Filepath) == GetContentHash(Data):
+        return False
+
+    Directory = os.path.dirname(Filepath)
+    if not os.path.isdir(Directory):
+        os.makedirs(Directory)
+
+    # Write to a temporary file in the same directory, and then replace the target file with it.
+    # os.replace() is atomic as long as both files are on the same filesystem.
+    # mkstemp() creates the file readable by the owner only, so it's given the permissions the target file should have
+    FileMode = GetFileMode(Filepath)
+    FileDescriptor, TempFilepath = tempfile.mkstemp(dir=Directory, prefix=f".{os.path.basename(Filepath)}.", suffix=".tmp")
+    try:
+        with os.fdopen(FileDescriptor, "wb") as File:
+            File.write(Data)
+            File.flush()
+            os.fsync(File.fileno())
+        os.chmod(TempFilepath, FileMode)
+        os.replace(TempFilepath, Filepath)
+    except BaseException:
+        if os.path.exists(TempFilepath):
+            os.remove(TempFilepath)
+        raise
+
+    return True
+
+
+def ReadManifest(Directory: str) -> dict:
+    """
+    Read the manifest in the given directory.
+    Returns an empty manifest if it doesn't exist or can't be parsed
+    """
+    Filepath = os.path.join(Directory, MANIFEST_FILENAME)
+    if os.path.isfile(Filepath):
+        try:
+            with open(Filepath, "r", encoding="utf-8") as File:
+                Manifest = json.load(File)
+            if Manifest.get("Version") == MANIFEST_VERSION:
+                return Manifest
+        except (OSError, ValueError):
+            pass
+
+    return {"Version": MANIFEST_VERSION, "Files": {}}
+
+
+def UpdateManifest(Directory: str, Filepaths: list[str], bRemoveStale = False) -> str:
+    """
+    Write a manifest containing the hashes of the given files.
+
+    ## Parameters:
+        - Directory: The output directory, the manifest will be placed in this directory
+        - Filepaths: Absolute paths to the generated files, must be located under `Directory`
+        - bRemoveStale: Remove files listed in the previous manifest that are not part of `Filepaths`.
+          E.g. the single pyfbsdk.pyi file when switching over to generating a stub package.
+          Paths in the previous manifest that aren't located under `Directory` are never removed.
+
+    ## Returns:
+    The filepath to the manifest
+    """
+    PreviousFiles: dict = ReadManifest(Directory)["Files"]
+
+    Files = {}
+    for Filepath in Filepaths:
+        RelativePath = os.path.relpath(Filepath, Directory).replace(os.sep, "/")
+        with open(Filepath, "rb") as File:
+            Data = File.read()
+        Files[RelativePath] = {
+            "Hash": GetContentHash(Data),
+            "Size": len(Data)
+        }
+
+    if bRemoveStale:
+        for RelativePath in PreviousFiles:
+            StaleFilepath = os.path.join(Directory, RelativePath)
+            if RelativePath not in Files and IsInsideDirectory(StaleFilepath, Directory):
+                RemoveFile(StaleFilepath, Directory)
+
+    Manifest = {"Version": MANIFEST_VERSION, "Files": dict(sorted(Files.items()))}
+
+    ManifestFilepath = os.path.join(Directory, MANIFEST_FILENAME)
+    WriteFile(ManifestFilepath, json.dumps(Manifest, indent=4) + "\n")
+
+    return ManifestFilepath
+
+
+def RemoveFile(Filepath: str, RootDirectory: str | None = None):
+    """ Remove a file, and its parent directory if it's left empty (unless the parent directory is `RootDirectory`) """
+    if os.path.isfile(Filepath):
+        os.remove(Filepath)
+
+    Directory = os.path.dirname(Filepath)
+    if RootDirectory and not IsInsideDirectory(Directory, RootDirectory):
+        return
+
+    if os.path.isdir(Directory) and not os.listdir(Directory):
+        os.rmdir(Directory)
@@ -1,9 +1,8 @@
-from importlib import reload
-
 from .plugin_base import PluginBaseClass
 
 
 def GetDefaultPlugins():
+    """ Get the plugins used when no plugins are given to the `StubGenerator`, they're imported here since they have heavy dependencies """
     from .online_documentation import plugin_online_documentation
     from .manual_documentation import plugin_manual_docs
     from .fb_property import plugin_fbproperty
@@ -11,12 +10,6 @@ def GetDefaultPlugins():
     from .events import plugin_events
     from .enum import plugin_enum
 
-    reload(plugin_online_documentation)
-    reload(plugin_manual_docs)
-    reload(plugin_fbproperty)
-    reload(plugin_dunder_methods)
-    reload(plugin_events)
-
     return (
         plugin_online_documentation.PluginOnlineDocumentation,
         plugin_manual_docs.PluginManualDocumentation,
@@ -7,8 +7,9 @@ from __future__ import annotations
 import pyfbsdk as fb
 
 from ..plugin_base import PluginBaseClass
-from ...module_types import StubClass
+from ...module_types import StubClass, StubProperty
 
+EVENT_SOURCE_TYPE = "callbackframework.FBEventSource"
 
 EVENTS = {
     fb.FBApplication.OnOverrideFileOpen: fb.FBEventOverrideFileOpen,
@@ -73,21 +74,24 @@ class PluginEvents(PluginBaseClass):
     Threading = False
     Priority = 100
 
-    def PatchClass(self, Class: StubClass):
-        for Property in Class.StubProperties:
-            if Property.Type == 'callbackframework.FBEventSource':
-                Event = fb.FBEvent
-                if Property.Ref in EVENTS:
-                    Event = EVENTS[Property.Ref]
+    def Run(self):
+        self.PatchEventSourceProperties()
+        super().Run()
 
-                Property.Type = f'callbackframework.FBEventSource[Self, {Event.__name__}]'
+    def PatchEventSourceProperties(self):
+        """ Add the event types to the FBEventSource properties, only the properties using the type are looked up in the type index """
+        for Property in self.TypeIndex.GetReferences(EVENT_SOURCE_TYPE):
+            if isinstance(Property, StubProperty) and Property.Type == EVENT_SOURCE_TYPE:
+                Event = EVENTS.get(Property.Ref, fb.FBEvent)
+                Property.Type = f'{EVENT_SOURCE_TYPE}[Self, {Event.__name__}]'
 
+    def PatchClass(self, Class: StubClass):
         # If FBEvent.Type doesn't have a defined type, remove it.
         # It's already defined in the base class as a int.
-        if fb.FBEvent.__name__ in Class.Parents:
+        if fb.FBEvent.__name__ in self.Hierarchy.GetAncestors(Class.Name):
             TypeProperty = Class.GetPropertyByName('Type')
             if TypeProperty and TypeProperty.Type == property.__name__:
-                Class.StubProperties.remove(TypeProperty)
+                Class.RemoveProperty(TypeProperty)
 
             # FBEventTree.Why has a event that's not exposed to the Python API
             if Class.Ref is fb.FBEventTree:
@@ -3,12 +3,16 @@ This plugin patches the FBProperty classes to make sure properties and functions
 """
 from __future__ import annotations
 
-import copy
+from types import ModuleType
+
+import typing
 
 import pyfbsdk
 
 from ..plugin_base import PluginBaseClass
-from ...module_types import StubClass, StubFunction
+from ...class_hierarchy import ClassHierarchy
+from ...type_index import TypeReferenceIndex
+from ...module_types import StubClass, StubFunction, StubProperty
 
 NAME_INDEX = "Index"
 NAME_OBJECT = "Object"
@@ -48,10 +52,36 @@ PROPERTY_TYPE_MAP = {
 }
 
 
+class FBPropertyTypeInfo(typing.NamedTuple):
+    DataType: str | None
+    bIsList: bool
+    # The type accepted when setting a class property of this type, e.g. `FBPropertyAnimatableDouble|float`
+    SetterType: str | None
+
+
 class PluginFbProperty(PluginBaseClass):
     Threading = False
     Priority = 200
 
+    def __init__(self, Version: int, Module: ModuleType, EnumList: list[StubClass], ClassList: list[StubClass], FunctionGroupList: list[list[StubFunction]], Hierarchy: ClassHierarchy | None = None, TypeIndex: TypeReferenceIndex | None = None, AllClassNames: typing.Iterable[str] | None = None, AllClasses: list[StubClass] | None = None):
+        super().__init__(Version, Module, EnumList, ClassList, FunctionGroupList, Hierarchy, TypeIndex, AllClassNames, AllClasses)
+
+        # There are only a few dozen FBProperty classes, but they're used by thousands of class properties
+        self.PropertyTypes = self.GetPropertyTypes()
+
+    def GetPropertyTypes(self) -> dict[str, FBPropertyTypeInfo]:
+        """ Get the type information of all FBProperty classes, with the class name as key """
+        PropertyTypes = {}
+        for Name, Class in self.AllClassesMap.items():
+            if not Name.startswith("FBProperty"):
+                continue
+
+            DataType = self.GetDataType(Class)
+            SetterType = f"{Name}|{DataType}" if DataType and Name.startswith("FBPropertyAnimatable") else None
+            PropertyTypes[Name] = FBPropertyTypeInfo(DataType, "List" in Name, SetterType)
+
+        return PropertyTypes
+
     def GetDataType(self, Class: StubClass):
         """
         Find the correct data type for the given class based on its name.
@@ -68,16 +98,18 @@ class PluginFbProperty(PluginBaseClass):
             return TYPE_CONVERSION_MAP[Type]
 
         Type = f"FB{Type}"
-        if Type in self.ClassMap:
+        if Type in self.AllClassNames:
             return Type
 
         # If the type can't be found and it's a FBPropertyListComponent, Use the base class 'FBComponent'
-        if "FBPropertyListComponent" in Class.Parents:
+        if self.Hierarchy.IsSubclassOf(Class.Name, "FBPropertyListComponent"):
             return "FBComponent"
 
-    def PatchClass(self, Class: StubClass):
-        self.PatchClassProperties(Class)
+    def Run(self):
+        self.PatchClassProperties()
+        super().Run()
 
+    def PatchClass(self, Class: StubClass):
         # FBProperty classes
         if Class.Name.startswith("FBProperty"):
             self.PatchPropertyClass(Class)
@@ -86,12 +118,10 @@ class PluginFbProperty(PluginBaseClass):
             self.PatchFBComponent(Class)
 
     def PatchPropertyClass(self, Class: StubClass):
-        Type = self.GetDataType(Class)
+        Type, bIsList, _ = self.PropertyTypes[Class.Name]
         if Type is None:
             return
 
-        bIsList = "List" in Class.Name
-
         DataProperty = Class.GetPropertyByName("Data")
         if DataProperty:
             DataProperty.Type = f"list[{Type}]" if bIsList else Type
@@ -99,21 +129,21 @@ class PluginFbProperty(PluginBaseClass):
         if bIsList:
             self.PatchListPropertyClass(Class, Type)
 
-    def PatchClassProperties(self, Class: StubClass):
+    def PatchClassProperties(self):
         """ 
         Patch FBProperties used as class properties.
         * Add setter functions for animatable properties, that takes the native type as argument too.
         For example, `FBPropertyAnimatableDouble` can accept `float` as argument.
+        Only the properties using the FBProperty types are looked up in the type index.
         """
-        for Property in Class.GetStubProperties():
-            # Animatable properties
-            if Property.Type.startswith("FBPropertyAnimatable"):
-                # Make setter functions that accept the correct type
-                TypeClass = self.ClassMap.get(Property.Type)
-                if TypeClass:
-                    SetterType = self.GetDataType(TypeClass)
-                    if SetterType:
-                        Property.SetterType = f"{Property.Type}|{SetterType}"
+        for Name, TypeInfo in self.PropertyTypes.items():
+            # Animatable properties, make setter functions that accept the correct type
+            if not TypeInfo.SetterType:
+                continue
+
+            for Property in self.TypeIndex.GetReferences(Name):
+                if isinstance(Property, StubProperty) and Property.Type == Name:
+                    Property.SetterType = TypeInfo.SetterType
 
     def PatchListPropertyClass(self, Class: StubClass, Type: str):
         """ 
@@ -128,7 +158,7 @@ class PluginFbProperty(PluginBaseClass):
         # __setitem__ is not allowed for FBPropertyList
         SetItem = Class.GetFunctionsByName("__setitem__")
         if SetItem in Class.StubFunctions:
-            Class.StubFunctions.remove(SetItem)
+            Class.RemoveFunctions(SetItem)
 
         # Patch the first parameter of the following functions
         for FunctionName in ("append", "remove", "insert", "__contains__", "count"):
@@ -176,31 +206,31 @@ class PluginFbProperty(PluginBaseClass):
             PropertyTypeName = f"Literal[{pyfbsdk.FBPropertyType.__name__}.{str(PropertyType)}]"
 
             if TypeClass is not None and TypeClass == AnimatableTypeClass:
-                Variant = copy.copy(Function)
-                Variant.GetParameters()[2].Type = PropertyTypeName
+                Variant = Function.CreateVariant()
+                Variant.SetParameterType(2, PropertyTypeName)
                 Variant.ReturnType = TypeClass.__name__
                 NewFunctionList.append(Variant)
 
             else:
                 if TypeClass:
-                    Variant = copy.copy(Function)
-                    Variant.GetParameters()[2].Type = PropertyTypeName
-                    Variant.GetParameters()[4].Type = "Literal[False]"
+                    Variant = Function.CreateVariant()
+                    Variant.SetParameterType(2, PropertyTypeName)
+                    Variant.SetParameterType(4, "Literal[False]")
 
                     Variant.ReturnType = TypeClass.__name__
 
                     NewFunctionList.append(Variant)
 
                 if AnimatableTypeClass:
-                    Variant = copy.copy(Function)
-                    Variant.GetParameters()[2].Type = PropertyTypeName
-                    Variant.GetParameters()[4].Type = "Literal[True]"
+                    Variant = Function.CreateVariant()
+                    Variant.SetParameterType(2, PropertyTypeName)
+                    Variant.SetParameterType(4, "Literal[True]")
 
                     Variant.ReturnType = AnimatableTypeClass.__name__
 
                     NewFunctionList.append(Variant)
 
-        Class.StubFunctions.remove(Functions)
+        Class.RemoveFunctions(Functions)
 
         NewFunctionList.extend(Functions)  # Re-add the generic PropertyCreate last
         Class.AddFunctions(NewFunctionList)
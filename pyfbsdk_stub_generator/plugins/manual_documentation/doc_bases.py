@@ -1,9 +1,17 @@
+"""
+Base classes for the manual documentation, see `modules/` for the documented modules.
+
+The manual docs are registered in an index when they're defined (see `GetModuleIndex()`), so they can be looked up
+by name without inspecting the modules. Defining the same function multiple times documents an overload group,
+in the same order as the overloads of the stub function.
+"""
 from __future__ import annotations
 
-import inspect
 import typing
+import sys
 
 from dataclasses import dataclass
+from importlib.machinery import ModuleSpec
 
 
 @dataclass
@@ -34,10 +42,66 @@ class Parameter:
         return str(self.DefaultValue)
 
 
+# -------------------------------------------------------------
+#                       Index
+# -------------------------------------------------------------
+
+class ManualDocIndex:
+    def __init__(self, Spec: ModuleSpec | None):
+        self.Spec = Spec
+        self.Functions: dict[str, list[type[FunctionBase]]] = {}
+        self.Classes: dict[str, type[ClassBase]] = {}
+
+        # Class members are defined before the class itself, they're kept here by the qualified name of the class until it's defined
+        self.PendingFunctions: dict[str, dict[str, list[type[FunctionBase]]]] = {}
+        self.PendingProperties: dict[str, dict[str, type[PropertyBase]]] = {}
+
+    def GetFunctionGroup(self, Name: str) -> list[type[FunctionBase]]:
+        return self.Functions.get(Name, [])
+
+    def GetClass(self, Name: str) -> type[ClassBase] | None:
+        return self.Classes.get(Name)
+
+
+# Module name -> Index
+_Indices: dict[str, ManualDocIndex] = {}
+
+
+def GetModuleIndex(ModuleName: str) -> ManualDocIndex:
+    """
+    Get the index of the manual docs defined in a module.
+    Reloading the module gives it a new spec, in which case a new index is created rather than registering the docs twice.
+    """
+    Spec = getattr(sys.modules.get(ModuleName), "__spec__", None)
+    Index = _Indices.get(ModuleName)
+    if Index is None or Index.Spec is not Spec:
+        Index = _Indices[ModuleName] = ManualDocIndex(Spec)
+    return Index
+
+
+def _GetOwnerName(cls: type) -> str:
+    """ Get the qualified name of the class the class is defined in, or an empty string if it's defined at the module level """
+    return cls.__qualname__.rpartition(".")[0]
+
+
+# -------------------------------------------------------------
+#                       Base Classes
+# -------------------------------------------------------------
+
 class FunctionBase:
     Parameters: typing.Iterable[Parameter | None] = ()
     ReturnType: str | None | type = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Index = GetModuleIndex(cls.__module__)
+        OwnerName = _GetOwnerName(cls)
+        if OwnerName:
+            FunctionGroups = Index.PendingFunctions.setdefault(OwnerName, {})
+        else:
+            FunctionGroups = Index.Functions
+        FunctionGroups.setdefault(cls.__name__, []).append(cls)
+
     @classmethod
     def GetReturnTypeString(cls) -> str | None:
         if cls.ReturnType is None:
@@ -50,27 +114,45 @@ class FunctionBase:
 
 
 class ClassBase:
+    # Function & property name -> manual docs, including the ones inherited from a parent manual class
+    _FunctionGroups: dict[str, list[type[FunctionBase]]] = {}
+    _Properties: dict[str, type[PropertyBase]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Index = GetModuleIndex(cls.__module__)
+        cls._FunctionGroups = {**cls._FunctionGroups, **Index.PendingFunctions.pop(cls.__qualname__, {})}
+        cls._Properties = {**cls._Properties, **Index.PendingProperties.pop(cls.__qualname__, {})}
+        if not _GetOwnerName(cls):
+            Index.Classes[cls.__name__] = cls
+
     @classmethod
     def GetFunctionGroups(cls) -> list[list[type[FunctionBase]]]:
-        Functions = []
-        for Name, Obj in inspect.getmembers(cls):
-            if isinstance(Obj, type) and issubclass(Obj, FunctionBase) and Obj != FunctionBase:
-                Functions.append([Obj])
-        return Functions
+        return list(cls._FunctionGroups.values())
+
+    @classmethod
+    def GetFunctionGroup(cls, Name: str) -> list[type[FunctionBase]]:
+        return cls._FunctionGroups.get(Name, [])
 
     @classmethod
     def GetProperties(cls) -> list[type[PropertyBase]]:
-        Properties = []
-        for Name, Obj in inspect.getmembers(cls):
-            if isinstance(Obj, type) and issubclass(Obj, PropertyBase) and Obj != PropertyBase:
-                Properties.append(Obj)
-        return Properties
+        return list(cls._Properties.values())
+
+    @classmethod
+    def GetProperty(cls, Name: str) -> type[PropertyBase] | None:
+        return cls._Properties.get(Name)
 
 
 class PropertyBase:
     Types: type | str | typing.Iterable[type | str] | None = None
     SetType: typing.Iterable[type | str] | None = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        OwnerName = _GetOwnerName(cls)
+        if OwnerName:
+            GetModuleIndex(cls.__module__).PendingProperties.setdefault(OwnerName, {})[cls.__name__] = cls
+
     @classmethod
     def GetTypesString(cls) -> str | None:
         if cls.Types is None:
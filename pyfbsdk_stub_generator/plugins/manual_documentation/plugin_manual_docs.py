@@ -1,16 +1,11 @@
 from __future__ import annotations
 
 import importlib
-import inspect
 
-from typing import TypeVar, Generator
-
-from .doc_bases import FunctionBase, ClassBase, PropertyBase
+from .doc_bases import FunctionBase, PropertyBase, GetModuleIndex
 from ..plugin_base import PluginBaseClass
 from ...module_types import StubClass, StubFunction, StubParameter, StubProperty
 
-T = TypeVar('T')
-
 
 class PluginManualDocumentation(PluginBaseClass):
     Threading = False
@@ -22,19 +17,11 @@ class PluginManualDocumentation(PluginBaseClass):
         # try to import the module
         try:
             self.ContentModule = importlib.import_module(f".modules.{self.ModuleName}", package=__package__)
-            importlib.reload(self.ContentModule)
         except ModuleNotFoundError:
             self.ContentModule = None
 
-        self.ManualFunctionMap = {x.__name__: x for x in self.GetContent(FunctionBase)}
-        self.ManualClassMap = {x.__name__: x for x in self.GetContent(ClassBase)}
-
-    def GetContent(self, Type: type[T]) -> list[type[T]]:
-        Content = []
-        for Name, Obj in inspect.getmembers(self.ContentModule):
-            if inspect.isclass(Obj) and issubclass(Obj, Type) and Obj != Type:
-                Content.append(Obj)
-        return Content
+        # The manual docs registered themselves in the index when the module was imported
+        self.ManualDocs = GetModuleIndex(self.ContentModule.__name__) if self.ContentModule else None
 
     def ShouldPatch(self) -> bool:
         return self.ContentModule is not None
@@ -43,21 +30,17 @@ class PluginManualDocumentation(PluginBaseClass):
         ...
 
     def PatchClass(self, Class: StubClass):
-        if Class.Name not in self.ManualClassMap:
+        ManualClass = self.ManualDocs.GetClass(Class.Name)
+        if ManualClass is None:
             return
 
-        # Get functions from class
-        ManualClass = self.ManualClassMap[Class.Name]
-
         for ManualFunctionGroup in ManualClass.GetFunctionGroups():
-            if len(ManualFunctionGroup) == 0:
-                continue
             FunctionName = ManualFunctionGroup[0].__name__
             StubFunctionGroup = Class.GetFunctionsByName(FunctionName)
-            if len(ManualFunctionGroup) > 1 or len(StubFunctionGroup) > 1:
-                raise RuntimeError(f"FunctionGroup with more than one function is not yet supported. {ManualFunctionGroup}")
+            if not StubFunctionGroup:
+                raise Warning(f"Function {FunctionName} not found in {Class.Name}")
 
-            self._PatchFunctionGroup(StubFunctionGroup[0], ManualFunctionGroup[0])
+            self._PatchFunctionGroup(StubFunctionGroup, ManualFunctionGroup)
 
         for ManualProperty in ManualClass.GetProperties():
             StubPropertyInstance = Class.GetPropertyByName(ManualProperty.__name__)
@@ -74,7 +57,16 @@ class PluginManualDocumentation(PluginBaseClass):
         if TypeString:
             Property.Type = TypeString
 
-    def _PatchFunctionGroup(self, Function: StubFunction, ManualFunction: type[FunctionBase]):
+    def _PatchFunctionGroup(self, FunctionGroup: list[StubFunction], ManualFunctionGroup: list[type[FunctionBase]]):
+        """ Patch each overload with the manual docs defined for it, the overloads are matched in order """
+        if len(FunctionGroup) != len(ManualFunctionGroup):
+            raise RuntimeError(f"{FunctionGroup[0].Name} has {len(FunctionGroup)} overload(s), "
+                               f"but the manual docs defines {len(ManualFunctionGroup)}. {ManualFunctionGroup}")
+
+        for Function, ManualFunction in zip(FunctionGroup, ManualFunctionGroup):
+            self._PatchFunction(Function, ManualFunction)
+
+    def _PatchFunction(self, Function: StubFunction, ManualFunction: type[FunctionBase]):
         if ManualFunction.__doc__:
             Function.DocString = PatchDocString(ManualFunction.__doc__)
 
@@ -101,15 +93,9 @@ class PluginManualDocumentation(PluginBaseClass):
         if not FunctionGroup:
             return
 
-        Function = FunctionGroup[0]
-        if Function.Name not in self.ManualFunctionMap:
-            return
-
-        if len(FunctionGroup) > 1:
-            raise RuntimeError(f"FunctionGroup with more than one function is not yet supported. {FunctionGroup}")
-
-        ManualFunctionDoc = self.ManualFunctionMap[Function.Name]
-        self._PatchFunctionGroup(Function, ManualFunctionDoc)
+        ManualFunctionGroup = self.ManualDocs.GetFunctionGroup(FunctionGroup[0].Name)
+        if ManualFunctionGroup:
+            self._PatchFunctionGroup(FunctionGroup, ManualFunctionGroup)
 
 
 def PatchDocString(DocString: str):
@@ -1,56 +1,817 @@
+"""
+Cache for the online documentation.
 
+Cached urls are served for PYFBSDK_DOCUMENTATION_CACHE_TTL seconds (a week by default). After that, the stale content
+is still served, while the url is revalidated in the background using a conditional request (ETag/Last-Modified).
+Once a background revalidation has failed (e.g. when offline), no more urls are revalidated until `WaitForRevalidations()`
+is called. Entries served from a bundle are never revalidated.
+
+Pages that doesn't exist (404/410) are cached as negative entries without any content, which expire after
+PYFBSDK_DOCUMENTATION_CACHE_NEGATIVE_TTL seconds (a day by default). Other errors are never cached.
+
+The size of the cache is limited by PYFBSDK_DOCUMENTATION_CACHE_MAX_BYTES (512MB by default) and
+PYFBSDK_DOCUMENTATION_CACHE_MAX_ENTRIES (unlimited by default), where each file in the cache counts as an entry.
+The least recently used files are evicted when new files are written, files are touched each time they're used.
+
+Pages are stored by the hash of their content, where the version specific base url has been replaced with
+a placeholder. Pages that are identical between MotionBuilder versions are therefore only stored (and parsed) once.
+
+The cache is stored per user (in %LOCALAPPDATA% on Windows, otherwise in $XDG_CACHE_HOME or ~/.cache), or in
+PYFBSDK_DOCUMENTATION_CACHE_DIR. The directory is created only accessible by the current user, and a directory owned
+by another user is refused.
+
+Cache layout:
+    - entries/<url>.json: The url, its status code, the hash of its content, the time it was fetched and its ETag/Last-Modified headers
+    - objects/<hash>: The normalized page content
+    - parsed/<hash>.json: The parsed page, as plain data
+
+The cache can be exported to a bundle file, to be used on machines without internet access. A bundle can either
+be imported into the local cache, or read directly by setting the PYFBSDK_DOCUMENTATION_CACHE_BUNDLE environment variable.
+
+Bundle format:
+    - A header line: `PYFBSDK-DOCCACHE <version>`
+    - A JSON manifest line, with the cache entries by url and the [offset, size] of each object by its hash
+    - The zlib compressed objects, the offsets are relative to the end of the manifest line
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import threading
 import tempfile
+import hashlib
+import heapq
+import shutil
+import typing
+import mmap
+import json
+import zlib
+import time
 import re
 import os
 
-import requests
-
 CACHE_DIRNAME = "pyfbsdk_stub_generator_documentation_cache"
+CACHE_DIR_ENV = "PYFBSDK_DOCUMENTATION_CACHE_DIR"
+CACHE_BUNDLE_ENV = "PYFBSDK_DOCUMENTATION_CACHE_BUNDLE"
+CACHE_TTL_ENV = "PYFBSDK_DOCUMENTATION_CACHE_TTL"
+NEGATIVE_CACHE_TTL_ENV = "PYFBSDK_DOCUMENTATION_CACHE_NEGATIVE_TTL"
+MAX_CACHE_BYTES_ENV = "PYFBSDK_DOCUMENTATION_CACHE_MAX_BYTES"
+MAX_CACHE_ENTRIES_ENV = "PYFBSDK_DOCUMENTATION_CACHE_MAX_ENTRIES"
+
+DEFAULT_CACHE_TTL = 7 * 24 * 60 * 60
+DEFAULT_NEGATIVE_CACHE_TTL = 24 * 60 * 60
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_CACHE_ENTRIES = 0  # Unlimited
+
+# When the cache is full, files are evicted until it's below this fraction of the limits, at most EVICTION_BATCH_SIZE files per write
+EVICTION_TARGET = 0.9
+EVICTION_BATCH_SIZE = 64
+# Seconds between reading the files in the cache from disk again, to include the files written by other processes
+CACHE_FILES_RESCAN_INTERVAL = 60
+
+# Status codes that are cached as negative entries, all other errors are assumed to be transient
+NEGATIVE_STATUS_CODES = (404, 410)
+REQUEST_TIMEOUT = 10
+
+BUNDLE_HEADER = "PYFBSDK-DOCCACHE"
+BUNDLE_VERSION = 1
+BUNDLE_EXTENSION = "doccache"
+
+ENTRIES_DIRNAME = "entries"
+OBJECTS_DIRNAME = "objects"
+PARSED_DIRNAME = "parsed"
+
+BASE_URL_PLACEHOLDER = "http://pyfbsdkdocbaseurl/"
+
+
+# The cache directories that have been created/checked by `_EnsureCacheDir`
+_CheckedCacheDirs: set[str] = set()
+
+
+def GetDefaultCacheDir() -> str:
+    """ Get the per-user cache directory """
+    if os.name == "nt":
+        BaseDir = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        BaseDir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(BaseDir, CACHE_DIRNAME)
+
+
+def _EnsureCacheDir(CacheDir: str):
+    """ Create the cache directory only accessible by the current user, raises PermissionError if it's owned by another user """
+    if CacheDir in _CheckedCacheDirs:
+        return
+
+    os.makedirs(CacheDir, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid") and os.lstat(CacheDir).st_uid != os.getuid():
+        raise PermissionError(f"The documentation cache directory '{CacheDir}' is owned by another user, set {CACHE_DIR_ENV} to use another directory")
+
+    _CheckedCacheDirs.add(CacheDir)
 
 
 def GetCacheDir():
-    return os.path.join(tempfile.gettempdir(), CACHE_DIRNAME)
+    """ Get the cache directory, can be overridden with the PYFBSDK_DOCUMENTATION_CACHE_DIR environment variable """
+    CacheDir = os.environ.get(CACHE_DIR_ENV) or GetDefaultCacheDir()
+    _EnsureCacheDir(CacheDir)
+    return CacheDir
 
 
 def UrlToFilepath(Url: str):
     return re.sub(r"[^a-zA-Z0-9]", "_", Url)
 
 
+class DocumentationNotFoundError(Exception):
+    """ Raised when a documentation page doesn't exist """
+
+
+def _GetEnvironmentFloat(Name: str, Default: float) -> float:
+    try:
+        return float(os.environ[Name])
+    except (KeyError, ValueError):
+        return Default
+
+
+def GetCacheTTL() -> float:
+    """ Get the number of seconds a cached url is fresh, can be overridden with the PYFBSDK_DOCUMENTATION_CACHE_TTL environment variable """
+    return _GetEnvironmentFloat(CACHE_TTL_ENV, DEFAULT_CACHE_TTL)
+
+
+def GetNegativeCacheTTL() -> float:
+    """ Get the number of seconds a missing url is cached, can be overridden with the PYFBSDK_DOCUMENTATION_CACHE_NEGATIVE_TTL environment variable """
+    return _GetEnvironmentFloat(NEGATIVE_CACHE_TTL_ENV, DEFAULT_NEGATIVE_CACHE_TTL)
+
+
+def GetMaxCacheBytes() -> int:
+    """ Get the maximum size of the cache in bytes, 0 means unlimited """
+    return int(_GetEnvironmentFloat(MAX_CACHE_BYTES_ENV, DEFAULT_MAX_CACHE_BYTES))
+
+
+def GetMaxCacheEntries() -> int:
+    """ Get the maximum number of files in the cache, 0 means unlimited """
+    return int(_GetEnvironmentFloat(MAX_CACHE_ENTRIES_ENV, DEFAULT_MAX_CACHE_ENTRIES))
+
+
 def GetCachedFilepath(Url: str):
-    return os.path.join(GetCacheDir(), UrlToFilepath(Url))
+    return os.path.join(GetCacheDir(), ENTRIES_DIRNAME, f"{UrlToFilepath(Url)}.json")
 
 
-def IsUrlCached(Url: str):
-    return os.path.exists(GetCachedFilepath(Url))
+def GetObjectFilepath(ContentHash: str):
+    return os.path.join(GetCacheDir(), OBJECTS_DIRNAME, ContentHash)
+
+
+def GetParsedFilepath(Key: str):
+    return os.path.join(GetCacheDir(), PARSED_DIRNAME, f"{Key}.json")
+
+
+def GetContentHash(Content: str) -> str:
+    return hashlib.sha256(Content.encode("utf-8")).hexdigest()
+
+
+def NormalizeContent(Content: str, BaseUrl: str) -> str:
+    """ Replace the version specific base url with a placeholder """
+    return Content.replace(BaseUrl, BASE_URL_PLACEHOLDER) if BaseUrl else Content
+
+
+def DenormalizeContent(Content: str, BaseUrl: str) -> str:
+    """ Replace the placeholder with the version specific base url """
+    return Content.replace(BASE_URL_PLACEHOLDER, BaseUrl) if BaseUrl else Content
+
+
+def WriteCacheFile(Filepath: str, Content: str | bytes):
+    """
+    Write to a temporary file first and then rename it, so other processes sharing the same
+    cache directory never reads a half-written file
+    """
+    Directory = os.path.dirname(Filepath)
+    os.makedirs(Directory, exist_ok=True)
+
+    FileDescriptor, TempFilepath = tempfile.mkstemp(dir=Directory, suffix=".tmp")
+    try:
+        if isinstance(Content, bytes):
+            with os.fdopen(FileDescriptor, "wb") as File:
+                File.write(Content)
+        else:
+            with os.fdopen(FileDescriptor, "w", encoding="utf-8") as File:
+                File.write(Content)
+        os.replace(TempFilepath, Filepath)
+    except BaseException:
+        if os.path.exists(TempFilepath):
+            os.remove(TempFilepath)
+        raise
+
+
+# -------------------------------------------------------------
+#                       Eviction
+# -------------------------------------------------------------
 
+# The files in the cache with their (last used time, size), lazily read from disk when the first file is written.
+# Other processes may share the cache, so the files are read again every CACHE_FILES_RESCAN_INTERVAL seconds
+_CacheFiles: dict[str, tuple[float, int]] | None = None
+_CacheFilesDir = ""
+_CacheFilesScanTime = 0.0
+_CacheBytes = 0
+_CacheFilesLock = threading.Lock()
+# A heap of (last used time, filepath) to find the least recently used files, entries that are out of date with
+# _CacheFiles (the file has been used since, or removed) are updated/dropped when they're popped
+_EvictionHeap: list[tuple[float, str]] = []
+
+
+def _GetCacheFiles() -> dict[str, tuple[float, int]]:
+    """ Get the files in the cache, must be called with the _CacheFilesLock acquired """
+    global _CacheFiles, _CacheFilesDir, _CacheFilesScanTime, _CacheBytes, _EvictionHeap
 
-def CacheUrl(Url: str, Content: str):
     CacheDir = GetCacheDir()
-    if not os.path.exists(CacheDir):
-        os.makedirs(CacheDir)
+    if _CacheFiles is None or _CacheFilesDir != CacheDir or time.time() - _CacheFilesScanTime >= CACHE_FILES_RESCAN_INTERVAL:
+        _CacheFiles = {}
+        for DirName in (ENTRIES_DIRNAME, OBJECTS_DIRNAME, PARSED_DIRNAME):
+            Directory = os.path.join(CacheDir, DirName)
+            if not os.path.isdir(Directory):
+                continue
+            for DirEntry in os.scandir(Directory):
+                if not DirEntry.name.endswith(".tmp"):
+                    try:
+                        Stat = DirEntry.stat()
+                    except FileNotFoundError:
+                        continue  # Removed by another process sharing the cache
+                    _CacheFiles[DirEntry.path] = (Stat.st_mtime, Stat.st_size)
+
+        _CacheFilesDir = CacheDir
+        _CacheFilesScanTime = time.time()
+        _CacheBytes = sum(x[1] for x in _CacheFiles.values())
+        _EvictionHeap = [(LastUsed, Filepath) for Filepath, (LastUsed, _) in _CacheFiles.items()]
+        heapq.heapify(_EvictionHeap)
+
+    return _CacheFiles
+
+
+def _EvictCacheFiles(CacheFiles: dict[str, tuple[float, int]]):
+    """ Remove the least recently used files if the cache is full, must be called with the _CacheFilesLock acquired """
+    global _CacheBytes
+
+    MaxBytes = GetMaxCacheBytes()
+    MaxEntries = GetMaxCacheEntries()
+    if (not MaxBytes or _CacheBytes <= MaxBytes) and (not MaxEntries or len(CacheFiles) <= MaxEntries):
+        return
+
+    TargetBytes = MaxBytes * EVICTION_TARGET if MaxBytes else float("inf")
+    TargetEntries = MaxEntries * EVICTION_TARGET if MaxEntries else float("inf")
+
+    EvictedCount = 0
+    while _EvictionHeap and EvictedCount < EVICTION_BATCH_SIZE and (_CacheBytes > TargetBytes or len(CacheFiles) > TargetEntries):
+        HeapTime, Filepath = heapq.heappop(_EvictionHeap)
+        if Filepath not in CacheFiles:
+            continue
+
+        LastUsed, Size = CacheFiles[Filepath]
+        if LastUsed != HeapTime:
+            heapq.heappush(_EvictionHeap, (LastUsed, Filepath))
+            continue
+
+        # Stat the file again, since another process sharing the cache may have used, replaced or removed it
+        try:
+            Stat = os.stat(Filepath)
+        except FileNotFoundError:
+            _CacheBytes -= CacheFiles.pop(Filepath)[1]
+            continue
+        except OSError:
+            continue
+
+        if Stat.st_mtime > LastUsed or Stat.st_size != Size:
+            CacheFiles[Filepath] = (Stat.st_mtime, Stat.st_size)
+            _CacheBytes += Stat.st_size - Size
+            heapq.heappush(_EvictionHeap, (Stat.st_mtime, Filepath))
+            continue
+
+        try:
+            os.remove(Filepath)
+        except FileNotFoundError:
+            pass  # Already removed by another process sharing the cache
+        except OSError:
+            continue
+
+        _CacheBytes -= CacheFiles.pop(Filepath)[1]
+        EvictedCount += 1
+
+
+def TouchCacheFile(Filepath: str):
+    """ Mark a cached file as used, so it's evicted last """
+    Now = time.time()
+    try:
+        os.utime(Filepath, (Now, Now))
+    except OSError:
+        return
+
+    with _CacheFilesLock:
+        if _CacheFiles is not None and Filepath in _CacheFiles:
+            _CacheFiles[Filepath] = (Now, _CacheFiles[Filepath][1])
+
+
+def StoreCacheFile(Filepath: str, Content: str | bytes):
+    """ Write a file to the cache, and evict the least recently used files if the cache is full """
+    global _CacheBytes
+
+    WriteCacheFile(Filepath, Content)
+    Size = os.path.getsize(Filepath)
+
+    with _CacheFilesLock:
+        CacheFiles = _GetCacheFiles()
+        Now = time.time()
+        if Filepath in CacheFiles:
+            _CacheBytes -= CacheFiles[Filepath][1]
+        else:
+            heapq.heappush(_EvictionHeap, (Now, Filepath))
+        CacheFiles[Filepath] = (Now, Size)
+        _CacheBytes += Size
+
+        _EvictCacheFiles(CacheFiles)
+
 
+# -------------------------------------------------------------
+#                       Requests
+# -------------------------------------------------------------
+
+def IsUrlCached(Url: str):
+    if GetCacheEntry(Url) is not None:
+        return True
+
+    Bundle = GetCacheBundle()
+    return Bundle is not None and Url in Bundle
+
+
+def GetCacheEntry(Url: str) -> dict | None:
+    """ Get the cache entry for the url, returns None if the url isn't cached """
     Filepath = GetCachedFilepath(Url)
-    with open(Filepath, "w", encoding="utf-8") as File:
-        File.write(Content)
+    if not os.path.isfile(Filepath):
+        return None
 
+    with open(Filepath, "r", encoding="utf-8") as File:
+        Entry = json.load(File)
 
-def CachedGetRequest(Url: str):
-    if IsUrlCached(Url):
-        with open(GetCachedFilepath(Url), "r", encoding="utf-8") as File:
-            return File.read()
-    else:
+    if not IsNegativeEntry(Entry):
+        ObjectFilepath = GetObjectFilepath(Entry["Hash"])
+        if not os.path.isfile(ObjectFilepath):
+            return None
+        TouchCacheFile(ObjectFilepath)
+
+    TouchCacheFile(Filepath)
+    return Entry
+
+
+def GetCachedContentHash(Url: str) -> str | None:
+    """ Get the hash of the cached content for the url, returns None if the url isn't cached or doesn't exist """
+    Entry = GetCacheEntry(Url)
+    return Entry.get("Hash") if Entry else None
+
+
+def IsNegativeEntry(Entry: dict) -> bool:
+    """ Check if the entry is for a url that doesn't exist """
+    # Entries cached before the status was stored are always successful
+    return Entry.get("Status", 200) in NEGATIVE_STATUS_CODES
+
+
+def IsEntryStale(Entry: dict) -> bool:
+    TTL = GetNegativeCacheTTL() if IsNegativeEntry(Entry) else GetCacheTTL()
+    # Entries cached before the fetch time was stored are always stale
+    return time.time() - Entry.get("FetchedAt", 0) >= TTL
+
+
+def WriteCacheEntry(Entry: dict):
+    StoreCacheFile(GetCachedFilepath(Entry["Url"]), json.dumps(Entry))
+
+
+def CreateCacheEntry(Url: str, Status: int, ContentHash: str | None = None, Headers: typing.Mapping[str, str] | None = None) -> dict:
+    """ Create & write the cache entry for a url, negative entries doesn't have a content hash """
+    Entry = {"Url": Url, "Status": Status, "FetchedAt": time.time()}
+    if ContentHash:
+        Entry["Hash"] = ContentHash
+    if Headers:
+        if Headers.get("ETag"):
+            Entry["ETag"] = Headers["ETag"]
+        if Headers.get("Last-Modified"):
+            Entry["LastModified"] = Headers["Last-Modified"]
+
+    WriteCacheEntry(Entry)
+    return Entry
+
+
+def StoreObject(Content: str, BaseUrl = "") -> str:
+    """ Store the normalized content in the cache, and return its hash """
+    NormalizedContent = NormalizeContent(Content, BaseUrl)
+    ContentHash = GetContentHash(NormalizedContent)
+
+    ObjectFilepath = GetObjectFilepath(ContentHash)
+    if not os.path.isfile(ObjectFilepath):
+        StoreCacheFile(ObjectFilepath, NormalizedContent)
+
+    return ContentHash
+
+
+def CacheUrl(Url: str, Content: str, BaseUrl = "", Headers: typing.Mapping[str, str] | None = None) -> str:
+    """
+    Cache the content of a url
+
+    ## Parameters:
+        - Url: The url the content was downloaded from
+        - Content: The content of the page
+        - BaseUrl: The version specific base url, will be replaced with a placeholder before the content is hashed
+        - Headers: The response headers, the ETag & Last-Modified headers are stored to be able to revalidate the url
+
+    ## Returns:
+    The hash of the normalized content
+    """
+    ContentHash = StoreObject(Content, BaseUrl)
+    CreateCacheEntry(Url, 200, ContentHash, Headers)
+
+    return ContentHash
+
+
+def RevalidateUrl(Url: str, BaseUrl = "", Entry: dict | None = None) -> dict:
+    """
+    Download the url and cache it. If there is a cache entry, a conditional request is made and the
+    content is only downloaded if it has changed.
+    Missing pages are cached as negative entries, other errors are raised and never cached.
+
+    ## Returns:
+    The new cache entry
+    """
+    if Entry and IsNegativeEntry(Entry):
+        Entry = None
+
+    Headers = {}
+    if Entry:
+        if Entry.get("ETag"):
+            Headers["If-None-Match"] = Entry["ETag"]
+        if Entry.get("LastModified"):
+            Headers["If-Modified-Since"] = Entry["LastModified"]
+
+    import requests
+
+    try:
+        Response = requests.get(Url, headers=Headers, timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to download {Url}")
+        raise e
+
+    if Entry and Response.status_code == 304:
+        # Entries from a bundle may not have their object in the local cache
+        ObjectFilepath = GetObjectFilepath(Entry["Hash"])
+        if not os.path.isfile(ObjectFilepath):
+            Bundle = GetCacheBundle()
+            if Bundle is None or Entry["Hash"] not in Bundle.Objects:
+                # The content isn't available locally (e.g. it has been evicted), so it must be downloaded again
+                return RevalidateUrl(Url, BaseUrl)
+            StoreCacheFile(ObjectFilepath, Bundle.GetObject(Entry["Hash"]))
+
+        Entry = dict(Entry, FetchedAt=time.time())
+        WriteCacheEntry(Entry)
+        return Entry
+
+    if Response.status_code in NEGATIVE_STATUS_CODES:
+        return CreateCacheEntry(Url, Response.status_code)
+
+    Response.raise_for_status()
+
+    return CreateCacheEntry(Url, Response.status_code, StoreObject(Response.text, BaseUrl), Response.headers)
+
+
+_RevalidationExecutor: concurrent.futures.ThreadPoolExecutor | None = None
+_PendingRevalidations: dict[str, concurrent.futures.Future] = {}
+_RevalidationLock = threading.Lock()
+# Set once a revalidation has failed, the remaining urls are most likely to fail as well
+_bRevalidationFailed = False
+
+
+def _RevalidateInBackground(Url: str, BaseUrl: str, Entry: dict):
+    global _bRevalidationFailed
+
+    try:
+        if not _bRevalidationFailed:
+            RevalidateUrl(Url, BaseUrl, Entry)
+    except Exception as e:
+        if not _bRevalidationFailed:
+            print(f"Failed to revalidate {Url}, skipping the remaining revalidations: {e}")
+        _bRevalidationFailed = True
+    finally:
+        with _RevalidationLock:
+            _PendingRevalidations.pop(Url, None)
+
+
+def RevalidateInBackground(Url: str, BaseUrl: str, Entry: dict):
+    """ Revalidate a stale url in a background thread, each url is only revalidated once at the time """
+    global _RevalidationExecutor
+
+    with _RevalidationLock:
+        if _bRevalidationFailed or Url in _PendingRevalidations:
+            return
+
+        if _RevalidationExecutor is None:
+            _RevalidationExecutor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+        _PendingRevalidations[Url] = _RevalidationExecutor.submit(_RevalidateInBackground, Url, BaseUrl, Entry)
+
+
+def WaitForRevalidations(Timeout: float | None = None):
+    """
+    Wait for the background revalidations to finish, and reset the failed state.
+
+    ## Parameters:
+        - Timeout: Max number of seconds to wait, revalidations that haven't started by then are cancelled.
+          The ones already running are left to finish, which takes at most REQUEST_TIMEOUT seconds.
+    """
+    global _RevalidationExecutor, _bRevalidationFailed
+
+    with _RevalidationLock:
+        Executor, _RevalidationExecutor = _RevalidationExecutor, None
+        Pending = list(_PendingRevalidations.items())
+
+    if Executor:
+        concurrent.futures.wait([Future for _, Future in Pending], timeout=Timeout)
+        with _RevalidationLock:
+            for Url, Future in Pending:
+                if Future.cancel():
+                    _PendingRevalidations.pop(Url, None)
+        Executor.shutdown(wait=False)
+
+    _bRevalidationFailed = False
+
+
+def CachedGetNormalizedRequest(Url: str, BaseUrl = "") -> tuple[str, str]:
+    """
+    Get the content of a url, where the base url has been replaced with a placeholder.
+    Stale urls are served from the cache, and revalidated in the background (except entries from a bundle).
+    Raises a DocumentationNotFoundError if the page doesn't exist.
+
+    Returns: a tuple with (ContentHash, NormalizedContent)
+    """
+    Bundle = None
+    Entry = GetCacheEntry(Url)
+    if Entry is None:
+        Bundle = GetCacheBundle()
+        Entry = Bundle.GetEntry(Url) if Bundle else None
+
+    # Bundles are used on machines without internet access, so their entries are served as is
+    if Entry is None or (IsNegativeEntry(Entry) and IsEntryStale(Entry) and not Bundle):
+        # Nothing to serve, so the url must be downloaded right away
+        Entry = RevalidateUrl(Url, BaseUrl, Entry)
+        Bundle = None
+    elif IsEntryStale(Entry) and not Bundle:
+        RevalidateInBackground(Url, BaseUrl, Entry)
+
+    if IsNegativeEntry(Entry):
+        raise DocumentationNotFoundError(f"{Url} doesn't exist (status {Entry['Status']})")
+
+    if Bundle:
+        return Entry["Hash"], Bundle.GetObject(Entry["Hash"])
+
+    try:
+        with open(GetObjectFilepath(Entry["Hash"]), "r", encoding="utf-8") as File:
+            return Entry["Hash"], File.read()
+    except FileNotFoundError:
+        pass  # Evicted by another process sharing the cache since the entry was read
+
+    Entry = RevalidateUrl(Url, BaseUrl)
+    if IsNegativeEntry(Entry):
+        raise DocumentationNotFoundError(f"{Url} doesn't exist (status {Entry['Status']})")
+
+    with open(GetObjectFilepath(Entry["Hash"]), "r", encoding="utf-8") as File:
+        return Entry["Hash"], File.read()
+
+
+def CachedGetRequest(Url: str, BaseUrl = ""):
+    _, NormalizedContent = CachedGetNormalizedRequest(Url, BaseUrl)
+    return DenormalizeContent(NormalizedContent, BaseUrl)
+
+
+def GetCachedParsedObject(Key: str):
+    """ Get the plain data of a cached parsed object, returns None if it isn't cached or can't be loaded """
+    Filepath = GetParsedFilepath(Key)
+    if not os.path.isfile(Filepath):
+        return None
+
+    try:
+        with open(Filepath, "r", encoding="utf-8") as File:
+            ParsedObject = json.load(File)
+    except (OSError, ValueError):
+        return None
+
+    TouchCacheFile(Filepath)
+    return ParsedObject
+
+
+def CacheParsedObject(Key: str, Object):
+    """ Cache the plain data (anything that can be stored as JSON) of a parsed object """
+    StoreCacheFile(GetParsedFilepath(Key), json.dumps(Object))
+
+
+def GetCacheStatistics(CacheDir: str | None = None) -> dict[str, int]:
+    """
+    Get the number of cached urls, unique pages and parsed pages.
+    The difference between the number of urls and unique pages are the pages that has been de-duplicated.
+
+    ## Parameters:
+        - CacheDir: The cache directory, defaults to `GetCacheDir()`
+    """
+    CacheDir = CacheDir or GetCacheDir()
+    Statistics = {}
+    for Name, DirName in (("Entries", ENTRIES_DIRNAME), ("Objects", OBJECTS_DIRNAME), ("Parsed", PARSED_DIRNAME)):
+        Directory = os.path.join(CacheDir, DirName)
+        Statistics[Name] = len([x for x in os.listdir(Directory) if not x.endswith(".tmp")]) if os.path.isdir(Directory) else 0
+    return Statistics
+
+
+def GetPageEntries(CacheDir: str | None = None, UsedSince = 0.0) -> dict[str, dict]:
+    """
+    Get the cache entries of the documentation pages by their url, excluding the table of contents scripts & negative entries.
+
+    ## Parameters:
+        - CacheDir: The cache directory, defaults to `GetCacheDir()`
+        - UsedSince: Only include the entries that has been used since this time, e.g. the start of a generation
+    """
+    Entries = {}
+    Directory = os.path.join(CacheDir or GetCacheDir(), ENTRIES_DIRNAME)
+    if not os.path.isdir(Directory):
+        return Entries
+
+    for DirEntry in os.scandir(Directory):
+        if not DirEntry.name.endswith(".json"):
+            continue
+
+        # Entries are touched each time they're used
         try:
-            Response = requests.get(Url, timeout=10)
-        except requests.exceptions.RequestException as e:
-            print(f"Failed to download {Url}")
-            raise e
-        CacheUrl(Url, Response.text)
-        return Response.text
+            if DirEntry.stat().st_mtime < UsedSince:
+                continue
+            with open(DirEntry.path, "r", encoding="utf-8") as File:
+                Entry = json.load(File)
+        except (OSError, ValueError):
+            continue  # Removed or replaced by another process sharing the cache
+
+        if not IsNegativeEntry(Entry) and not Entry["Url"].endswith(".js"):
+            Entries[Entry["Url"]] = Entry
+
+    return Entries
 
 
 def ClearCache():
+    global _CacheFiles
+
     CacheDir = GetCacheDir()
-    if os.path.exists(CacheDir):
-        for File in os.listdir(CacheDir):
-            os.remove(os.path.join(CacheDir, File))
-        os.rmdir(CacheDir)
+    with _CacheFilesLock:
+        if os.path.exists(CacheDir):
+            shutil.rmtree(CacheDir)
+        _CacheFiles = None
+        _CheckedCacheDirs.discard(CacheDir)
+
+
+# -------------------------------------------------------------
+#                       Bundles
+# -------------------------------------------------------------
+
+def _ReadCacheEntries() -> dict[str, dict]:
+    """ Get all of the cache entries by their url """
+    Entries = {}
+    Directory = os.path.join(GetCacheDir(), ENTRIES_DIRNAME)
+    if not os.path.isdir(Directory):
+        return Entries
+
+    for Filename in os.listdir(Directory):
+        if not Filename.endswith(".json"):
+            continue
+        with open(os.path.join(Directory, Filename), "r", encoding="utf-8") as File:
+            Entry = json.load(File)
+        Entries[Entry["Url"]] = Entry
+
+    return Entries
+
+
+def IsUrlForVersion(Url: str, Version: int) -> bool:
+    return f"/{Version}/" in Url
+
+
+def ExportBundle(Filepath: str, Versions: list[int] | None = None) -> dict[str, int]:
+    """
+    Export the cache into a single bundle file
+
+    ## Parameters:
+        - Filepath: The bundle file to write
+        - Versions: Only export the urls for these MotionBuilder versions, exports all of them if None
+
+    ## Returns:
+    The number of exported entries & objects
+    """
+    Entries = {}
+    for Url, Entry in sorted(_ReadCacheEntries().items()):
+        if Versions and not any(IsUrlForVersion(Url, Version) for Version in Versions):
+            continue
+        if IsNegativeEntry(Entry) or os.path.isfile(GetObjectFilepath(Entry["Hash"])):
+            Entries[Url] = Entry
+
+    Objects = {}
+    Data = bytearray()
+    for ContentHash in sorted({x["Hash"] for x in Entries.values() if not IsNegativeEntry(x)}):
+        with open(GetObjectFilepath(ContentHash), "r", encoding="utf-8") as File:
+            CompressedContent = zlib.compress(File.read().encode("utf-8"), 9)
+        Objects[ContentHash] = [len(Data), len(CompressedContent)]
+        Data += CompressedContent
+
+    Manifest = {"Versions": sorted(Versions) if Versions else None, "Entries": Entries, "Objects": Objects}
+    Header = f"{BUNDLE_HEADER} {BUNDLE_VERSION}\n{json.dumps(Manifest, separators=(',', ':'))}\n"
+    WriteCacheFile(Filepath, Header.encode("utf-8") + bytes(Data))
+
+    return {"Entries": len(Entries), "Objects": len(Objects)}
+
+
+def ImportBundle(Filepath: str) -> dict[str, int]:
+    """
+    Import a bundle into the local cache, the content of each object is verified against its hash.
+    Urls that are already cached are not overwritten.
+
+    ## Returns:
+    The number of imported entries & objects
+    """
+    Imported = {"Entries": 0, "Objects": 0}
+    with CacheBundle(Filepath) as Bundle:
+        for Url, Entry in Bundle.Entries.items():
+            if GetCacheEntry(Url) is not None:
+                continue
+
+            if not IsNegativeEntry(Entry):
+                ObjectFilepath = GetObjectFilepath(Entry["Hash"])
+                if not os.path.isfile(ObjectFilepath):
+                    StoreCacheFile(ObjectFilepath, Bundle.GetObject(Entry["Hash"]))
+                    Imported["Objects"] += 1
+
+            WriteCacheEntry(Entry)
+            Imported["Entries"] += 1
+
+    return Imported
+
+
+class CacheBundle:
+    """
+    Read a cache bundle, the file is memory-mapped and objects are only decompressed when requested.
+    """
+
+    def __init__(self, Filepath: str):
+        self.Filepath = Filepath
+
+        with open(Filepath, "rb") as File:
+            Header = File.readline().decode("utf-8").split()
+            if len(Header) != 2 or Header[0] != BUNDLE_HEADER or int(Header[1]) != BUNDLE_VERSION:
+                raise ValueError(f"{Filepath} is not a valid documentation cache bundle")
+
+            Manifest = json.loads(File.readline())
+            self.DataOffset = File.tell()
+            self.Map = mmap.mmap(File.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.Versions: list[int] | None = Manifest["Versions"]
+        self.Entries: dict[str, dict] = Manifest["Entries"]
+        self.Objects: dict[str, list[int]] = Manifest["Objects"]
+
+    def __contains__(self, Url: str) -> bool:
+        return Url in self.Entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *Args):
+        self.Close()
+
+    def Close(self):
+        self.Map.close()
+
+    def GetEntry(self, Url: str) -> dict | None:
+        return self.Entries.get(Url)
+
+    def GetObject(self, ContentHash: str) -> str:
+        """ Get the normalized content of an object, raises a ValueError if it doesn't match its hash """
+        Offset, Size = self.Objects[ContentHash]
+        Start = self.DataOffset + Offset
+        Content = zlib.decompress(self.Map[Start:Start + Size]).decode("utf-8")
+        if GetContentHash(Content) != ContentHash:
+            raise ValueError(f"Object {ContentHash} in {self.Filepath} is corrupt")
+        return Content
+
+    def GetContent(self, Url: str) -> str:
+        """ Get the normalized content of a url """
+        return self.GetObject(self.Entries[Url]["Hash"])
+
+
+_CacheBundle: CacheBundle | None = None
+_CacheBundleLock = threading.Lock()
+
+
+def GetCacheBundle() -> CacheBundle | None:
+    """ Get the bundle set by the PYFBSDK_DOCUMENTATION_CACHE_BUNDLE environment variable, it's only opened once """
+    global _CacheBundle
+
+    Filepath = os.environ.get(CACHE_BUNDLE_ENV) or None
+
+    with _CacheBundleLock:
+        if _CacheBundle is not None and _CacheBundle.Filepath != Filepath:
+            # Close the previous bundle, an open bundle can't be replaced or removed on Windows
+            _CacheBundle.Close()
+            _CacheBundle = None
+
+        if _CacheBundle is None and Filepath:
+            _CacheBundle = CacheBundle(Filepath)
+
+        return _CacheBundle
@@ -1,22 +1,16 @@
 from __future__ import annotations
 
+import threading
 import keyword
+import typing
 import string
-import re
 
-from dataclasses import dataclass
-from importlib   import reload
+if typing.TYPE_CHECKING:
+    from bs4 import Tag, NavigableString
 
-import markdownify
-from bs4 import BeautifulSoup, Tag, NavigableString
-
-from . import documentation_urls as urls
-from . import documentation_cache as cache
-
-reload(cache)
-reload(urls)
-
-PY2_TO_PY3_PRINT_PATTERN = re.compile(r"(?<!\w)print\s+(.*)\s*(?<!\\)(?:\n|$)")
+# Number of docstrings that has been loaded from parsed pages, and how many of them has actually been converted to markdown
+DOC_FRAGMENT_STATISTICS = {"Loaded": 0, "Converted": 0}
+_StatisticsLock = threading.Lock()
 
 
 class ClassNames:
@@ -31,40 +25,208 @@ class ClassNames:
     CodeBlock = "fragment"
 
 
-@dataclass
-class Parameter:
-    Name: str | None
-    Type: str | None
-    DefaultValue: str | None = None
+class SlottedRecord:
+    """
+    Base class for small records with `__slots__`, there are thousands of these per page so they're kept as lightweight as possible.
+    Works like a dataclass, instances are compared by their values.
+    """
+    __slots__ = ()
+
+    def __eq__(self, Other):
+        if Other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, x) == getattr(Other, x) for x in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        Fields = ", ".join(f"{x}={getattr(self, x)!r}" for x in self.__slots__)
+        return f"{self.__class__.__name__}({Fields})"
+
+
+class Parameter(SlottedRecord):
+    __slots__ = ("Name", "Type", "DefaultValue")
+
+    def __init__(self, Name: str | None, Type: str | None, DefaultValue: str | None = None):
+        self.Name = Name
+        self.Type = Type
+        self.DefaultValue = DefaultValue
+
+
+class DocFragment:
+    """
+    The html of a docstring, that is only converted to markdown when it's requested.
+    Call the instance to get the docstring, e.g. `StubFunction.DocString = Fragment` will only convert it if it's used.
+    """
+    __slots__ = ("Html", "BaseUrl", "UrlReplacement", "RemovePrefix", "_DocString")
+
+    def __init__(self, Html: str, BaseUrl: str, UrlReplacement: tuple[str, str] | None = None, RemovePrefix = ""):
+        self.Html = Html
+        self.BaseUrl = BaseUrl
+        self.UrlReplacement = UrlReplacement
+        self.RemovePrefix = RemovePrefix
+        self._DocString: str | None = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}<{'converted' if self._DocString is not None else 'pending'}>"
+
+    def __call__(self) -> str:
+        if self._DocString is None:
+            from .markdown_converter import DocstringMarkdownConverter
+
+            DocString = DocstringMarkdownConverter(self.BaseUrl).ConvertDocString(self.Html)
+            if self.UrlReplacement:
+                DocString = DocString.replace(*self.UrlReplacement)
+            if self.RemovePrefix and DocString.startswith(self.RemovePrefix):
+                DocString = DocString.replace(self.RemovePrefix, "", 1)
+
+            self._DocString = DocString
+            AddStatistic("Converted")
+
+        return self._DocString
+
+    def Copy(self, UrlReplacement: tuple[str, str] | None = None, RemovePrefix = "") -> DocFragment:
+        """ Get a copy of the fragment, with a different url replacement and/or prefix to remove """
+        return DocFragment(self.Html, self.BaseUrl, UrlReplacement or self.UrlReplacement, RemovePrefix or self.RemovePrefix)
 
 
-@dataclass
-class MemberItem:
-    Name: str
-    Type: str
-    DocString: str
-    Parameters: list[Parameter]
-    RelativeUrl: str
+class MemberItem(SlottedRecord):
+    __slots__ = ("Name", "Type", "Documentation", "Parameters", "RelativeUrl")
+
+    def __init__(self, Name: str, Type: str, Documentation: DocFragment | str, Parameters: list[Parameter], RelativeUrl: str):
+        self.Name = Name
+        self.Type = Type
+        self.Documentation = Documentation
+        self.Parameters = Parameters
+        self.RelativeUrl = RelativeUrl
+
+    @property
+    def DocString(self) -> str:
+        return GetDocString(self.Documentation)
 
 
 class DocumentationParsedPage():
-    def __init__(self, Name: str, DocString: str, Members: list[MemberItem]):
+    def __init__(self, Name: str, Documentation: DocFragment | str, Members: list[MemberItem]):
         self.Name = Name
-        self.DocString = DocString
+        self.Documentation = Documentation
         self.Members = Members
 
+        self._MemberIndex = self._BuildMemberIndex()
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}<{self.Name}>"
 
-    def GetFirstMemberByName(self, Name: str) -> MemberItem:
+    def __getstate__(self):
+        # The index is rebuilt when the page is unpickled, no need to store it
+        State = self.__dict__.copy()
+        del State["_MemberIndex"]
+        return State
+
+    def __setstate__(self, State):
+        self.__dict__.update(State)
+        self._MemberIndex = self._BuildMemberIndex()
+
+    def _BuildMemberIndex(self) -> dict[str, list[MemberItem]]:
+        """ Map each member name to all members with that name, in the order they appear on the page """
+        MemberIndex: dict[str, list[MemberItem]] = {}
         for Member in self.Members:
-            if Member.Name == Name:
-                return Member
+            MemberIndex.setdefault(Member.Name, []).append(Member)
+        return MemberIndex
+
+    @property
+    def DocString(self) -> str:
+        return GetDocString(self.Documentation)
+
+    def GetFirstMemberByName(self, Name: str) -> MemberItem | None:
+        Members = self._MemberIndex.get(Name)
+        return Members[0] if Members else None
+
+    def GetMembersByName(self, Name: str) -> list[MemberItem]:
+        return list(self._MemberIndex.get(Name, ()))
+
+
+def GetDocString(Documentation: DocFragment | str) -> str:
+    return Documentation() if isinstance(Documentation, DocFragment) else Documentation
+
+
+def ReplaceDocumentationUrl(Documentation: DocFragment | str, OldBaseUrl: str, NewBaseUrl: str) -> DocFragment | str:
+    if isinstance(Documentation, DocFragment):
+        return Documentation.Copy(UrlReplacement = (OldBaseUrl, NewBaseUrl))
+    return Documentation.replace(OldBaseUrl, NewBaseUrl)
+
+
+def RemoveDocumentationPrefix(Documentation: DocFragment | str, Prefix: str) -> DocFragment | str:
+    if isinstance(Documentation, DocFragment):
+        return Documentation.Copy(RemovePrefix = Prefix)
+    if Documentation.startswith(Prefix):
+        return Documentation.replace(Prefix, "", 1)
+    return Documentation
+
+
+def ReplaceBaseUrl(Page: DocumentationParsedPage, OldBaseUrl: str, NewBaseUrl: str) -> DocumentationParsedPage:
+    """ Get a copy of the page where the base url of all links have been replaced """
+    Members = [
+        MemberItem(x.Name, x.Type, ReplaceDocumentationUrl(x.Documentation, OldBaseUrl, NewBaseUrl), x.Parameters, x.RelativeUrl.replace(OldBaseUrl, NewBaseUrl))
+        for x in Page.Members
+    ]
+    return DocumentationParsedPage(Page.Name, ReplaceDocumentationUrl(Page.Documentation, OldBaseUrl, NewBaseUrl), Members)
 
-        return None
 
-    def GetMembersByName(self, Name: str):
-        return [x for x in self.Members if x.Name == Name]
+def AddStatistic(Name: str, Count = 1):
+    with _StatisticsLock:
+        DOC_FRAGMENT_STATISTICS[Name] += Count
+
+
+def CountDocFragments(Page: DocumentationParsedPage):
+    """ Count the number of docstrings on the page that can be converted, used to measure how many conversions are avoided """
+    Documentations = [Page.Documentation] + [x.Documentation for x in Page.Members]
+    AddStatistic("Loaded", len([x for x in Documentations if isinstance(x, DocFragment)]))
+
+
+def _DocumentationToData(Documentation: DocFragment | str) -> dict | str:
+    if isinstance(Documentation, DocFragment):
+        return {"Html": Documentation.Html, "BaseUrl": Documentation.BaseUrl, "UrlReplacement": Documentation.UrlReplacement, "RemovePrefix": Documentation.RemovePrefix}
+    return Documentation
+
+
+def _DocumentationFromData(Data: dict | str) -> DocFragment | str:
+    if isinstance(Data, dict):
+        UrlReplacement = Data["UrlReplacement"]
+        return DocFragment(str(Data["Html"]), str(Data["BaseUrl"]), tuple(UrlReplacement) if UrlReplacement else None, str(Data["RemovePrefix"]))
+    return str(Data)
+
+
+def PageToData(Page: DocumentationParsedPage) -> dict:
+    """ Get the page as plain data that can be stored as JSON, see `PageFromData` """
+    return {
+        "Name": Page.Name,
+        "Documentation": _DocumentationToData(Page.Documentation),
+        "Members": [
+            {
+                "Name": x.Name,
+                "Type": x.Type,
+                "Documentation": _DocumentationToData(x.Documentation),
+                "Parameters": [[y.Name, y.Type, y.DefaultValue] for y in x.Parameters],
+                "RelativeUrl": x.RelativeUrl
+            }
+            for x in Page.Members
+        ]
+    }
+
+
+def PageFromData(Data: dict) -> DocumentationParsedPage:
+    """ Rebuild a page from the data returned by `PageToData`, raises KeyError/TypeError/ValueError if the data is malformed """
+    Members = [
+        MemberItem(
+            str(x["Name"]),
+            str(x["Type"]),
+            _DocumentationFromData(x["Documentation"]),
+            [Parameter(Name, Type, DefaultValue) for Name, Type, DefaultValue in x["Parameters"]],
+            str(x["RelativeUrl"])
+        )
+        for x in Data["Members"]
+    ]
+    return DocumentationParsedPage(str(Data["Name"]), _DocumentationFromData(Data["Documentation"]), Members)
 
 
 def GetParameterNiceName(VariableName: str) -> str:
@@ -86,11 +248,13 @@ def ParsePage(PageName: str, PageHtmlContent: str, BaseURL: str) -> Documentatio
         - `PageHtmlContent`: The HTML content of the page.
         - `BaseURL`: The base URL to be used to resolve relative URLs.
     """
-    DocStringMdConverter = DocstringMarkdownConverter(BaseURL)
+    from bs4 import BeautifulSoup
+
     Parser = BeautifulSoup(PageHtmlContent, "html.parser")
 
+    # The docstrings are converted to markdown once they're used, see `DocFragment`
     DescriptionHtml = Parser.find("div", class_ = ClassNames.TextBlockDescription)
-    Description = DocStringMdConverter.ConvertDocString(DescriptionHtml) if DescriptionHtml else ""
+    Description = DocFragment(str(DescriptionHtml), BaseURL) if DescriptionHtml else ""
 
     MemberItems = []
     Item: Tag | NavigableString
@@ -105,7 +269,7 @@ def ParsePage(PageName: str, PageHtmlContent: str, BaseURL: str) -> Documentatio
     for Item, Title in zip(Items, ItemTitles):
         ItemName = ""
         ItemType = ""
-        ItemDocumentation = ""
+        ItemDocumentation: DocFragment | str = ""
         Url = ""
 
         if Title:
@@ -115,7 +279,7 @@ def ParsePage(PageName: str, PageHtmlContent: str, BaseURL: str) -> Documentatio
 
         DocumentationHtml = Item.find("div", class_ = ClassNames.Doc)
         if DocumentationHtml:
-            ItemDocumentation: str = DocStringMdConverter.ConvertDocString(DocumentationHtml)
+            ItemDocumentation = DocFragment(str(DocumentationHtml), BaseURL)
 
         NameTable = Item.find("table", class_ = ClassNames.ItemName)
         if NameTable:
@@ -157,179 +321,9 @@ def ParsePage(PageName: str, PageHtmlContent: str, BaseURL: str) -> Documentatio
 
         MemberItems.append(MemberItem(ItemName, ItemType, ItemDocumentation, Parameters, Url))
 
-    return DocumentationParsedPage(PageName, Description.strip(), MemberItems)
+    return DocumentationParsedPage(PageName, Description, MemberItems)
 
 
 def GetSafeText(Text: str):
     # Remove any non-breaking spaces and strip the text of whitespace and commas
     return Text.replace('\xa0', ' ').strip(string.whitespace + ",").replace("\\", "\\\\")
-
-
-class DocstringMarkdownConverter(markdownify.MarkdownConverter):
-    def __init__(self, UrlBase: str, bParamNiceName = True, **options):
-        super().__init__(**options)
-
-        self.UrlBase = UrlBase  # Base for any relative url's found
-        self.bParamNiceName = bParamNiceName
-
-    def ConvertDocString(self, DescriptionHtml: Tag | NavigableString):
-        DocString = self.convert(str(DescriptionHtml))
-
-        # There are some (what I guess is) broken <b> tags scattered around in the docstrings. Remove them.
-        DocString = DocString.replace("b>", " ")
-
-        # Replace single backslashes followed by special characters with the character only
-        DocString = re.sub(r'(?<!\\)\\([*_])', r'\1', DocString)
-        # Replace single backslashes followed by letters/numbers with double backslashes
-        DocString = re.sub(r'(?<!\\)\\([a-zA-Z0-9\s])', r'\\\\\1', DocString)
-
-        DocString = DocString.strip()
-
-        # Go through and patch up the generated docstring
-        Lines = []
-        bInCodeBlock = False
-        bPreviousLineWasEmpty = False
-        for Line in DocString.split("\n"):
-            StrippedLine = Line.strip()
-
-            # Keep track of when we're in a code block
-            if StrippedLine.startswith("```"):
-                bInCodeBlock = not bInCodeBlock
-                Lines.append(StrippedLine)
-                continue
-
-            # Make sure headers are never indentend
-                # continue
-
-            # Don't allow any more than 1 empty lines in a row
-            if bPreviousLineWasEmpty and not StrippedLine:
-                continue
-            bPreviousLineWasEmpty = not StrippedLine
-            if not StrippedLine:
-                Lines.append(StrippedLine)
-                continue
-
-            # Bullet points can be indented, other lines should not be
-            if StrippedLine.startswith("-") or bInCodeBlock:
-                Lines.append(Line)
-            else:
-                Lines.append(StrippedLine)
-
-        DocString = "\n".join(Lines)
-
-        return DocString
-
-    def convert_a(self, el: Tag, text, convert_as_inline):
-        """ Make sure all <a> tags have a full URL. """
-        Href = el.get("href")
-
-        # Example URLs are broken in the 2024 docs. Resolve them manually.
-        SampleUrlPrefix = "ms-its:MotionBuilder_SDK_Samples.chm::"
-        if Href.startswith(SampleUrlPrefix):
-            # From: ms-its:MotionBuilder_SDK_Samples.chm::/Scripts/BasicOperations/FBSystemEvents.html
-            # To: _basic_operations_0c_f_b_system_events_8py-example.html
-            Suffix = "_8py-example.html"
-            ScriptsFolder = "Scripts/"
-            if ScriptsFolder in Href:
-                RelativeUrl = Href.partition(ScriptsFolder)[2]
-                ConvertedString: str = re.sub(r'(?<!^)(?=[A-Z])', '_', RelativeUrl).lower()  # Convert from PascalCase to snake_case
-                ConvertedString = ConvertedString.replace("/", "_0c")  # Replace the slashes with _0c
-                ConvertedString = ConvertedString.partition(".")[0]  # Remove the extension (.html)
-                Href = f"_{ConvertedString}{Suffix}"
-
-        if Href and not Href.startswith("http"):
-            el["href"] = f"{self.UrlBase}{Href}"
-
-        return super().convert_a(el, text, convert_as_inline)
-
-    def convert_p(self, el, text, convert_as_inline):
-        return text.strip() + "\n"
-
-    def convert_b(self, el, text, convert_as_inline):
-        """ Skip adding ** around bold text. Since PyLance doesn't support bold text markdown atm."""
-        return text
-
-    # -------------------------
-    #      Parameter Lists
-    # -------------------------
-
-    def convert_dt(self, el: Tag, text, convert_as_inline):
-        """ Convert all <dt> tags to a headers. """
-        HeaderText = markdownify.markdownify(str(el))
-        return f"### {HeaderText}:\n"
-
-    def convert_dd(self, el: Tag, text: str, convert_as_inline):
-        # Only strip new lines
-        return text.strip("\n")
-
-    def convert_table(self, el: Tag, text, convert_as_inline):
-        # Check if element has the class name for a parameter list
-        ElementClassNames = el.get("class")
-        if ElementClassNames and ClassNames.ParameterTalble in ElementClassNames:
-            ParameterLines = []
-            Row: Tag
-            for Row in el.find_all("tr"):
-                Text = ""
-
-                Cell: Tag
-                for Index, Cell in enumerate(Row.find_all("td")):
-                    if Index == 0 and ClassNames.ParameterName in Cell.get("class"):
-                        ParameterName = GetSafeText(Cell.get_text())
-                        if self.bParamNiceName:
-                            ParameterName = GetParameterNiceName(ParameterName)
-                        Text = f"    - {ParameterName}: "
-                    else:
-                        # TODO: Might not ned to run mardkdownify on the cell text, just use the text instead
-                        Text += markdownify.markdownify(str(Cell)).strip(string.whitespace + "|")
-
-                ParameterLines.append(Text)
-            return "\n".join(ParameterLines)
-
-        return text  # super().convert_table(el, text, convert_as_inline)
-
-    # -------------------------
-    #      Code Blocks
-    # -------------------------
-
-    def convert_div(self, el: Tag, text, convert_as_inline):
-        """ Convert all <div> tags to a code block. """
-        ElementClassNames = el.get("class")
-        if ElementClassNames and ClassNames.CodeBlock in ElementClassNames:
-            return self.convert_pre(el, text, convert_as_inline)
-
-        return text
-
-    def convert_pre(self, el: Tag, text, convert_as_inline):
-        # Exclude any <div> tags that have class names "ttc"
-        for Child in el.find_all('div', class_='ttc'):
-            Child.decompose()
-
-        Code = GetSafeText(el.get_text()).strip("`")
-        LanguageType = GetLanguageFromCode(Code)
-
-        if LanguageType == "python":
-            # Replace Python 2 print statements with Python 3 print functions
-            Code = re.sub(PY2_TO_PY3_PRINT_PATTERN, r"print(\1)\n", Code).strip()
-
-        return f"\n```{LanguageType}\n{Code}\n```\n"
-
-
-def GetLanguageFromCode(Code: str):
-    """ Determine the language of some code """
-    PythonScore = 0
-    CPlusPlusScore = 0
-    for Line in Code.split("\n"):
-        # Look for comment syntax
-        if Line.startswith("//"):
-            CPlusPlusScore += 1
-        elif Line.startswith("#"):
-            PythonScore += 1
-
-        # Look for line endings
-        StrippedLine = Line.strip()
-        if StrippedLine.endswith(":"):
-            PythonScore += 1
-        elif StrippedLine.endswith(";"):
-            CPlusPlusScore += 1
-
-    return "python" if PythonScore >= CPlusPlusScore else "c++"
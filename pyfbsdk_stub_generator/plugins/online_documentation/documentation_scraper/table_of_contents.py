@@ -3,17 +3,17 @@ Web Documentation scraper for the pyfbsdk SDK.
 """
 from __future__ import annotations
 
-from importlib import reload
-
-import requests
-import js2py
+import concurrent.futures
+import functools
+import typing
 
 from . import documentation_cache as cache
 from . import documentation_urls as urls
 from . import page_parser
 
-reload(cache)
-reload(page_parser)
+# Parsed pages are cached by their content & the parser's source code, so any changes to the parser invalidates the cache
+with open(page_parser.__file__, "r", encoding="utf-8") as _File:
+    PAGE_PARSER_HASH = cache.GetContentHash(_File.read())
 
 
 NameSpaceModuleMap = {
@@ -23,7 +23,7 @@ NameSpaceModuleMap = {
 
 
 class TableOfContentItem:
-    def __init__(self, Data: list, Version: int, bUseCache: bool = False):
+    def __init__(self, Data: list, Version: int):
         if len(Data) != 3:
             raise ValueError(f"Data must be a list of 3 items. Got {len(Data)} items instead: {Data}")
 
@@ -31,7 +31,6 @@ class TableOfContentItem:
         self.RelativeUrl = Data[1]
         # self.UrlNiceName = Data[2]  # Tbh, I have no idea what this is for
         self.Version = Version
-        self.bUseCache = bUseCache
 
     def __repr__(self):
         return f"{self.__class__.__name__}<{self.Name}>"
@@ -39,47 +38,166 @@ class TableOfContentItem:
     def GetPageUrl(self):
         return urls.GetPythonPageContentsUrl(self.RelativeUrl, self.Version)
 
-    def ParsePage(self):
-        Url = self.GetPageUrl()
-
-        # Strip the hash from the url, to avoid caching the same page multiple times
-        if "#" in Url:
-            Url = Url.partition("#")[0]
-
-        if self.bUseCache:
-            PageContent = cache.CachedGetRequest(Url)
-        else:
-            PageContent = requests.get(Url, timeout=10).text
+    def GetDocumentUrl(self):
+        """ Get the page url without the hash, multiple items can be documented on the same page """
+        return self.GetPageUrl().partition("#")[0]
 
+    def ParsePage(self):
+        Url = self.GetDocumentUrl()
         BaseURL = urls.GetPythonPageContentsUrl("", self.Version)
 
-        return page_parser.ParsePage(self.Name, PageContent, BaseURL)
+        # The cached content has the version specific base url replaced with a placeholder, so pages that are identical
+        # between versions are only parsed once. The placeholder is replaced with the actual base url after parsing.
+        try:
+            ContentHash, PageContent = cache.CachedGetNormalizedRequest(Url, BaseURL)
+        except cache.DocumentationNotFoundError as e:
+            print(f"Warning: {e}")
+            return None
+
+        ParsedPageKey = cache.GetContentHash(f"{ContentHash}{PAGE_PARSER_HASH}")
+
+        # Parsed pages are stored as plain JSON data, so nothing in the cache directory is ever executed when it's loaded
+        ParsedPage = None
+        ParsedPageData = cache.GetCachedParsedObject(ParsedPageKey)
+        if ParsedPageData is not None:
+            try:
+                ParsedPage = page_parser.PageFromData(ParsedPageData)
+            except (KeyError, TypeError, ValueError):
+                pass  # Malformed data, parse the page again
+
+        if ParsedPage is None:
+            ParsedPage = page_parser.ParsePage(self.Name, PageContent, cache.BASE_URL_PLACEHOLDER)
+            cache.CacheParsedObject(ParsedPageKey, page_parser.PageToData(ParsedPage))
+
+        ParsedPage = page_parser.ReplaceBaseUrl(ParsedPage, cache.BASE_URL_PLACEHOLDER, BaseURL)
+        ParsedPage.Name = self.Name
+        page_parser.CountDocFragments(ParsedPage)
+
+        return ParsedPage
+
+
+class DocumentationFetchPlan(typing.NamedTuple):
+    """ The documentation pages needed for a set of names, see `Documentation.CreateFetchPlan` """
+    PageItems: dict[str, TableOfContentItem]
+    """ The unique page urls (without hash) and the first item documented on them """
+    NameUrls: dict[str, str]
+    """ The names that are documented, and the url of their page """
+    MissingNames: list[str]
+    """ The names that aren't part of the table of contents """
+    FunctionPageUrl: str | None
+    """ The url of the page with the module functions """
+    CachedUrls: set[str]
+    """ The page urls that are already cached on disk """
+    FunctionPageItems: tuple[TableOfContentItem, ...] = ()
+    """ The documented functions in order, one per unique page. The function page is the first of them that can be parsed """
+
+    def GetSummary(self) -> str:
+        NumPages = len(self.PageItems)
+        NumCached = len(self.CachedUrls)
+        Lines = [
+            f"Documentation fetch plan: {len(self.NameUrls)} documented names on {NumPages} unique pages",
+            f"    Estimated cache hits: {NumCached}/{NumPages}, pages to download: {NumPages - NumCached}",
+            f"    Names missing from the table of contents: {len(self.MissingNames)}",
+            f"    Function page: {self.FunctionPageUrl or 'Not found'} ({max(len(self.FunctionPageItems) - 1, 0)} fallback pages)",
+        ]
+        return "\n".join(Lines)
 
 
 class Documentation():
-    def __init__(self, Namespace: str, Version: int, bUseCache = False) -> None:
+    def __init__(self, Namespace: str, Version: int) -> None:
         self.Namespace = Namespace
         self.Version = Version
-        self.TableOfContents = GetPythonTableOfContents(Namespace, Version, bUseCache)
+        self.TableOfContents = GetPythonTableOfContents(Namespace, Version)
 
-    def GetParsedPage(self, Name: str):
-        for Page in self.TableOfContents:
-            if Page.Name == Name:
-                return Page.ParsePage()
+        # If a name is listed multiple times, the first item is used
+        self.Items: dict[str, TableOfContentItem] = {}
+        for Item in self.TableOfContents:
+            self.Items.setdefault(Item.Name, Item)
 
+        # Parsed pages by their url (without hash), items documented on the same page share the parsed page
+        self.ParsedPages: dict[str, page_parser.DocumentationParsedPage | None] = {}
+
+    def GetParsedPage(self, Name: str):
+        Item = self.Items.get(Name)
+        if Item is None:
+            return None
+        return self.GetItemParsedPage(Item)
+
+    def GetItemParsedPage(self, Item: TableOfContentItem):
+        # Pages that doesn't exist are stored as None
+        Url = Item.GetDocumentUrl()
+        if Url not in self.ParsedPages:
+            self.ParsedPages.setdefault(Url, Item.ParsePage())
+
+        return self.ParsedPages[Url]
+
+    def CreateFetchPlan(self, Names: typing.Iterable[str], FunctionNames: typing.Iterable[str] = ()) -> DocumentationFetchPlan:
+        """
+        Work out which pages are needed to document the given names, without downloading any of them
+
+        ## Parameters:
+            - Names: Names of the classes & enums in the module
+            - FunctionNames: Names of the functions in the module, they're all documented on the same page
+        """
+        PageItems: dict[str, TableOfContentItem] = {}
+        NameUrls: dict[str, str] = {}
+        MissingNames = []
+        for Name in Names:
+            Item = self.Items.get(Name)
+            if Item is None:
+                MissingNames.append(Name)
+                continue
+
+            NameUrls[Name] = Item.GetDocumentUrl()
+            PageItems.setdefault(NameUrls[Name], Item)
+
+        # The functions page is found from the first documented function, the pages of the other functions
+        # are kept as fallbacks in case the first page can't be parsed. Only the first page is prefetched
+        FunctionPageItems: dict[str, TableOfContentItem] = {}
+        for Name in FunctionNames:
+            Item = self.Items.get(Name)
+            if Item is not None:
+                FunctionPageItems.setdefault(Item.GetDocumentUrl(), Item)
+
+        FunctionPageUrl = next(iter(FunctionPageItems), None)
+        if FunctionPageUrl is not None:
+            PageItems.setdefault(FunctionPageUrl, FunctionPageItems[FunctionPageUrl])
+
+        CachedUrls = {Url for Url in PageItems if cache.IsUrlCached(Url)}
+
+        return DocumentationFetchPlan(PageItems, NameUrls, MissingNames, FunctionPageUrl, CachedUrls, tuple(FunctionPageItems.values()))
+
+    def Prefetch(self, Plan: DocumentationFetchPlan, MaxWorkers = 16):
+        """ Download & parse all of the pages in the fetch plan """
+        PageItems = {Url: Item for Url, Item in Plan.PageItems.items() if Url not in self.ParsedPages}
+        if not PageItems:
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(MaxWorkers, len(PageItems))) as Executor:
+            for Url, ParsedPage in zip(PageItems, Executor.map(lambda x: x.ParsePage(), PageItems.values())):
+                self.ParsedPages.setdefault(Url, ParsedPage)
+
+    def GetFunctionPage(self, Plan: DocumentationFetchPlan):
+        """ Get the parsed page with the module functions, falls back to the next function's page if a page can't be parsed """
+        for Item in Plan.FunctionPageItems:
+            ParsedPage = self.GetItemParsedPage(Item)
+            if ParsedPage is not None:
+                return ParsedPage
         return None
 
 
-def GetPythonTableOfContents(Namespace: str, Version: int, bUseCache: bool = False) -> list[TableOfContentItem]:
-    Url = urls.GetPythonTableOfContentsUrl(Namespace, Version)
-    if bUseCache:
-        Response = cache.CachedGetRequest(Url)
-    else:
-        Response = requests.get(Url, timeout=10).text
+@functools.lru_cache(maxsize=8)
+def EvaluateTableOfContents(Response: str):
+    """ Evaluate the table of contents javascript, this is slow so the result is kept for as long as the content is the same """
+    import js2py
+    return js2py.eval_js(Response)
 
-    ParsedResponse = js2py.eval_js(Response)
 
-    return [TableOfContentItem(Data, Version, bUseCache) for Data in ParsedResponse]
+def GetPythonTableOfContents(Namespace: str, Version: int) -> list[TableOfContentItem]:
+    Url = urls.GetPythonTableOfContentsUrl(Namespace, Version)
+    Response = cache.CachedGetRequest(Url)
+
+    return [TableOfContentItem(Data, Version) for Data in EvaluateTableOfContents(Response)]
 
 
 def GetNameSpaceFromModule(ModuleName: str) -> str | None:
@@ -0,0 +1,135 @@
+"""
+Helpers to match overloaded functions with their documentation members.
+"""
+from __future__ import annotations
+
+
+def GetGreedyAssignment(Scores: list[tuple[int, int, int]]) -> list[tuple[int, int, int]]:
+    """
+    Assign rows & columns by picking the highest scores first.
+    Scores with the same value keep their original order.
+
+    ## Parameters:
+        - Scores: A list of (Row, Column, Score)
+
+    ## Returns:
+    The picked (Row, Column, Score) in the order they were picked
+    """
+    MatchedRows = set()
+    MatchedColumns = set()
+    Assignment = []
+    for Row, Column, Score in sorted(Scores, key = lambda x: x[2], reverse = True):
+        if Row in MatchedRows or Column in MatchedColumns:
+            continue
+
+        Assignment.append((Row, Column, Score))
+        MatchedRows.add(Row)
+        MatchedColumns.add(Column)
+
+    return Assignment
+
+
+def SolveAssignment(Weights: list[list[int]]) -> list[tuple[int, int]]:
+    """
+    Find the assignment of rows to columns with the highest total weight (Hungarian algorithm).
+    The matrix may be rectangular, every row (or column if there are fewer columns) gets assigned.
+
+    ## Parameters:
+        - Weights: A matrix with one list per row
+
+    ## Returns:
+    A list of (Row, Column) pairs
+    """
+    if not Weights or not Weights[0]:
+        return []
+
+    bTransposed = len(Weights) > len(Weights[0])
+    if bTransposed:
+        Weights = [list(x) for x in zip(*Weights)]
+
+    NumRows = len(Weights)
+    NumColumns = len(Weights[0])
+    Infinity = float("inf")
+
+    # Potentials & the row assigned to each column, both are 1-indexed where index 0 is used as a sentinel
+    RowPotentials = [0] * (NumRows + 1)
+    ColumnPotentials = [0] * (NumColumns + 1)
+    ColumnRows = [0] * (NumColumns + 1)
+    Way = [0] * (NumColumns + 1)
+
+    for Row in range(1, NumRows + 1):
+        ColumnRows[0] = Row
+        CurrentColumn = 0
+        MinValues = [Infinity] * (NumColumns + 1)
+        Used = [False] * (NumColumns + 1)
+
+        while True:
+            Used[CurrentColumn] = True
+            CurrentRow = ColumnRows[CurrentColumn]
+            RowWeights = Weights[CurrentRow - 1]
+            Delta = Infinity
+            NextColumn = 0
+            for Column in range(1, NumColumns + 1):
+                if Used[Column]:
+                    continue
+
+                # Maximize the weight by minimizing the negative weight
+                Cost = -RowWeights[Column - 1] - RowPotentials[CurrentRow] - ColumnPotentials[Column]
+                if Cost < MinValues[Column]:
+                    MinValues[Column] = Cost
+                    Way[Column] = CurrentColumn
+                if MinValues[Column] < Delta:
+                    Delta = MinValues[Column]
+                    NextColumn = Column
+
+            for Column in range(NumColumns + 1):
+                if Used[Column]:
+                    RowPotentials[ColumnRows[Column]] += Delta
+                    ColumnPotentials[Column] -= Delta
+                else:
+                    MinValues[Column] -= Delta
+
+            CurrentColumn = NextColumn
+            if ColumnRows[CurrentColumn] == 0:
+                break
+
+        # Update the assignment along the augmenting path
+        while CurrentColumn:
+            PreviousColumn = Way[CurrentColumn]
+            ColumnRows[CurrentColumn] = ColumnRows[PreviousColumn]
+            CurrentColumn = PreviousColumn
+
+    Assignment = [(ColumnRows[Column] - 1, Column - 1) for Column in range(1, NumColumns + 1) if ColumnRows[Column]]
+    if bTransposed:
+        Assignment = [(Column, Row) for Row, Column in Assignment]
+
+    return sorted(Assignment)
+
+
+def GetBestAssignment(Scores: list[tuple[int, int, int]], NumRows: int, NumColumns: int) -> list[tuple[int, int, int]]:
+    """
+    Assign rows & columns so that the total score is as high as possible, only positive scores are considered.
+    The greedy assignment is used when it's already optimal, to keep the results stable.
+
+    ## Parameters:
+        - Scores: A list of (Row, Column, Score)
+        - NumRows, NumColumns: The size of the score matrix
+
+    ## Returns:
+    The picked (Row, Column, Score), sorted from highest to lowest score
+    """
+    Scores = [x for x in Scores if x[2] > 0]
+    GreedyAssignment = GetGreedyAssignment(Scores)
+    if len(GreedyAssignment) <= 1:
+        return GreedyAssignment
+
+    Weights = [[0] * NumColumns for _ in range(NumRows)]
+    for Row, Column, Score in Scores:
+        Weights[Row][Column] = Score
+
+    OptimalAssignment = [(Row, Column, Weights[Row][Column]) for Row, Column in SolveAssignment(Weights) if Weights[Row][Column] > 0]
+    if sum(x[2] for x in OptimalAssignment) > sum(x[2] for x in GreedyAssignment):
+        OptimalAssignment.sort(key = lambda x: x[2], reverse = True)
+        return OptimalAssignment
+
+    return GreedyAssignment
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 from types import ModuleType
-from importlib import reload
+
+import functools
+import typing
 
 from .documentation_scraper import table_of_contents
+from . import overload_matching
+from . import type_expressions
 
-from .documentation_scraper.page_parser import MemberItem, GetParameterNiceName
+from .documentation_scraper.page_parser import MemberItem, GetParameterNiceName, RemoveDocumentationPrefix
 from ..plugin_base import PluginBaseClass
+from ...class_hierarchy import ClassHierarchy
+from ...type_index import TypeReferenceIndex
 from ...module_types import StubClass, StubFunction, StubParameter, StubProperty
-
-reload(table_of_contents)
+from ... import hot_reload
 
 EVENT_SOURCE_TYPE = "callbackframework.FBEventSource"
 
@@ -59,24 +64,30 @@ class PluginOnlineDocumentation(PluginBaseClass):
     Threading = True
     Priority = 10  # We preferably want this to run directly after the native generator
 
-    def __init__(self, Version: int, Module: ModuleType, EnumList: list[StubClass], ClassList: list[StubClass], FunctionGroupList: list[list[StubFunction]]):
-        super().__init__(Version, Module, EnumList, ClassList, FunctionGroupList)
+    def __init__(self, Version: int, Module: ModuleType, EnumList: list[StubClass], ClassList: list[StubClass], FunctionGroupList: list[list[StubFunction]], Hierarchy: ClassHierarchy | None = None, TypeIndex: TypeReferenceIndex | None = None, AllClassNames: typing.Iterable[str] | None = None, AllClasses: list[StubClass] | None = None):
+        super().__init__(Version, Module, EnumList, ClassList, FunctionGroupList, Hierarchy, TypeIndex, AllClassNames, AllClasses)
 
         # Initialize the documentation
         self.DocNamespace = table_of_contents.GetNameSpaceFromModule(self.ModuleName)
         if self.DocNamespace is None:
             return
-        self.Documentation = table_of_contents.Documentation(self.DocNamespace, Version, self.bDevMode)
 
-        # Parse the first documentation page to get the list of all pages
-        for FunctionGroup in FunctionGroupList:
-            Function = FunctionGroup[0]
-            self.FunctionPage = self.Documentation.GetParsedPage(Function.Name)
-            if self.FunctionPage:
-                break
+        # In dev mode the table of contents & parsed pages are kept between reloads, unless the scraper itself has changed
+        self.Documentation = hot_reload.GetState(f"Documentation.{self.DocNamespace}.{Version}",
+                                                 lambda: table_of_contents.Documentation(self.DocNamespace, Version),
+                                                 [table_of_contents.__package__])
+
+        # Only fetch the pages documenting something in the module, all of the module functions are on the same page
+        self.FetchPlan = self.Documentation.CreateFetchPlan([x.Name for x in EnumList + ClassList],
+                                                            [x[0].Name for x in FunctionGroupList if x])
+        if self.bDevMode:
+            print(self.FetchPlan.GetSummary())
 
-        # Make a map of all class names and their class object that can be used for patching types etc.
-        self.AllClassesMap = {Class.Name: Class for Class in ClassList + EnumList}
+        self.Documentation.Prefetch(self.FetchPlan)
+        self.FunctionPage = self.Documentation.GetFunctionPage(self.FetchPlan)
+
+        # Validated types depend on the classes in the module, so they're cached per plugin instance
+        self.ValidTypes: dict[type_expressions.TypeExpression, str | None] = {}
 
     def ShouldPatch(self) -> bool:
         return self.DocNamespace is not None
@@ -90,25 +101,26 @@ class PluginOnlineDocumentation(PluginBaseClass):
         if not ParsedPage:
             return
 
-        Enum.DocString = ParsedPage.DocString
+        # Documentation is assigned as fragments, which are only converted to markdown if the docstring is used
+        Enum.DocString = ParsedPage.Documentation
 
         for Property in Enum.StubProperties:
             Members = ParsedPage.GetFirstMemberByName(Property.Name)
             if Members:
-                Property.DocString = Members.DocString
+                Property.DocString = Members.Documentation
 
     def PatchClass(self, Class: StubClass):
         ParsedPage = self.Documentation.GetParsedPage(Class.Name)
         if not ParsedPage:
             return
 
-        Class.DocString = ParsedPage.DocString
+        Class.DocString = ParsedPage.Documentation
 
         # Properties
         for Property in Class.StubProperties:
             Member = ParsedPage.GetFirstMemberByName(Property.Name)
             if Member:
-                Property.DocString = Member.DocString
+                Property.DocString = Member.Documentation
                 Property.Type = self.EnsureValidPropertyType(Property, Member.Type)
 
         # Methods
@@ -144,87 +156,60 @@ class PluginOnlineDocumentation(PluginBaseClass):
             return
 
         # If we have multiple functions and multiple members, we need to figure out which ones to match
-
-        # Make copies of the lists so we can modify them without affecting the original lists
-        FunctionsCopy = Functions.copy()
-        MembersCopy = Members.copy()
+        FunctionTypes = [[x.Type for x in Function.GetParameters(bExcludeSelf = True)] for Function in Functions]
+        MemberTypes = [[x.Type for x in Member.Parameters] for Member in Members]
 
         # Find all of the functions that has a perfect match with a member, by the parameter types
-        PerfectMatches: list[tuple[StubFunction, MemberItem]] = []
-        MatchedFunctions: list[StubFunction] = []
-        MatchedDocMembers: list[MemberItem] = []
-        for Function in FunctionsCopy:
-            FunctionParameters = Function.GetParameters(bExcludeSelf = True)
-
-            for Member in MembersCopy:
-                if len(FunctionParameters) != len(Member.Parameters):
-                    continue
-
-                for FunctionParameter, MemberParameter in zip(FunctionParameters, Member.Parameters):
-                    if FunctionParameter.Type != MemberParameter.Type:
-                        break
-                else:
-                    # Make sure neither the function or the member has already been matched with another function or member
-                    if Function in MatchedFunctions or Member in MatchedDocMembers:
-                        continue
-                    PerfectMatches.append((Function, Member))
-
-                    MatchedFunctions.append(Function)
-                    MatchedDocMembers.append(Member)
-
-        for Function, Member in PerfectMatches:
-            self.PatchFunctionWithDocumentation(Function, Member, ParentClass)
+        MatchedFunctions: set[int] = set()
+        MatchedMembers: set[int] = set()
+        for FunctionIndex, Function in enumerate(Functions):
+            for MemberIndex, Member in enumerate(Members):
+                if MemberIndex not in MatchedMembers and FunctionTypes[FunctionIndex] == MemberTypes[MemberIndex]:
+                    self.PatchFunctionWithDocumentation(Function, Member, ParentClass)
+                    MatchedFunctions.add(FunctionIndex)
+                    MatchedMembers.add(MemberIndex)
+                    break
+
+        RemainingFunctions = [i for i in range(len(Functions)) if i not in MatchedFunctions]
+        RemainingMembers = [i for i in range(len(Members)) if i not in MatchedMembers]
+        if not RemainingFunctions or not RemainingMembers:
+            return
 
-            # Remove them from the lists so we don't try to match them again
-            FunctionsCopy.remove(Function)
-            MembersCopy.remove(Member)
+        # Match the rest based on how similar their parameter types are, the documentation types are only validated once
+        ValidatedMemberTypes = {i: [self.EnsureValidType(x) for x in MemberTypes[i]] for i in RemainingMembers}
 
-        # TODO: Match based on most similar parameter types
-        Scores: list[tuple[StubFunction, MemberItem, int]] = []
-        for Function in FunctionsCopy:
-            FunctionParameters = Function.GetParameters(bExcludeSelf = True)
-            for Member in MembersCopy:
+        Scores: list[tuple[int, int, int]] = []
+        for Row, FunctionIndex in enumerate(RemainingFunctions):
+            FunctionParameterTypes = FunctionTypes[FunctionIndex]
+            bFunctionTypesDefined = [IsTypeDefined(x) for x in FunctionParameterTypes]
+            for Column, MemberIndex in enumerate(RemainingMembers):
                 Score = 0
-                if len(FunctionParameters) == len(Member.Parameters):
+                if len(FunctionParameterTypes) == len(MemberTypes[MemberIndex]):
                     Score += 1
 
-                for FunctionParameter, MemberParameter in zip(FunctionParameters, Member.Parameters):
-                    MemberParameterType = self.EnsureValidType(MemberParameter.Type)
-                    if not MemberParameterType or not FunctionParameter.Type:
+                for FunctionParameterType, bTypeDefined, MemberParameterType in zip(FunctionParameterTypes, bFunctionTypesDefined, ValidatedMemberTypes[MemberIndex]):
+                    if not MemberParameterType or not FunctionParameterType:
                         continue
-                    if FunctionParameter.Type == MemberParameterType:
+                    if FunctionParameterType == MemberParameterType:
                         Score += 1
-                    elif MemberParameterType.startswith("list") and FunctionParameter.Type == "list":
+                    elif MemberParameterType.startswith("list") and FunctionParameterType == "list":
                         Score += 1
-                    elif IsTypeDefined(FunctionParameter.Type):
+                    elif bTypeDefined:
                         # Member description is not compatible with current function
                         Score = -1
                         break
 
                 if Score > 0:
-                    Scores.append((Function, Member, Score))
+                    Scores.append((Row, Column, Score))
 
-        # Sort the scores from highest to lowest
-        Scores.sort(key = lambda Score: Score[2], reverse = True)
-        while Scores:
-            Function, Member, Score = Scores.pop(0)
-            if Function in MatchedFunctions or Member in MatchedDocMembers:
-                continue
-
-            self.PatchFunctionWithDocumentation(Function, Member, ParentClass)
-
-            MatchedDocMembers.append(Member)
-            MatchedFunctions.append(Function)
-
-            # Remove them from the lists so we don't try to match them again
-            FunctionsCopy.remove(Function)
-            MembersCopy.remove(Member)
+        # Solve it as an assignment problem, to get the highest total score
+        for Row, Column, _ in overload_matching.GetBestAssignment(Scores, len(RemainingFunctions), len(RemainingMembers)):
+            self.PatchFunctionWithDocumentation(Functions[RemainingFunctions[Row]], Members[RemainingMembers[Column]], ParentClass)
 
     def PatchFunctionWithDocumentation(self, Function: StubFunction, DocMember: MemberItem, ParentClass: StubClass | None = None):
-        Function.DocString = DocMember.DocString
+        Function.DocString = DocMember.Documentation
         if Function.Name == "__init__":
-            if Function.DocString.startswith("Constructor."):
-                Function.DocString = Function.DocString.replace("Constructor.", "", 1)
+            Function.DocString = RemoveDocumentationPrefix(DocMember.Documentation, "Constructor.")
 
         if self.ShouldPatchType(Function.ReturnType, DocMember.Type):
             NewType = self.EnsureValidType(DocMember.Type)
@@ -284,12 +269,12 @@ class PluginOnlineDocumentation(PluginBaseClass):
     def EnsureValidPropertyType(self, Property: StubProperty, Type: str) -> str:
 
         # If it's a class, make sure it's a valid class
-        bIsValidFBClass = Type in self.AllClassesMap
+        bIsValidFBClass = Type in self.AllClassNames
         if not bIsValidFBClass:
             if Type.startswith("FB"):
                 # In the documentation the "Property" part is missing from the class name
                 PropertyType = f"FBProperty{Type[2:]}"
-                if PropertyType in self.AllClassesMap:
+                if PropertyType in self.AllClassNames:
                     Type = PropertyType
 
         # Convert all Events to EventSource
@@ -319,7 +304,7 @@ class PluginOnlineDocumentation(PluginBaseClass):
         elif DefaultValue == "FBString()":
             DefaultValue = '""'
 
-        if DefaultValue.startswith(("FB", "k")) and DefaultValue not in self.AllClassesMap:
+        if DefaultValue.startswith(("FB", "k")) and DefaultValue not in self.AllClassNames:
             EnumClass = self.AllClassesMap.get(Parameter.Type)
             if EnumClass:
                 if any(x.Name for x in EnumClass.StubProperties if x.Name == DefaultValue):
@@ -341,55 +326,50 @@ class PluginOnlineDocumentation(PluginBaseClass):
             return True
 
         # TODO: Must check if type is valid as well
-        if CurrentType.startswith(("E", "FB")) and CurrentType not in self.AllClassesMap:
+        if CurrentType.startswith(("E", "FB")) and CurrentType not in self.AllClassNames:
             return True
 
         return False
 
     def EnsureValidType(self, Type: str) -> str | None:
-        if "<" in Type:
-            Type = Type.replace("<", "[").replace(">", "]").replace(" ", "")
-            Type = Type.replace("FBArrayTemplate", "list")
-
-            # Get content between brackets
-            ListTypesStr = Type[Type.find("[") + 1:Type.find("]")]
-            if ListTypesStr:
-                ValidatedTypes = []
-                ListTypes = ListTypesStr.split(",")
-                for ListType in ListTypes:
-                    ListType = self.EnsureValidType(ListType)
-                    if ListType:
-                        ValidatedTypes.append(ListType)
-                
-                if len(ListTypes) != len(ValidatedTypes):
-                    return None
-                
-                Type = Type.replace(ListTypesStr, ",".join(ValidatedTypes))
-                if Type.endswith("[]"):
-                    Type = Type[:-2]
-
-        if " " in Type:
-            for Prefix in TYPE_IGNORE_PREFIXES:
-                if Type.startswith(Prefix):
-                    Type = Type.rpartition(" ")[2]
-        
-        Type = TRANSLATION_TYPE.get(Type, Type)
+        """ Get the type in Python syntax, returns None if it references a class that doesn't exist in the module """
+        return self.GetValidType(type_expressions.ParseTypeExpression(Type))
 
-        # Replace namespace C++ syntax with Python
-        if "::" in Type:
-            Type = Type.replace("::", ".")
-
-        if Type.startswith("FB"):
-            ClassName = Type
-            if "." in Type:
-                ClassName = Type.partition(".")[0]
-            if ClassName not in self.AllClassesMap:
-                # print(f"Type not found: {Type}")
+    def GetValidType(self, Expression: type_expressions.TypeExpression) -> str | None:
+        if Expression in self.ValidTypes:
+            return self.ValidTypes[Expression]
+
+        if Expression.Arguments:
+            ValidatedArguments = [self.GetValidType(x) for x in Expression.Arguments]
+            if not all(ValidatedArguments):
+                self.ValidTypes[Expression] = None
                 return None
+            Type = f"{Expression.Name}[{','.join(ValidatedArguments)}]"
+        else:
+            Type = type_expressions.RenderTypeExpression(Expression)
+
+        Type = TranslateType(Type)
 
+        if Type.startswith("FB") and Type.partition(".")[0] not in self.AllClassNames:
+            # print(f"Type not found: {Type}")
+            Type = None
+
+        self.ValidTypes[Expression] = Type
         return Type
 
 
+@functools.lru_cache(maxsize=None)
+def TranslateType(Type: str) -> str:
+    """ Translate a C++ type (without template arguments) into Python, e.g. `unsigned int` -> `int` """
+    if " " in Type and Type.startswith(TYPE_IGNORE_PREFIXES):
+        Type = Type.rpartition(" ")[2]
+
+    Type = TRANSLATION_TYPE.get(Type, Type)
+
+    # Replace namespace C++ syntax with Python
+    return Type.replace("::", ".")
+
+
 def IsTypeDefined(Type: str | None) -> bool:
     if not Type:
         return False
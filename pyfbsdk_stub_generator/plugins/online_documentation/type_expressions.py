@@ -0,0 +1,99 @@
+"""
+Parse C++ type strings from the documentation, e.g. `FBArrayTemplate<FBModel*>`, into type expressions.
+
+Expressions are interned, parsing the same string (or a string containing the same template argument)
+gives back the same expression object. Both parsing and rendering are cached per distinct input.
+"""
+from __future__ import annotations
+
+import functools
+import typing
+
+TEMPLATE_TRANSLATION = {
+    "FBArrayTemplate": "list",
+}
+
+
+class TypeExpression(typing.NamedTuple):
+    Name: str
+    # None if the type isn't a template, an empty tuple for templates without arguments, e.g. `Foo<>`
+    Arguments: tuple[TypeExpression, ...] | None = None
+
+
+_InternedExpressions: dict[TypeExpression, TypeExpression] = {}
+
+
+# -------------------------------------------------------------
+#                       Helper Functions
+# -------------------------------------------------------------
+
+def _Intern(Expression: TypeExpression) -> TypeExpression:
+    return _InternedExpressions.setdefault(Expression, Expression)
+
+
+def _SplitArguments(Text: str) -> list[str] | None:
+    """ Split template arguments on the top level commas, returns None if the brackets are unbalanced """
+    Arguments = []
+    Depth = 0
+    Start = 0
+    for Index, Character in enumerate(Text):
+        if Character == "<":
+            Depth += 1
+        elif Character == ">":
+            Depth -= 1
+            if Depth < 0:
+                return None
+        elif Character == "," and Depth == 0:
+            Arguments.append(Text[Start:Index])
+            Start = Index + 1
+
+    if Depth != 0:
+        return None
+
+    Arguments.append(Text[Start:])
+    return Arguments
+
+
+def _ParseTemplate(Text: str) -> TypeExpression:
+    Start = Text.find("<")
+    if Start == -1:
+        return _Intern(TypeExpression(Text))
+
+    End = Text.rfind(">")
+    ArgumentsText = Text[Start + 1:End]
+    Arguments = _SplitArguments(ArgumentsText) if End == len(Text) - 1 else None
+    if Arguments is None:
+        # Not something we can make sense of, keep it as a name in Python syntax
+        return _Intern(TypeExpression(Text.replace("<", "[").replace(">", "]")))
+
+    Name = Text[:Start]
+    Name = TEMPLATE_TRANSLATION.get(Name, Name)
+    if not ArgumentsText:
+        return _Intern(TypeExpression(Name, ()))
+
+    return _Intern(TypeExpression(Name, tuple(_ParseTemplate(x) for x in Arguments)))
+
+
+# -------------------------------------------------------------
+#                       Functions
+# -------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def ParseTypeExpression(Type: str) -> TypeExpression:
+    """
+    Parse a C++ type string, e.g. `FBArrayTemplate<FBModel*>` -> TypeExpression("list", (TypeExpression("FBModel*"),))
+    Whitespace inside of templates are removed.
+    """
+    if "<" not in Type:
+        return _Intern(TypeExpression(Type))
+
+    return _ParseTemplate(Type.replace(" ", ""))
+
+
+@functools.lru_cache(maxsize=None)
+def RenderTypeExpression(Expression: TypeExpression) -> str:
+    """ Get the type expression in Python syntax, e.g. `list[FBModel]` """
+    if Expression.Arguments is None:
+        return Expression.Name
+
+    return f"{Expression.Name}[{','.join(RenderTypeExpression(x) for x in Expression.Arguments)}]"
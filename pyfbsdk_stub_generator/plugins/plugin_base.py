@@ -1,19 +1,22 @@
 from __future__ import annotations
 
 import threading
-import os
 
 from types import ModuleType
 import typing
 
 from ..module_types import StubClass, StubFunction
+from ..class_hierarchy import ClassHierarchy
+from ..type_index import TypeReferenceIndex
+from .. import native_generator
+from .. import dev_mode
 
 
 class PluginBaseClass:
     Threading = True
     Priority = 100
 
-    def __init__(self, Version: int, Module: ModuleType, EnumList: list[StubClass], ClassList: list[StubClass], FunctionGroupList: list[list[StubFunction]]) -> None:
+    def __init__(self, Version: int, Module: ModuleType, EnumList: list[StubClass], ClassList: list[StubClass], FunctionGroupList: list[list[StubFunction]], Hierarchy: ClassHierarchy | None = None, TypeIndex: TypeReferenceIndex | None = None, AllClassNames: typing.Iterable[str] | None = None, AllClasses: list[StubClass] | None = None) -> None:
         self.Version = Version
         self.ModuleName = Module.__name__
 
@@ -25,7 +28,24 @@ class PluginBaseClass:
         self.EnumMap = {x.Name: x for x in EnumList}
         self.FunctionMap = {x[0].Name: x for x in FunctionGroupList if x}
 
-        self.bDevMode = os.environ.get("PYFBSDK_DEVMODE", "").lower() == "true"
+        # The hierarchy is built once by the generator and shared between the plugins
+        self.Hierarchy = Hierarchy if Hierarchy is not None else ClassHierarchy(EnumList + ClassList)
+
+        # Index of where each type name is used, the stubs keep it up to date when their types are set
+        self.TypeIndex = TypeIndex if TypeIndex is not None else TypeReferenceIndex(EnumList, ClassList, FunctionGroupList)
+
+        # Names of all classes & enums in the module, this also includes classes that are not part of the ClassList
+        # when only a subset of the module is generated
+        if AllClassNames is None:
+            _, Classes, Enums = native_generator.GetModuleContent(Module)
+            AllClassNames = [x.__name__ for x in Classes + Enums]
+        self.AllClassNames = set(AllClassNames)
+
+        # All enums & classes being generated by their name. The lists above are the stubs to patch, when the plugins
+        # are run again for the classes added by `Include` these are only the added ones, while this includes all of them
+        self.AllClassesMap = {x.Name: x for x in (AllClasses if AllClasses is not None else EnumList + ClassList)}
+
+        self.bDevMode = dev_mode.IsDevMode()
         self.Exceptions = []
 
     def ShouldPatch(self) -> bool:
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import builtins
 import typing
 import time
+import copy
 import os
 
 from types import ModuleType
@@ -9,11 +11,16 @@ from types import ModuleType
 import pyfbsdk
 
 from . import plugins
-from .module_types import StubClass
+from .module_types import StubClass, StubFunction
+from .class_hierarchy import ClassHierarchy
+from .type_index import TypeReferenceIndex
 from . import native_generator
-
-
-DEFAULT_PLUGINS = plugins.GetDefaultPlugins()
+from . import output_writer
+from . import doc_index
+from . import stub_package
+from . import stub_renderer
+from . import hot_reload
+from . import dev_mode
 
 
 # -------------------------------------------------------------
@@ -52,17 +59,30 @@ def GetBaseContent(Module: ModuleType) -> str:
     return Content
 
 
-def SortClasses(Classes: list[StubClass]) -> list[StubClass]:
+def SortClasses(Classes: list[StubClass], Hierarchy: ClassHierarchy | None = None) -> list[StubClass]:
     """ 
     Sort classes based on their parent class
     If a class has another class as their parent class, it'll be placed later in the list
+
+    ## Parameters:
+        - Classes: The classes to sort
+        - Hierarchy: The class hierarchy to get the parent classes from, if None it's built from the classes
     """
+    if Hierarchy is None:
+        Hierarchy = ClassHierarchy(Classes)
+
+    # Besides the parent classes, default values of the function parameters may require other classes
+    ClassRequirements: dict[str, list[str]] = {}
+    for Class in Classes:
+        FunctionRequirements = [x for FunctionGroup in Class.StubFunctions for Function in FunctionGroup for x in Function.GetRequirements()]
+        ClassRequirements[Class.Name] = list(Hierarchy.Parents.get(Class.Name, Class.Parents)) + FunctionRequirements
+
     ClassNames = [x.Name for x in Classes]
 
     i = 0
     while i < len(Classes):
         # Check if class has any required classes that needs to be defined before it (aka. parent classes)
-        Requirements = Classes[i].GetRequirements()
+        Requirements = ClassRequirements[Classes[i].Name]
         if Requirements:
             # Get the required class that has the highest index in the list
             RequiredIndices = [ClassNames.index(x) for x in Requirements if x in ClassNames]
@@ -79,6 +99,30 @@ def SortClasses(Classes: list[StubClass]) -> list[StubClass]:
     return Classes
 
 
+def GetStubsAsString(Enums: list[StubClass], Classes: list[StubClass], FunctionGroupList: list[list[StubFunction]], RenderedStubs: dict[int, str] | None = None) -> str:
+    """
+    Get the enums, classes & functions as python code (in string format)
+
+    ## Parameters:
+        - RenderedStubs: Stubs that have already been rendered, with the id of the class/function group as key. The other stubs are rendered here
+    """
+    RenderedStubs = RenderedStubs or {}
+
+    def Render(Stub: StubClass | list[StubFunction]) -> str:
+        return RenderedStubs[id(Stub)] if id(Stub) in RenderedStubs else stub_renderer.RenderStub(Stub)
+
+    StubString = "\n".join([Render(x) for x in Enums])
+    StubString += "\n"
+    StubString += "\n".join([Render(x) for x in Classes])
+    StubString += "\n"
+
+    for FunctionGroup in FunctionGroupList:
+        StubString += Render(FunctionGroup)
+        StubString += "\n"
+
+    return StubString
+
+
 # ---------------------------------------------------------------------------------
 #                                  GENERATOR
 # ---------------------------------------------------------------------------------
@@ -88,14 +132,38 @@ class StubGenerator:
     def __init__(
         self,
         Module: ModuleType,
-        Plugins: typing.Iterable[type[plugins.PluginBaseClass]] | None = DEFAULT_PLUGINS
+        Plugins: typing.Iterable[type[plugins.PluginBaseClass]] | None = None,
+        bIncludeDocStrings = True,
+        bCollectDocStrings = False,
+        Include: typing.Iterable[str] | None = None,
+        RenderWorkers = 1
     ):
+        """
+        ## Parameters:
+            - Module: The module to generate stubs for
+            - Plugins: The plugins that should patch the generated stubs. If None, the default plugins from `plugins.GetDefaultPlugins()` are used
+              (online documentation, manual documentation, FBProperty, dunder methods, enums & events). Pass an empty list to not use any plugins
+            - bIncludeDocStrings: If False, the generated stubs will only contain the signatures
+            - bCollectDocStrings: If True, all docstrings will be stored in `self.DocStrings` so they can be written to a documentation index
+            - Include: Names of classes/functions to generate stubs for, together with the classes they depend on. If None, the entire module is generated
+            - RenderWorkers: Number of worker processes used to render the stubs as python code, if 1 they are rendered in this process
+        """
         self.Module = Module
         self.Version = GetMotionBuilderVersion()
 
+        self.bIncludeDocStrings = bIncludeDocStrings
+        self.bCollectDocStrings = bCollectDocStrings
+        self.DocStrings: dict[str, str] = {}
+
+        self.Include = list(Include) if Include is not None else None
+        self.RenderWorkers = RenderWorkers
+
         self._AllClassNames = []
 
-        self.Plugins: list[type[plugins.PluginBaseClass]] = list(Plugins) if Plugins else []
+        # The default plugins are imported here rather than when this module is imported, since they have heavy dependencies
+        if Plugins is None:
+            Plugins = plugins.GetDefaultPlugins()
+        self.Plugins: list[type[plugins.PluginBaseClass]] = list(Plugins)
         self.Plugins.sort(key=lambda x: x.Priority)
 
     # ---------------------------------------------------
@@ -109,32 +177,118 @@ class StubGenerator:
             self._AllClassNames = [x.__name__ for x in Classes + Enums]
         return self._AllClassNames
 
-    def GenerateString(self) -> str:
+    def IntrospectModule(self, Include: list[str] | None = None) -> tuple[list[StubClass], list[StubClass], list[list[StubFunction]]]:
         """
-        Returns: The stub file as a string
+        Introspect the module. In dev mode the result is kept between reloads, as long as the introspection code hasn't changed.
+
+        ## Parameters:
+            - Include: Names of the classes/functions to introspect, together with the classes they depend on. If None, the entire module is introspected
+
+        Returns: a tuple with (Enums, Classes, FunctionGroupList)
         """
-        # Get the content
-        Enums, Classes, FunctionGroupList = native_generator.GenerateModuleSubs(self.Module)
+        if not dev_mode.IsDevMode():
+            return native_generator.GenerateModuleSubs(self.Module, Include)
 
-        # Run all of the plugins
-        for PluginType in self.Plugins:
-            Plugin = PluginType(self.Version, self.Module, Enums, Classes, FunctionGroupList)
-            Plugin.Run()
+        Stubs = hot_reload.GetState(f"Introspection.{self.Module.__name__}.{Include}",
+                                    lambda: native_generator.GenerateModuleSubs(self.Module, Include),
+                                    [native_generator.__name__, StubClass.__module__])
+
+        # The plugins modify the stubs, so each run needs its own copy
+        return copy.deepcopy(Stubs)
+
+    def GetKnownTypeNames(self) -> set[str]:
+        """ Get the names a type in the stub file can refer to: the module's classes, builtins & the names defined or imported by the base content """
+        Tree = stub_package.ParseStubs(GetBaseContent(self.Module))
+        return set(self.GetAllClassNames()) | set(dir(builtins)) | stub_package.GetDefinedNames(Tree)
+
+    def GenerateStubs(self) -> tuple[list[StubClass], list[StubClass], list[list[StubFunction]]]:
+        """
+        Introspect the module and run all of the plugins on the result.
+        The plugins are the ones given to the constructor, or the default plugins (see `plugins.GetDefaultPlugins()`) if `Plugins` was None.
+
+        Returns: a tuple with (Enums, Classes, FunctionGroupList)
+        """
+        # Get the content
+        StartTime = time.time()
+        Enums, Classes, FunctionGroupList = self.IntrospectModule(self.Include)
+        print(f"Introspecting {self.Module.__name__} took: {round(time.time() - StartTime, 2)}s.")
+
+        AllClassNames = set(self.GetAllClassNames())
+        NewStubs = (Enums, Classes, FunctionGroupList)
+        while True:
+            # The class hierarchy is shared by all of the plugins & used to sort the classes
+            Hierarchy = ClassHierarchy(Enums + Classes)
+
+            # Run all of the plugins on the new stubs, with all of the classes as context
+            StartTime = time.time()
+            TypeIndex = TypeReferenceIndex(*NewStubs)
+            for PluginType in self.Plugins:
+                Plugin = PluginType(self.Version, self.Module, *NewStubs, Hierarchy = Hierarchy, TypeIndex = TypeIndex,
+                                    AllClassNames = AllClassNames, AllClasses = Enums + Classes)
+                Plugin.Run()
+            print(f"Running plugins took: {round(time.time() - StartTime, 2)}s.")
+
+            if self.Include is None:
+                break
+
+            # The plugins (e.g. the online documentation) set most of the types, which may refer to classes that weren't included.
+            # Include them as well (with the classes they depend on), and run the plugins only on the added classes
+            MissingNames = native_generator.GetMissingDependencies(Enums, Classes, FunctionGroupList, AllClassNames)
+            if not MissingNames:
+                break
+
+            DefinedNames = {x.Name for x in Enums + Classes}
+            NewEnums, NewClasses, _ = self.IntrospectModule(sorted(MissingNames))
+            NewStubs = ([x for x in NewEnums if x.Name not in DefinedNames], [x for x in NewClasses if x.Name not in DefinedNames], [])
+            Enums += NewStubs[0]
+            Classes += NewStubs[1]
+
+        if self.Include is not None:
+            # Keep the module order, as if all of the classes were introspected at once
+            ModuleOrder = {Name: Index for Index, Name in enumerate(self.GetAllClassNames())}
+            Enums.sort(key=lambda x: ModuleOrder.get(x.Name, len(ModuleOrder)))
+            Classes.sort(key=lambda x: ModuleOrder.get(x.Name, len(ModuleOrder)))
+            Hierarchy = ClassHierarchy(Enums + Classes)
+            TypeIndex = TypeReferenceIndex(Enums, Classes, FunctionGroupList)
+
+        if dev_mode.IsDevMode():
+            UnresolvedNames = TypeIndex.GetUnresolvedNames(self.GetKnownTypeNames())
+            if UnresolvedNames:
+                print(f"Unresolved type names: {', '.join(UnresolvedNames)}")
 
         # Sort classes after all patches are done and we know their requirements
-        Classes = SortClasses(Classes)
+        Classes = SortClasses(Classes, Hierarchy)
+
+        if self.bCollectDocStrings:
+            self.DocStrings = doc_index.CollectDocStrings(Enums, Classes, FunctionGroupList)
+
+        if not self.bIncludeDocStrings:
+            doc_index.ClearDocStrings(Enums, Classes, FunctionGroupList)
+
+        return Enums, Classes, FunctionGroupList
+
+    def RenderStubs(self, Enums: list[StubClass], Classes: list[StubClass], FunctionGroupList: list[list[StubFunction]]) -> dict[int, str]:
+        """
+        Render the stubs using the render workers. If only 1 worker is used, nothing is rendered here and the stubs are rendered by `GetStubsAsString()`
+
+        Returns: A dict with the id of the class/function group as key and the rendered stub as value
+        """
+        if self.RenderWorkers <= 1:
+            return {}
+
+        stub_renderer.FreezeStubs(Enums, Classes, FunctionGroupList)
+        Stubs = [*Enums, *Classes, *FunctionGroupList]
+        return {id(Stub): String for Stub, String in zip(Stubs, stub_renderer.RenderStubs(Stubs, self.RenderWorkers))}
+
+    def GenerateString(self) -> str:
+        """
+        Returns: The stub file as a string
+        """
+        Enums, Classes, FunctionGroupList = self.GenerateStubs()
 
         # Generate a string
         StubString = GetBaseContent(self.Module)  # Read the custom additions file first
-        StubString += "\n".join([x.GetAsString() for x in Enums])
-        StubString += "\n"
-        StubString += "\n".join([x.GetAsString() for x in Classes])
-        StubString += "\n"
-
-        for FunctionGroup in FunctionGroupList:
-            bOverload = len(FunctionGroup) > 1  # If there are multiple functions with the same name, add @overload
-            StubString += "\n".join([x.GetAsString(bOverload) for x in FunctionGroup])
-            StubString += "\n"
+        StubString += GetStubsAsString(Enums, Classes, FunctionGroupList, self.RenderStubs(Enums, Classes, FunctionGroupList))
 
         StubString = StubString.replace("    ", "\t")  # Make sure tabs are used
 
@@ -142,22 +296,90 @@ class StubGenerator:
 
         return StubString
 
+    def GeneratePackageStrings(self) -> dict[str, str]:
+        """
+        Generate the stubs as a package, where the classes are split up into submodules.
+        See `stub_package` for more information.
+
+        Returns: A dict with the relative filepath (without extension) as key and the file content as value
+        """
+        Enums, Classes, FunctionGroupList = self.GenerateStubs()
+
+        RenderedStubs = self.RenderStubs(Enums, Classes, FunctionGroupList)
+
+        Submodules = stub_package.GroupStubs(Enums, Classes, FunctionGroupList)
+        SubmoduleStrings = {Name: GetStubsAsString(*Stubs, RenderedStubs) for Name, Stubs in Submodules.items()}
+
+        Files = {}
+        for FileName, Content in stub_package.GeneratePackageFiles(GetBaseContent(self.Module), SubmoduleStrings).items():
+            Files[FileName] = Content.replace("    ", "\t") + "\n"
+
+        return Files
+
+
+def WriteDocIndex(Generator: StubGenerator, DocIndexFilepath: str | None):
+    if DocIndexFilepath:
+        output_writer.WriteFile(DocIndexFilepath, doc_index.GetDocIndexBytes(Generator.DocStrings))
 
-def GeneratePyfbsdkStubFile(Filepath: str) -> str:
-    StartTime = time.time()
 
-    # Make sure directory exists
-    Directory = os.path.dirname(Filepath)
-    if not os.path.isdir(Directory):
-        os.makedirs(Directory)
+def GeneratePyfbsdkStubFile(Filepath: str, bIncludeDocStrings = True, DocIndexFilepath: str | None = None, Include: typing.Iterable[str] | None = None, RenderWorkers = 1) -> str:
+    """
+    Generate the pyfbsdk stub file
+
+    ## Parameters:
+        - Filepath: The absolute path to the stub file
+        - bIncludeDocStrings: If False, only the signatures will be included in the stub file
+        - DocIndexFilepath: If set, a documentation index containing all docstrings will be written to this path
+        - Include: Names of classes/functions to generate stubs for, together with the classes they depend on. If None, the entire module is generated
+        - RenderWorkers: Number of worker processes used to render the stubs
+
+    Returns: The filepath to the stub file
+    """
+    StartTime = time.time()
 
-    Generator = StubGenerator(pyfbsdk)
+    Generator = StubGenerator(pyfbsdk, bIncludeDocStrings = bIncludeDocStrings, bCollectDocStrings = bool(DocIndexFilepath), Include = Include, RenderWorkers = RenderWorkers)
     FileContent = Generator.GenerateString()
 
-    with open(Filepath, "w+", encoding="utf-8") as File:
-        File.write(FileContent)
+    if not output_writer.WriteFile(Filepath, FileContent):
+        print(f"{os.path.basename(Filepath)} is already up to date.")
+
+    WriteDocIndex(Generator, DocIndexFilepath)
 
     GenerationTime = time.time() - StartTime
     print(f"Generating pyfbsdk stub file took: {round(GenerationTime, 2)}s.")
 
     return Filepath
+
+
+def GeneratePyfbsdkStubPackage(Directory: str, FileExtension = "pyi", bIncludeDocStrings = True, DocIndexFilepath: str | None = None, Include: typing.Iterable[str] | None = None, RenderWorkers = 1) -> list[str]:
+    """
+    Generate the pyfbsdk stubs as a package, e.g. `Directory/pyfbsdk/__init__.pyi`
+
+    ## Parameters:
+        - Directory: The directory where the package should be created
+        - FileExtension: The file extension
+        - bIncludeDocStrings: If False, only the signatures will be included in the stub files
+        - DocIndexFilepath: If set, a documentation index containing all docstrings will be written to this path
+        - Include: Names of classes/functions to generate stubs for, together with the classes they depend on. If None, the entire module is generated
+        - RenderWorkers: Number of worker processes used to render the stubs
+
+    Returns: A list of the filepaths to all of the files in the package
+    """
+    StartTime = time.time()
+
+    Generator = StubGenerator(pyfbsdk, bIncludeDocStrings = bIncludeDocStrings, bCollectDocStrings = bool(DocIndexFilepath), Include = Include, RenderWorkers = RenderWorkers)
+    Files = Generator.GeneratePackageStrings()
+
+    PackageDirectory = os.path.join(Directory, pyfbsdk.__name__)
+    Filepaths = []
+    for FileName, FileContent in Files.items():
+        Filepath = os.path.join(PackageDirectory, f"{FileName}.{FileExtension}")
+        output_writer.WriteFile(Filepath, FileContent)
+        Filepaths.append(Filepath)
+
+    WriteDocIndex(Generator, DocIndexFilepath)
+
+    GenerationTime = time.time() - StartTime
+    print(f"Generating pyfbsdk stub package took: {round(GenerationTime, 2)}s.")
+
+    return Filepaths
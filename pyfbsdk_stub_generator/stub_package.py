@@ -0,0 +1,220 @@
+"""
+Split the generated stubs into a package with multiple submodules.
+
+Type checkers & IDEs have to re-parse the entire stub file whenever it's loaded, so splitting the
+classes up into smaller submodules reduces the amount of code that has to be parsed at once.
+The package's `__init__` re-exports everything, so `import pyfbsdk` works exactly the same as with a single stub file.
+"""
+from __future__ import annotations
+
+import tokenize
+import ast
+import sys
+import io
+import re
+
+from .module_types import StubClass, StubFunction
+from .class_hierarchy import ClassHierarchy
+
+INIT_MODULE = "__init__"
+
+# Positional-only parameter markers, e.g. the `,/` in `def Foo(self,Value:int,/)`
+POSITIONAL_ONLY_MARKER_PATTERN = re.compile(r",\s*/\s*(?=[,)])")
+
+# Submodules in the order they're re-exported from the package's __init__ file
+SUBMODULE_BASE = "_base"
+SUBMODULE_ENUMS = "_enums"
+SUBMODULE_CORE = "_core"
+SUBMODULE_SCENE = "_scene"
+SUBMODULE_PROPERTIES = "_properties"
+SUBMODULE_EVENTS = "_events"
+SUBMODULE_UI = "_ui"
+SUBMODULE_FUNCTIONS = "_functions"
+
+SUBMODULE_ORDER = (
+    SUBMODULE_BASE,
+    SUBMODULE_ENUMS,
+    SUBMODULE_CORE,
+    SUBMODULE_SCENE,
+    SUBMODULE_PROPERTIES,
+    SUBMODULE_EVENTS,
+    SUBMODULE_UI,
+    SUBMODULE_FUNCTIONS,
+)
+
+# Classes inheriting from these classes will be placed in the given submodule.
+# They're checked in order, and classes not matching any of them are placed in the core submodule.
+SUBMODULE_BASE_CLASSES = (
+    ("FBProperty", SUBMODULE_PROPERTIES),
+    ("FBEvent", SUBMODULE_EVENTS),
+    ("FBVisualComponent", SUBMODULE_UI),
+    ("FBComponent", SUBMODULE_SCENE),
+)
+
+# Classes that starts with these prefixes will be placed in the given submodule
+SUBMODULE_CLASS_PREFIXES = (
+    ("FBPropertyList", SUBMODULE_PROPERTIES),
+)
+
+
+# -------------------------------------------------------------
+#                       Helper Functions
+# -------------------------------------------------------------
+
+def GetClassSubmodule(Class: StubClass, Hierarchy: ClassHierarchy) -> str:
+    """ Get the name of the submodule the class should be placed in """
+    for BaseClassName, Submodule in SUBMODULE_BASE_CLASSES:
+        if Hierarchy.IsSubclassOf(Class.Name, BaseClassName):
+            return Submodule
+
+    for Prefix, Submodule in SUBMODULE_CLASS_PREFIXES:
+        if Class.Name.startswith(Prefix):
+            return Submodule
+
+    return SUBMODULE_CORE
+
+
+def ParseStubs(Content: str) -> ast.Module:
+    """ Parse stub code, only used to look up names & line numbers so it also works with Python 3.7 (MotionBuilder 2022) """
+    if sys.version_info < (3, 8):
+        # Positional-only parameters are a syntax error before Python 3.8, removing the markers doesn't change any names or line numbers
+        Content = POSITIONAL_ONLY_MARKER_PATTERN.sub("", Content)
+    return ast.parse(Content)
+
+
+def GetDefinedNames(Tree: ast.Module) -> set[str]:
+    """ Get the names of all classes, functions, variables & imports defined at the top level of a module """
+    Names = set()
+    for Node in Tree.body:
+        if isinstance(Node, (ast.ClassDef, ast.FunctionDef)):
+            Names.add(Node.name)
+        elif isinstance(Node, ast.Import):
+            Names.update(x.asname or x.name.partition(".")[0] for x in Node.names)
+        elif isinstance(Node, ast.ImportFrom) and Node.module != "__future__":
+            Names.update(x.asname or x.name for x in Node.names if x.name != "*")
+        elif isinstance(Node, ast.Assign):
+            Names.update(x.id for x in Node.targets if isinstance(x, ast.Name))
+        elif isinstance(Node, ast.AnnAssign) and isinstance(Node.target, ast.Name):
+            Names.add(Node.target.id)
+    return Names
+
+
+def GetReferencedNames(Tree: ast.Module) -> set[str]:
+    """ Get the names of all variables referenced in a module, including the ones used in type annotations """
+    return {Node.id for Node in ast.walk(Tree) if isinstance(Node, ast.Name)}
+
+
+def GetDocStringEndLine(Content: str) -> int:
+    """ Get the line number (1-based) where the module docstring ends, 0 if there is no docstring """
+    if ast.get_docstring(ParseStubs(Content), clean=False) is None:
+        return 0
+
+    # The line numbers of string nodes are unreliable before Python 3.8, so the docstring's token is used instead
+    for Token in tokenize.generate_tokens(io.StringIO(Content).readline):
+        if Token.type == tokenize.STRING:
+            return Token.end[0]
+
+    return 0
+
+
+def GetNodeStartLine(Node: ast.stmt) -> int:
+    """ Get the first line of a node, including its decorators """
+    return min([Node.lineno] + [x.lineno for x in getattr(Node, "decorator_list", ())])
+
+
+def SplitBaseContent(BaseContent: str) -> tuple[str, str]:
+    """
+    Split the base content into the module docstring & the header (comments & imports) that should be
+    included in every submodule.
+
+    Returns: a tuple with (DocString, Header)
+    """
+    Tree = ParseStubs(BaseContent)
+    Lines = BaseContent.split("\n")
+
+    HeaderStartLine = GetDocStringEndLine(BaseContent)
+    DocString = "\n".join(Lines[:HeaderStartLine])
+    Body = Tree.body[1:] if HeaderStartLine else Tree.body
+
+    HeaderEndLine = len(Lines)
+    for Node in Body:
+        if not isinstance(Node, (ast.Import, ast.ImportFrom)):
+            HeaderEndLine = GetNodeStartLine(Node) - 1
+            break
+
+    Header = "\n".join(Lines[HeaderStartLine:HeaderEndLine]).strip()
+
+    return DocString, Header
+
+
+# -------------------------------------------------------------
+#                       Functions
+# -------------------------------------------------------------
+
+def GroupStubs(Enums: list[StubClass], Classes: list[StubClass], FunctionGroupList: list[list[StubFunction]]):
+    """
+    Group the stubs into the submodules they should be placed in.
+    The order of the stubs are kept within each submodule.
+
+    Returns: A dict with the submodule name as key, and a tuple with (Enums, Classes, FunctionGroupList) as value
+    """
+    Submodules: dict[str, tuple[list[StubClass], list[StubClass], list[list[StubFunction]]]] = {}
+    for Submodule in SUBMODULE_ORDER:
+        if Submodule != SUBMODULE_BASE:
+            Submodules[Submodule] = ([], [], [])
+
+    Submodules[SUBMODULE_ENUMS][0].extend(Enums)
+    Submodules[SUBMODULE_FUNCTIONS][2].extend(FunctionGroupList)
+
+    Hierarchy = ClassHierarchy(Classes)
+    for Class in Classes:
+        Submodules[GetClassSubmodule(Class, Hierarchy)][1].append(Class)
+
+    return Submodules
+
+
+def GeneratePackageFiles(BaseContent: str, SubmoduleStrings: dict[str, str]) -> dict[str, str]:
+    """
+    Generate the content of all files in the package.
+    Each submodule will import the names it references from the other submodules.
+
+    ## Parameters:
+        - BaseContent: The base content for the module, see `stub_generator.GetBaseContent()`
+        - SubmoduleStrings: A dict with the submodule name as key and the generated stubs as value
+
+    ## Returns:
+    A dict with the module name (e.g. '__init__' or '_core') as key and the file content as value
+    """
+    DocString, Header = SplitBaseContent(BaseContent)
+    # Every submodule starts with the header, so the names it imports are already available
+    HeaderNames = GetDefinedNames(ParseStubs(Header))
+
+    Trees = {SUBMODULE_BASE: ParseStubs(BaseContent)}
+    for Submodule, Content in SubmoduleStrings.items():
+        Trees[Submodule] = ParseStubs(Content)
+
+    # Map each name to the submodule where it's defined
+    NameSubmoduleMap: dict[str, str] = {}
+    for Submodule, Tree in Trees.items():
+        for Name in GetDefinedNames(Tree):
+            NameSubmoduleMap.setdefault(Name, Submodule)
+
+    Files = {SUBMODULE_BASE: BaseContent}
+    for Submodule, Content in SubmoduleStrings.items():
+        # Find all names this submodule needs to import from the other submodules
+        Imports: dict[str, list[str]] = {}
+        DefinedNames = GetDefinedNames(Trees[Submodule])
+        for Name in sorted(GetReferencedNames(Trees[Submodule]) - DefinedNames - HeaderNames):
+            SourceSubmodule = NameSubmoduleMap.get(Name)
+            if SourceSubmodule:
+                Imports.setdefault(SourceSubmodule, []).append(Name)
+
+        ImportLines = [f"from .{x} import {', '.join(Imports[x])}" for x in SUBMODULE_ORDER if x in Imports]
+
+        Files[Submodule] = "\n".join([Header, *ImportLines, Content])
+
+    InitLines = [DocString] if DocString else []
+    InitLines += [f"from .{x} import *" for x in SUBMODULE_ORDER if x in Files]
+    Files[INIT_MODULE] = "\n".join(InitLines)
+
+    return Files
@@ -0,0 +1,127 @@
+"""
+Render the patched stubs as python code, optionally using a pool of worker processes.
+
+Once all plugins are done, each enum, class & function group can be rendered independently. The model is first
+frozen, meaning the lazy docstrings that can't be pickled are resolved, so it can be sent to the worker processes
+(the introspected references are dropped when pickling, see `StubBase.__getstate__`). Lazy docstrings that can be
+pickled (e.g. the online documentation's `DocFragment`) are sent as is, and converted by the workers.
+The stubs are rendered in chunks, and the chunks are put back together in their original order.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import multiprocessing
+import typing
+import pickle
+import time
+import sys
+import os
+
+from .module_types import StubBase, StubClass, StubFunction, StubFunctionVariant
+from . import doc_index
+
+Stub = typing.Union[StubClass, typing.List[StubFunction]]
+
+# Number of chunks per worker, more chunks evens out the work between the workers at the cost of more overhead
+CHUNKS_PER_WORKER = 4
+
+
+# -------------------------------------------------------------
+#                       Helper Functions
+# -------------------------------------------------------------
+
+def _RenderChunk(Stubs: list[Stub]) -> list[str]:
+    return [RenderStub(x) for x in Stubs]
+
+
+def _SplitIntoChunks(Stubs: list[Stub], NumChunks: int) -> list[list[Stub]]:
+    ChunkSize = max(1, -(-len(Stubs) // NumChunks))
+    return [Stubs[i:i + ChunkSize] for i in range(0, len(Stubs), ChunkSize)]
+
+
+def _IsPicklable(Value) -> bool:
+    try:
+        pickle.dumps(Value)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+    return True
+
+
+def _FreezeDocString(StubObject: StubBase):
+    # Check the stored value rather than the property, since reading the property resolves it
+    if callable(StubObject._DocString) and not _IsPicklable(StubObject._DocString):
+        StubObject.DocString = StubObject.DocString
+
+
+def GetPythonExecutable() -> str | None:
+    """
+    Get the python interpreter used to start the worker processes.
+    Inside of MotionBuilder `sys.executable` is MotionBuilder itself, so mobupy next to it is used instead.
+    """
+    ExecutableName = os.path.basename(sys.executable).lower()
+    if ExecutableName.startswith(("python", "mobupy")):
+        return sys.executable
+
+    MoBuPyExe = os.path.join(os.path.dirname(sys.executable), "mobupy.exe" if os.name == "nt" else "mobupy")
+    return MoBuPyExe if os.path.isfile(MoBuPyExe) else None
+
+
+# -------------------------------------------------------------
+#                       Functions
+# -------------------------------------------------------------
+
+def FreezeStubs(Enums: list[StubClass], Classes: list[StubClass], FunctionGroupList: list[list[StubFunction]]):
+    """ Resolve the lazy docstrings that can't be pickled, so the stubs can be sent to the worker processes """
+    for StubObject in doc_index.IterStubs(Enums, Classes, FunctionGroupList):
+        Functions = [StubObject]
+        if isinstance(StubObject, StubFunctionVariant):
+            Functions.append(StubObject.Parent)  # The parent is pickled together with the variant
+
+        for Function in Functions:
+            _FreezeDocString(Function)
+            if isinstance(Function, StubFunction):
+                for Parameter in Function.GetParameters():
+                    _FreezeDocString(Parameter)
+
+
+def RenderStub(StubObject: Stub) -> str:
+    """ Get an enum, class or function group as python code (in string format) """
+    if isinstance(StubObject, list):
+        bOverload = len(StubObject) > 1  # If there are multiple functions with the same name, add @overload
+        return "\n".join([x.GetAsString(bOverload) for x in StubObject])
+
+    return StubObject.GetAsString()
+
+
+def RenderStubs(Stubs: list[Stub], Workers = 1) -> list[str]:
+    """
+    Render the enums, classes and/or function groups. The stubs must be frozen (see `FreezeStubs`) if more than 1 worker is used.
+
+    ## Parameters:
+        - Stubs: The stubs to render
+        - Workers: Number of worker processes, if 1 (or no python interpreter can be found to start the workers) the stubs are rendered in this process
+
+    ## Returns:
+    The stubs as strings, in the same order as they were given
+    """
+    PythonExecutable = GetPythonExecutable() if Workers > 1 else None
+    if PythonExecutable is None:
+        return _RenderChunk(Stubs)
+
+    StartTime = time.time()
+
+    Context = multiprocessing.get_context("spawn")
+    Context.set_executable(PythonExecutable)
+
+    Strings = []
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=Workers, mp_context=Context) as Executor:
+            for ChunkStrings in Executor.map(_RenderChunk, _SplitIntoChunks(Stubs, Workers * CHUNKS_PER_WORKER)):
+                Strings.extend(ChunkStrings)
+    except (OSError, concurrent.futures.process.BrokenProcessPool, pickle.PicklingError) as Error:
+        print(f"Failed to render the stubs using {Workers} workers, rendering them serially instead: {Error}")
+        return _RenderChunk(Stubs)
+
+    print(f"Rendering {len(Stubs)} stubs using {Workers} workers took: {round(time.time() - StartTime, 2)}s.")
+
+    return Strings
@@ -0,0 +1,163 @@
+"""
+Reverse index from the type names used in the stubs, to the properties, parameters & functions (return types) using them.
+
+Stubs that are part of an index keep it up to date when their `Type` or `ReturnType` is set, and stubs added to an
+indexed class or function are added to the index as well. This makes it possible to e.g. replace every use of a type
+by only touching the stubs using it, or to list the type names that doesn't refer to anything.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+import typing
+import re
+
+from .module_types import StubBase, StubClass, StubFunction, StubFunctionVariant, StubParameter, StubProperty
+
+# Matches type names, including dotted names such as `callbackframework.FBEventSource`
+TYPE_NAME_PATTERN = re.compile(r"(?<![\w.])[A-Za-z_][\w.]*")
+
+
+# -------------------------------------------------------------
+#                       Helper Functions
+# -------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def GetTypeNames(Type: str | None) -> frozenset[str]:
+    """
+    Get the names referenced by a type string, dotted names are included with all of their prefixes.
+    E.g. `list[FBLight.EAreaLightShapes]` -> {"list", "FBLight", "FBLight.EAreaLightShapes"}
+    """
+    if not Type:
+        return frozenset()
+
+    Names = set()
+    for Name in TYPE_NAME_PATTERN.findall(Type):
+        Parts = Name.split(".")
+        Names.update(".".join(Parts[:Index]) for Index in range(1, len(Parts) + 1) if Parts[Index - 1])
+    return frozenset(Names)
+
+
+def GetStubType(Stub: StubBase) -> str | None:
+    """ Get the type string of a property/parameter, or the return type of a function """
+    if isinstance(Stub, StubFunction):
+        return Stub._ReturnType
+    if isinstance(Stub, (StubProperty, StubParameter)):
+        return Stub._Type
+    return None
+
+
+def SetStubType(Stub: StubBase, Type: str | None):
+    if isinstance(Stub, StubFunction):
+        Stub.ReturnType = Type
+    else:
+        Stub.Type = Type
+
+
+def IterTypedStubs(Stub: StubBase) -> typing.Iterator[StubBase]:
+    """ Iterate over the stub and all of its members that has a type, e.g. a class' properties, methods & their parameters """
+    if isinstance(Stub, StubClass):
+        for Enum in Stub.StubEnums:
+            yield from IterTypedStubs(Enum)
+        yield from Stub.StubProperties
+        for FunctionGroup in Stub.StubFunctions:
+            for Function in FunctionGroup:
+                yield from IterTypedStubs(Function)
+
+    elif isinstance(Stub, StubFunction):
+        yield Stub
+        # The parameters of a variant are owned by its parent, except the ones it overrides
+        yield from Stub.ParameterOverrides.values() if isinstance(Stub, StubFunctionVariant) else Stub.GetParameters()
+
+    else:
+        yield Stub
+
+
+# -------------------------------------------------------------
+#                       Type Index
+# -------------------------------------------------------------
+
+class TypeReferenceIndex:
+    def __init__(self, Enums: list[StubClass], Classes: list[StubClass], FunctionGroupList: list[list[StubFunction]]):
+        self.References: dict[str, set[StubBase]] = {}
+        # Plugins may set types from multiple threads
+        self._Lock = threading.Lock()
+
+        for Class in Enums + Classes:
+            self.Add(Class)
+        for FunctionGroup in FunctionGroupList:
+            for Function in FunctionGroup:
+                self.Add(Function)
+
+    def _AddReferences(self, Stub: StubBase, Names: typing.Iterable[str]):
+        for Name in Names:
+            References = self.References.get(Name)
+            if References is None:
+                References = self.References[Name] = set()
+            References.add(Stub)
+
+    def _RemoveReferences(self, Stub: StubBase, Names: typing.Iterable[str]):
+        for Name in Names:
+            References = self.References.get(Name)
+            if References is not None:
+                References.discard(Stub)
+                if not References:
+                    del self.References[Name]
+
+    def Add(self, Stub: StubBase):
+        """ Add the stub and its members to the index, they'll keep the index up to date when their type changes """
+        with self._Lock:
+            if isinstance(Stub, (StubClass, StubFunction)):
+                Stub.TypeIndex = self
+            for TypedStub in IterTypedStubs(Stub):
+                TypedStub.TypeIndex = self
+                self._AddReferences(TypedStub, GetTypeNames(GetStubType(TypedStub)))
+
+    def Remove(self, Stub: StubBase):
+        """ Remove the stub and its members from the index """
+        with self._Lock:
+            if isinstance(Stub, (StubClass, StubFunction)):
+                Stub.TypeIndex = None
+            for TypedStub in IterTypedStubs(Stub):
+                TypedStub.TypeIndex = None
+                self._RemoveReferences(TypedStub, GetTypeNames(GetStubType(TypedStub)))
+
+    def Update(self, Stub: StubBase, OldType: str | None, NewType: str | None):
+        """ Called by the stubs when their type is changed """
+        OldNames = GetTypeNames(OldType)
+        NewNames = GetTypeNames(NewType)
+        if OldNames == NewNames:
+            return
+
+        with self._Lock:
+            self._RemoveReferences(Stub, OldNames - NewNames)
+            self._AddReferences(Stub, NewNames - OldNames)
+
+    def GetReferences(self, Name: str) -> list[StubBase]:
+        """ Get the properties, parameters & functions (return types) whose type refers to the name """
+        with self._Lock:
+            return list(self.References.get(Name, ()))
+
+    def Retype(self, OldName: str, NewName: str) -> int:
+        """
+        Replace the type name in all of the stubs using it, e.g. `Retype("FBTVector", "FBVector4d")` also changes `list[FBTVector]`.
+        Dotted names starting with the name are changed too, e.g. `FBTVector.Foo` -> `FBVector4d.Foo`
+
+        ## Returns:
+        The number of stubs that were changed
+        """
+        Pattern = re.compile(rf"(?<![\w.]){re.escape(OldName)}(?!\w)")
+        References = self.GetReferences(OldName)
+        for Stub in References:
+            SetStubType(Stub, Pattern.sub(NewName, GetStubType(Stub)))
+        return len(References)
+
+    def GetUnresolvedNames(self, KnownNames: typing.Container[str]) -> list[str]:
+        """
+        Get the type names that aren't known, only the first part of dotted names is checked.
+
+        ## Parameters:
+            - KnownNames: Names that can be referenced, e.g. the class names, builtins & names imported by the stub file
+        """
+        with self._Lock:
+            return sorted(Name for Name in self.References if "." not in Name and Name not in KnownNames)